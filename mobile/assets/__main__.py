@@ -0,0 +1,14 @@
+"""
+Run the asset scripts as one command: python -m assets ... from mobile/, or
+python . from this directory (see cli.py)
+"""
+import os
+import sys
+
+# The asset modules import each other by plain name, as when a script is run from this directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main
+
+if __name__ == '__main__':
+    main()
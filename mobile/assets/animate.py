@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Render a generator's sound waves as a looping pulse animation (APNG or WebP)
+The logo is rendered once without its waves as a static base. The waves are
+rasterized once into a coverage mask and a map of which wave covers each
+pixel, so a frame is only a per-wave opacity table applied to the tiles whose
+waves changed since the previous frame. Both encoders store each frame as the
+rectangle that differs from the previous one; in an opaque APNG the pixels of
+that rectangle that did not change are stored transparent and blended over the
+previous frame, so they compress to almost nothing.
+Usage: python animate.py blue-microphone [--frames 60] [--size 512] [--fps 30] [--format apng|webp]
+                         [--param NAME VALUE] [--output build/animations/blue-microphone.png] [--max-kb N]
+"""
+import argparse
+import inspect
+import math
+import os
+import sys
+import time
+
+from PIL import Image, ImageChops
+
+import backend
+from canvas import MaskLayer
+from generators import WAVE_GENERATORS, load_generator, load_role_generator, load_wave_generator
+from sweep import design_parameters, parse_values
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT_DIR = os.path.join(SCRIPT_DIR, 'build', 'animations')
+
+# Encoder format and file extension per --format
+FORMATS = {'apng': ('PNG', '.png'), 'webp': ('WEBP', '.webp')}
+
+TILE_SIZE = 32
+# Opacity of a wave between pulses, as a fraction of its still opacity
+PULSE_FLOOR = 0.25
+
+
+def wave_levels(frame, frames, count, floor=PULSE_FLOOR):
+    """Return the 0-255 opacity of every wave in one frame of a looping pulse travelling outward"""
+    return [
+        round(255 * (floor + (1 - floor) * (0.5 + 0.5 * math.cos(2 * math.pi * (frame / frames - wave / count)))))
+        for wave in range(count)
+    ]
+
+
+def _tile_runs(tiles, tile_size, width, height):
+    """Merge (row, column) tiles into one box per horizontal run of adjacent tiles"""
+    boxes = []
+    for row in sorted({row for row, _ in tiles}):
+        columns = sorted(column for tile_row, column in tiles if tile_row == row)
+        start = previous = columns[0]
+        for column in columns[1:] + [None]:
+            if column == previous + 1:
+                previous = column
+                continue
+            boxes.append((start * tile_size, row * tile_size,
+                          min(width, (previous + 1) * tile_size), min(height, (row + 1) * tile_size)))
+            start = previous = column
+    return boxes
+
+
+class WaveAnimation:
+    """A generator's static base plus its sound waves as coverage and wave-number maps"""
+
+    def __init__(self, name, size, params=None, tile_size=TILE_SIZE):
+        params = dict(params or {})
+        waves, count_knob, role = load_wave_generator(name)
+        accepted = inspect.signature(waves).parameters
+        calls = waves(size, **{knob: value for knob, value in params.items() if knob in accepted})
+        self.count = max((wave for wave, _, _, _ in calls), default=-1) + 1
+        if self.count > 255:
+            raise ValueError(f'At most 255 waves can be animated, got {self.count}')
+        self.tile_size = tile_size
+
+        if role is None:
+            self.color = tuple(calls[0][3]['fill'][:3]) if calls else (0, 0, 0)
+        else:
+            palette = params.get('palette', 'default')
+            if isinstance(palette, str):
+                palette = load_role_generator(name)[1][palette]
+            if role not in palette:
+                raise ValueError(f"The palette has no '{role}' colour to animate")
+            self.color = tuple(palette[role])
+
+        base = load_generator(name)(size, **{**params, count_knob: 0})
+        self.base = base if base.mode == 'RGBA' else base.convert('RGBA')
+
+        # All waves in drawing order, as the still draws them, and each wave on its own
+        self.coverage = MaskLayer(self.base.size, self.color, antialias=True)
+        layers = [MaskLayer(self.base.size, self.color, antialias=True) for _ in range(self.count)]
+        for wave, shape, xy, call_params in calls:
+            getattr(self.coverage, shape)(xy, **call_params)
+            getattr(layers[wave], shape)(xy, **call_params)
+
+        # Wave number + 1 of every covered pixel (0 elsewhere) and the tiles each wave touches
+        self.index = Image.new('L', self.base.size, 0)
+        self.wave_tiles = []
+        for wave, layer in enumerate(layers):
+            self.index.paste(wave + 1, mask=layer.image.point(lambda value: 255 if value else 0))
+            self.wave_tiles.append(self._touched_tiles(layer))
+
+    def _touched_tiles(self, layer):
+        """Return the (row, column) tiles where a wave's mask has any coverage"""
+        if layer.bbox is None:
+            return set()
+        left, top, right, bottom = layer.bbox
+        tile = self.tile_size
+        return {
+            (row, column)
+            for row in range(top // tile, -(-bottom // tile))
+            for column in range(left // tile, -(-right // tile))
+            if layer.image.crop((column * tile, row * tile, (column + 1) * tile, (row + 1) * tile)).getbbox()
+        }
+
+    def render(self, frames):
+        """Render a looping pulse of frames
+
+        Each frame starts from the previous one; only tiles touched by waves
+        whose opacity changed are restored from the base and composited again.
+        Returns (frames, fraction of all frame pixels that were re-rendered).
+        """
+        width, height = self.base.size
+        mask = Image.new('L', self.base.size, 0)
+        images = []
+        image, previous = self.base, None
+        redrawn = 0
+        for frame in range(frames):
+            levels = wave_levels(frame, frames, self.count)
+            changed = [wave for wave in range(self.count) if previous is None or levels[wave] != previous[wave]]
+            boxes = _tile_runs(set().union(*(self.wave_tiles[wave] for wave in changed)), self.tile_size, width, height)
+            # Opacity table indexed by the wave-number map: 0 for uncovered pixels, then one entry per wave
+            weights = self.index.point([0] + levels + [0] * (255 - self.count))
+            image = image.copy()
+            for box in boxes:
+                image.paste(self.base.crop(box), box[:2])
+                mask.paste(ImageChops.multiply(self.coverage.image.crop(box), weights.crop(box)), box[:2])
+                # One composite per run: a composite decodes the union of its boxes
+                backend.composite_boxes(image, [(mask, box, self.color)])
+            redrawn += sum((right - left) * (bottom - top) for left, top, right, bottom in boxes)
+            images.append(image)
+            previous = levels
+        return images, redrawn / (frames * width * height)
+
+
+def changed_pixels(frames):
+    """Return the frames with every pixel equal to the previous frame's made transparent
+
+    Only meaningful for opaque frames: blended over the previous frame, the
+    transparent pixels leave it showing, which reproduces the original frame.
+    """
+    deltas = [frames[0]]
+    for previous, frame in zip(frames, frames[1:]):
+        bands = ImageChops.difference(frame, previous).split()
+        changed = bands[0]
+        for band in bands[1:]:
+            changed = ImageChops.lighter(changed, band)
+        delta = Image.new('RGBA', frame.size, (0, 0, 0, 0))
+        delta.paste(frame, mask=changed.point(lambda value: 255 if value else 0))
+        deltas.append(delta)
+    return deltas
+
+
+def save_animation(frames, path, fps=30, format='apng'):
+    """Encode frames as a looping APNG or lossless animated WebP"""
+    encoder = FORMATS[format][0]
+    options = {'lossless': True} if format == 'webp' else {}
+    opaque = all(frame.mode == 'RGBA' and frame.getchannel('A').getextrema() == (255, 255) for frame in frames)
+    if format == 'apng' and opaque:
+        # Keep each frame on the canvas (disposal 0) and blend the next one over it (blend 1)
+        frames = changed_pixels(frames)
+        options = {'disposal': 0, 'blend': 1}
+    frames[0].save(path, encoder, save_all=True, append_images=frames[1:], duration=round(1000 / fps), loop=0,
+                   **options)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render a looping sound-wave pulse animation')
+    parser.add_argument('generator', choices=list(WAVE_GENERATORS))
+    parser.add_argument('--frames', type=int, default=60, help='Frames in one loop (default: 60)')
+    parser.add_argument('--size', type=int, default=512, help='Frame size in pixels (default: 512)')
+    parser.add_argument('--fps', type=float, default=30, help='Frames per second (default: 30)')
+    parser.add_argument('--format', choices=list(FORMATS), default='apng', help='Output format (default: apng)')
+    parser.add_argument('--param', nargs=2, action='append', default=[], metavar=('NAME', 'VALUE'),
+                        help='Design knob for the generator (see sweep.py --list)')
+    parser.add_argument('--output', default=None, help='Output path (default: build/animations/<generator>.<ext>)')
+    parser.add_argument('--max-kb', type=float, default=None, help='Fail if the saved file is larger than this')
+    args = parser.parse_args()
+
+    if args.frames < 1:
+        parser.error('--frames must be at least 1')
+    defaults = design_parameters(args.generator)
+    params = {}
+    for knob, value in args.param:
+        if knob not in defaults:
+            parser.error(f"Unknown knob '{knob}' for {args.generator}, expected one of: {', '.join(defaults)}")
+        params[knob] = parse_values([value])[0]
+    output = args.output or os.path.join(DEFAULT_OUTPUT_DIR, args.generator + FORMATS[args.format][1])
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    start = time.perf_counter()
+    animation = WaveAnimation(args.generator, args.size, params)
+    setup_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    frames, redrawn = animation.render(args.frames)
+    render_seconds = time.perf_counter() - start
+    print(f"✓ Rendered the base and {animation.count} waves in {setup_seconds:.2f}s")
+    print(f"✓ Rendered {args.frames} frames in {render_seconds:.2f}s "
+          f"({render_seconds / args.frames * 1000:.1f}ms per frame, {redrawn:.0%} of the pixels redrawn)")
+
+    start = time.perf_counter()
+    save_animation(frames, output, args.fps, args.format)
+    kilobytes = os.path.getsize(output) / 1024
+    if args.max_kb is not None and kilobytes > args.max_kb:
+        print(f"✗ Saved {output} ({kilobytes:.0f} KB), over the {args.max_kb:g} KB limit")
+        sys.exit(1)
+    print(f"✓ Saved {output} ({kilobytes:.0f} KB) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
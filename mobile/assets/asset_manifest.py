@@ -0,0 +1,99 @@
+"""
+Content-hash manifest for incremental asset builds
+Each output records a hash of the code that produced it (the generator module
+and the local helper modules it imports), its size and parameters, any input
+image, and the output file itself. A target is skipped when all of them match.
+"""
+import ast
+import hashlib
+import json
+import os
+
+ASSETS_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_NAME = '.asset-manifest.json'
+
+
+def file_hash(path):
+    """Return the SHA-256 hex digest of a file, or None if it does not exist"""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _local_imports(module_path):
+    """Return paths of the sibling modules imported by a module"""
+    with open(module_path, 'rb') as handle:
+        tree = ast.parse(handle.read(), module_path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+    paths = (os.path.join(os.path.dirname(module_path), f'{name}.py') for name in names)
+    return sorted(path for path in paths if os.path.exists(path))
+
+
+def source_hash(module_name):
+    """Hash a generator module together with every local module it imports"""
+    pending = [os.path.join(ASSETS_DIR, f'{module_name}.py')]
+    seen = set()
+    digest = hashlib.sha256()
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        pending.extend(_local_imports(path))
+    for path in sorted(seen):
+        digest.update(os.path.basename(path).encode())
+        digest.update(file_hash(path).encode())
+    return digest.hexdigest()
+
+
+def build_inputs(module_name, size, params=None, input_path=None):
+    """Describe everything an output depends on"""
+    return {
+        'source': source_hash(module_name),
+        'size': list(size) if isinstance(size, tuple) else size,
+        'params': params or {},
+        'input': file_hash(input_path) if input_path else None,
+    }
+
+
+class AssetManifest:
+    """Records the inputs and output hash of every generated asset"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(ASSETS_DIR, MANIFEST_NAME)
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path) as handle:
+                self.entries = json.load(handle)
+
+    def _key(self, output_path):
+        return os.path.relpath(os.path.abspath(output_path), os.path.dirname(os.path.abspath(self.path)))
+
+    def is_fresh(self, output_path, inputs):
+        """Return True if output_path was built from inputs and is unchanged since"""
+        entry = self.entries.get(self._key(output_path))
+        if entry is None or entry['inputs'] != json.loads(json.dumps(inputs)):
+            return False
+        return file_hash(output_path) == entry['output']
+
+    def record(self, output_path, inputs):
+        """Remember that output_path was just built from inputs"""
+        self.entries[self._key(output_path)] = {
+            'inputs': inputs,
+            'output': file_hash(output_path),
+        }
+
+    def save(self):
+        """Write the manifest back to disk"""
+        with open(self.path, 'w') as handle:
+            json.dump(self.entries, handle, indent=2, sort_keys=True)
+            handle.write('\n')
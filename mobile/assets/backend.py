@@ -0,0 +1,102 @@
+"""
+Rendering backend selection
+The pixel-level operations the generators use (gradients, masks, anti-aliased
+shapes, disc stamps and layer compositing) have two implementations with the
+same signatures: backend_numpy, built on the vectorized NumPy modules, and
+backend_pillow, which needs nothing but Pillow. Generators import the
+operations from here and each call goes to the active backend.
+
+NumPy is used when it can be imported. Set ASSETS_BACKEND=pillow (or numpy)
+to choose explicitly, or call use_backend() at runtime.
+"""
+import importlib
+import os
+
+# Backend name -> implementing module, in order of preference
+BACKENDS = {
+    'numpy': 'backend_numpy',
+    'pillow': 'backend_pillow',
+}
+
+_active = None
+
+
+def _load(name):
+    """Import a backend module, or return None if its dependencies are missing"""
+    try:
+        return importlib.import_module(BACKENDS[name])
+    except ImportError:
+        return None
+
+
+def available_backends():
+    """Return the names of the backends that can be imported here"""
+    return [name for name in BACKENDS if _load(name) is not None]
+
+
+def use_backend(name=None):
+    """Make a backend active by name, or the preferred available one for None, and return it"""
+    global _active
+    name = name or os.environ.get('ASSETS_BACKEND')
+    if name is None:
+        name = available_backends()[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend {name!r}; choose from {', '.join(BACKENDS)}")
+    module = _load(name)
+    if module is None:
+        raise ImportError(f"The {name} backend is not available here")
+    _active = module
+    return module
+
+
+def current_backend():
+    """Return the active backend module, selecting one on first use"""
+    return _active or use_backend()
+
+
+def linear_gradient(size, start_color, end_color, direction=(1, 1), region=None, linear=False):
+    """Create a linear gradient running along direction (dx, dy); see gradients.linear_gradient"""
+    return current_backend().linear_gradient(size, start_color, end_color, direction, region, linear)
+
+
+def multi_stop_gradient(size, bands, region=None, linear=False):
+    """Create a vertical gradient from a list of colour bands; see gradients.multi_stop_gradient"""
+    return current_backend().multi_stop_gradient(size, bands, region, linear)
+
+
+def angular_gradient(size, center, start_color, end_color, phase=0.0, region=None, linear=False):
+    """Create a gradient that follows the angle around center; see gradients.angular_gradient"""
+    return current_backend().angular_gradient(size, center, start_color, end_color, phase, region, linear)
+
+
+def radial_gradient(size, center, inner_radius, outer_radius, start_color, end_color,
+                    angle_range=None, background=(0, 0, 0, 0), region=None, linear=False):
+    """Create a ring gradient from inner_radius to outer_radius; see gradients.radial_gradient"""
+    return current_backend().radial_gradient(size, center, inner_radius, outer_radius, start_color, end_color,
+                                             angle_range, background, region, linear)
+
+
+def circle_mask(size, center, radius, region=None):
+    """Create an anti-aliased L-mode circle mask; see gradients.circle_mask"""
+    return current_backend().circle_mask(size, center, radius, region)
+
+
+def draw_shape(image, shape, xy, fill=None, outline=None, width=1, offset=(0, 0), radius=0, start=0, end=360):
+    """Composite an anti-aliased shape onto an RGBA image or L-mode coverage mask
+
+    shape is 'rectangle', 'rounded_rectangle', 'ellipse', 'arc' or 'line' and
+    xy a flat coordinate list with ImageDraw's conventions, as are radius,
+    start and end. offset is subtracted from the coordinates. Returns the
+    touched (left, top, right, bottom) box, or None if nothing was drawn.
+    """
+    return current_backend().draw_shape(image, shape, xy, fill, outline, width, offset, radius, start, end)
+
+
+def stamp_discs(image, centers, radius, fill, offset=(0, 0)):
+    """Composite anti-aliased discs of one radius and colour in one operation; see sprites.stamp_discs"""
+    return current_backend().stamp_discs(image, centers, radius, fill, offset)
+
+
+def composite_boxes(base, layers):
+    """Composite (image, box[, color]) layers onto an RGBA base; see compositing.composite_boxes"""
+    return current_backend().composite_boxes(base, layers)
@@ -0,0 +1,43 @@
+"""
+NumPy rendering backend
+Collects the vectorized NumPy implementations of the backend operations:
+gradients from gradients.py, anti-aliased shapes from sdf.py, disc sprites
+from sprites.py and linear-light layer compositing from compositing.py.
+"""
+import sdf
+from compositing import composite_boxes
+from gradients import angular_gradient, circle_mask, linear_gradient, multi_stop_gradient, radial_gradient
+from sprites import stamp_discs
+
+NAME = 'numpy'
+
+
+def _strokes(shape, xy, fill, outline, width, radius, start, end):
+    """Return the shape's (bounds, [(distance function, colour), ...]) for sdf.draw_shape"""
+    if shape == 'line':
+        points = list(zip(xy[0::2], xy[1::2]))
+        distance = sdf.union(*(sdf.segment(a, b, width) for a, b in zip(points, points[1:])))
+        margin = max(width, 1)
+        bounds = (min(xy[0::2]) - margin, min(xy[1::2]) - margin,
+                  max(xy[0::2]) + margin + 1, max(xy[1::2]) + margin + 1)
+        return bounds, [(distance, fill)]
+    if shape == 'arc':
+        return sdf.edges(xy), [(sdf.arc(xy, start, end, width), fill)]
+    distance = sdf.ellipse(xy) if shape == 'ellipse' else sdf.rounded_rectangle(xy, radius)
+    return sdf.edges(xy), [(distance, fill), (sdf.outline(distance, width), outline)]
+
+
+def draw_shape(image, shape, xy, fill=None, outline=None, width=1, offset=(0, 0), radius=0, start=0, end=360):
+    """Composite an anti-aliased shape onto an image (see backend.draw_shape)"""
+    bounds, strokes = _strokes(shape, xy, fill, outline, width, radius, start, end)
+    touched = None
+    for distance, color in strokes:
+        if color is None:
+            continue
+        box = sdf.draw_shape(image, distance, bounds, color, offset=offset)
+        if box is not None:
+            touched = box if touched is None else (
+                min(box[0], touched[0]), min(box[1], touched[1]),
+                max(box[2], touched[2]), max(box[3], touched[3]),
+            )
+    return touched
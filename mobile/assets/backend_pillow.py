@@ -0,0 +1,376 @@
+"""
+Pillow-only rendering backend
+Implements the backend operations with Pillow's own C routines, for build
+images without NumPy. Gradients are colour tables spread over the canvas by
+an affine transform, or factor images evaluated with ImageMath and mapped
+through per-channel lookup tables. Anti-aliased shapes are drawn by ImageDraw
+at SUPERSAMPLE times the size and reduced, and layers are blended with
+Image.alpha_composite. Python only ever loops once per row, column or table
+entry, never per pixel.
+Compositing blends in sRGB rather than linear light, so where translucent
+layers overlap colours differ slightly from the NumPy backend.
+"""
+import math
+from array import array
+from functools import lru_cache
+
+from PIL import Image, ImageChops, ImageDraw, ImageMath
+
+NAME = 'pillow'
+
+# Linear scale of the grid shapes and disc sprites are supersampled on
+SUPERSAMPLE = 4
+
+# Levels in the colour lookup tables factor images are mapped through
+FACTOR_STEPS = 4096
+
+# Linear-light levels in the encode table, as in compositing.py
+LINEAR_STEPS = 4096
+
+# Pillow 10.3 split ImageMath.eval into lambda_eval and unsafe_eval; the expressions
+# here are fixed strings with values passed as keywords, never outside input
+_math_eval = getattr(ImageMath, 'unsafe_eval', None) or ImageMath.eval
+
+
+def _srgb_to_linear(value):
+    """Decode one sRGB value in 0..1 to linear light"""
+    return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value):
+    """Encode one linear-light value in 0..1 as sRGB"""
+    return value * 12.92 if value <= 0.0031308 else 1.055 * value ** (1 / 2.4) - 0.055
+
+
+LINEAR_TO_SRGB = bytes(round(_linear_to_srgb(step / (LINEAR_STEPS - 1)) * 255) for step in range(LINEAR_STEPS))
+
+
+def _region(size, region):
+    """Return the (left, top, right, bottom) box to render, defaulting to the whole canvas"""
+    return region if region is not None else (0, 0, size[0], size[1])
+
+
+def _color(color):
+    """Return a colour as a float RGBA tuple, defaulting alpha to opaque"""
+    if len(color) == 3:
+        color = tuple(color) + (255,)
+    return tuple(float(channel) for channel in color)
+
+
+def color_mixer(start_color, end_color, linear=False):
+    """Return a function mixing two colours by a scalar factor, truncating like int()
+
+    With linear the colour channels are mixed in linear light and encoded back
+    to sRGB through the encode table; alpha is always mixed as is.
+    """
+    start = _color(start_color)
+    end = _color(end_color)
+    if linear:
+        start = tuple(_srgb_to_linear(channel / 255) for channel in start[:3]) + start[3:]
+        end = tuple(_srgb_to_linear(channel / 255) for channel in end[:3]) + end[3:]
+
+    def mix(factor):
+        values = [first + (last - first) * factor for first, last in zip(start, end)]
+        if linear:
+            rgb = [LINEAR_TO_SRGB[int(min(max(value, 0), 1) * (LINEAR_STEPS - 1) + 0.5)] for value in values[:3]]
+            return rgb + [int(min(max(values[3], 0), 255))]
+        return [int(min(max(value, 0), 255)) for value in values]
+
+    return mix
+
+
+def _strip(factors, mix, vertical=False):
+    """Return a one-pixel RGBA strip with one mixed colour per factor"""
+    size = (1, len(factors)) if vertical else (len(factors), 1)
+    return Image.frombytes('RGBA', size, bytes(channel for factor in factors for channel in mix(factor)))
+
+
+def _coordinates(size, region):
+    """Return F-mode images of the x and y canvas coordinates of the rendered region"""
+    left, top, right, bottom = _region(size, region)
+    width, height = right - left, bottom - top
+    xs = Image.frombytes('F', (width, 1), array('f', range(left, right)).tobytes())
+    ys = Image.frombytes('F', (1, height), array('f', range(top, bottom)).tobytes())
+    return (xs.resize((width, height), Image.Resampling.NEAREST),
+            ys.resize((width, height), Image.Resampling.NEAREST))
+
+
+def _colorize(factor, mix):
+    """Map an F-mode factor image in 0..1 to RGBA through per-channel lookup tables"""
+    indices = _math_eval('int(min(max(factor, 0), 1) * top + 0.5)', factor=factor, top=FACTOR_STEPS - 1)
+    colors = [mix(step / (FACTOR_STEPS - 1)) for step in range(FACTOR_STEPS)]
+    # I-mode images take a full 16-bit table; indices never go past FACTOR_STEPS
+    padding = [0] * (65536 - FACTOR_STEPS)
+    return Image.merge('RGBA', [
+        indices.point([color[channel] for color in colors] + padding, 'L') for channel in range(4)
+    ])
+
+
+def _distance(size, center, region):
+    """Return the F-mode x offset, y offset and distance of every pixel from center"""
+    xs, ys = _coordinates(size, region)
+    dx = _math_eval('xs - cx', xs=xs, cx=center[0])
+    dy = _math_eval('ys - cy', ys=ys, cy=center[1])
+    dist = _math_eval('(dx * dx + dy * dy) ** 0.5', dx=dx, dy=dy)
+    return dx, dy, dist
+
+
+def linear_gradient(size, start_color, end_color, direction=(1, 1), region=None, linear=False):
+    """Create a linear gradient running along direction (dx, dy)
+
+    The colour depends only on x * dx + y * dy, so it is mixed once per value
+    into a strip that an affine transform spreads over the region.
+    """
+    width, height = size
+    dx, dy = direction
+    left, top, right, bottom = _region(size, region)
+    span = width * abs(dx) + height * abs(dy)
+    offset = (width * max(0, -dx) + height * max(0, -dy)) / span
+    corners = [x * dx + y * dy for x in (left, right - 1) for y in (top, bottom - 1)]
+    lowest = math.floor(min(corners))
+    steps = range(lowest, math.ceil(max(corners)) + 1)
+    strip = _strip([step / span + offset for step in steps], color_mixer(start_color, end_color, linear))
+    # The transform samples the strip at dx * (x + 0.5) + dy * (y + 0.5) + c for output pixel (x, y)
+    shift = dx * (left - 0.5) + dy * (top - 0.5) - lowest + 0.5
+    integral = float(dx).is_integer() and float(dy).is_integer()
+    return strip.transform(
+        (right - left, bottom - top), Image.Transform.AFFINE, (dx, dy, shift, 0, 0, 0.5),
+        Image.Resampling.NEAREST if integral else Image.Resampling.BILINEAR,
+    )
+
+
+def multi_stop_gradient(size, bands, region=None, linear=False):
+    """Create a vertical gradient from a list of colour bands (see gradients.multi_stop_gradient)"""
+    left, top, right, bottom = _region(size, region)
+    rows = bytearray(4 * (bottom - top))
+    for index, (start, end, start_color, end_color) in enumerate(bands):
+        stop = bands[index + 1][0] if index + 1 < len(bands) else size[1]
+        first, last = max(int(start), top), min(int(stop), bottom)
+        if first >= last:
+            continue
+        strip = _strip([(y - start) / (end - start) for y in range(first, last)],
+                       color_mixer(start_color, end_color, linear), vertical=True)
+        rows[4 * (first - top):4 * (last - top)] = strip.tobytes()
+    column = Image.frombytes('RGBA', (1, bottom - top), bytes(rows))
+    return column.resize((right - left, bottom - top), Image.Resampling.NEAREST)
+
+
+def angular_gradient(size, center, start_color, end_color, phase=0.0, region=None, linear=False):
+    """Create a gradient that follows the angle around center (see gradients.angular_gradient)
+
+    cos(angle - phase) is the offset projected on the phase direction over its
+    length, which ImageMath can evaluate without trigonometry.
+    """
+    dx, dy, dist = _distance(size, center, region)
+    # arctan2 puts the centre itself at angle 0, which is the offset (1, 0) at distance 1
+    centre = _math_eval('dist == 0', dist=dist)
+    factor = _math_eval(
+        '(1 + ((dx + centre) * cos_phase + dy * sin_phase) / (dist + centre)) / 2',
+        dx=dx, dy=dy, dist=dist, centre=centre, cos_phase=math.cos(phase), sin_phase=math.sin(phase),
+    )
+    return _colorize(factor, color_mixer(start_color, end_color, linear))
+
+
+def _within_angles(dx, dy, start, end):
+    """Return an F-mode image that is 1 where the offset's angle lies strictly between start and end"""
+    def side(angle):
+        # Positive where the offset lies clockwise of angle, in image coordinates
+        return _math_eval('dy * cos_angle - dx * sin_angle', dx=dx, dy=dy,
+                          cos_angle=math.cos(angle), sin_angle=math.sin(angle))
+
+    after_start, before_end = side(start), side(end)
+    if (end - start) % (2 * math.pi) <= math.pi:
+        return _math_eval('(a > 0) * (b < 0)', a=after_start, b=before_end)
+    return _math_eval('1 - (a <= 0) * (b >= 0)', a=after_start, b=before_end)
+
+
+def radial_gradient(size, center, inner_radius, outer_radius, start_color, end_color,
+                    angle_range=None, background=(0, 0, 0, 0), region=None, linear=False):
+    """Create a ring gradient from inner_radius (exclusive) to outer_radius (see gradients.radial_gradient)"""
+    dx, dy, dist = _distance(size, center, region)
+    factor = _math_eval('(dist - inner) / (outer - inner)', dist=dist, inner=inner_radius, outer=outer_radius)
+    inside = _math_eval('(dist > inner) * (dist <= outer)', dist=dist, inner=inner_radius, outer=outer_radius)
+    if angle_range is not None:
+        within = _within_angles(dx, dy, *angle_range)
+        inside = _math_eval('a * b', a=inside, b=within)
+    mask = _math_eval("convert(inside * 255, 'L')", inside=inside)
+    image = Image.new('RGBA', dist.size, tuple(int(channel) for channel in _color(background)))
+    image.paste(_colorize(factor, color_mixer(start_color, end_color, linear)), mask=mask)
+    return image
+
+
+def circle_mask(size, center, radius, region=None):
+    """Create an L-mode mask that is 255 within radius of center, with an anti-aliased edge"""
+    _, _, dist = _distance(size, center, region)
+    return _math_eval("convert(min(max(radius + 0.5 - dist, 0), 1) * 255 + 0.5, 'L')", dist=dist, radius=radius)
+
+
+def _paint(image, mask, left, top, fill):
+    """Composite fill onto an image through an L-mode coverage mask placed at (left, top)
+
+    RGBA images take an (r, g, b[, a]) fill. L-mode coverage masks take an
+    integer coverage level and accumulate like alpha does.
+    """
+    alpha = fill if isinstance(fill, int) else (fill[3] if len(fill) > 3 else 255)
+    if alpha < 255:
+        mask = mask.point(lambda value: value * alpha // 255)
+    if image.mode == 'L':
+        box = (left, top, left + mask.width, top + mask.height)
+        image.paste(ImageChops.screen(image.crop(box), mask), box)
+        return
+    layer = Image.new('RGBA', mask.size, tuple(fill[:3]) + (0,))
+    layer.putalpha(mask)
+    image.alpha_composite(layer, dest=(left, top))
+
+
+def _extended(start, end, distance):
+    """Return end moved distance further away from start"""
+    length = math.hypot(end[0] - start[0], end[1] - start[1])
+    if not length:
+        return end
+    return (end[0] + (end[0] - start[0]) * distance / length, end[1] + (end[1] - start[1]) * distance / length)
+
+
+def draw_shape(image, shape, xy, fill=None, outline=None, width=1, offset=(0, 0), radius=0, start=0, end=360):
+    """Composite an anti-aliased shape onto an image (see backend.draw_shape)
+
+    The shape is drawn by ImageDraw on a SUPERSAMPLE times larger coverage
+    mask over its bounds only, which reduce() averages back down.
+    """
+    xs = [x - offset[0] for x in xy[0::2]]
+    ys = [y - offset[1] for y in xy[1::2]]
+    margin = max(width, 1) + 1 if shape == 'line' else 1
+    bounds = (math.floor(min(xs) - margin), math.floor(min(ys) - margin),
+              math.ceil(max(xs) + margin) + 1, math.ceil(max(ys) + margin) + 1)
+    left, top = max(0, bounds[0]), max(0, bounds[1])
+    right, bottom = min(image.width, bounds[2]), min(image.height, bounds[3])
+    if left >= right or top >= bottom:
+        return None
+    # Wide lines rasterize differently once the mask edge clips them, so they are
+    # drawn whole and cropped; other shapes are only drawn where they land
+    mask_box = bounds if shape == 'line' else (left, top, right, bottom)
+
+    scale = SUPERSAMPLE
+    origin_x, origin_y = (offset[0] + mask_box[0]) * scale, (offset[1] + mask_box[1]) * scale
+
+    def grid(x, y, steps=1):
+        # Snap to the finer grid (line endpoints to half steps, so pixel centres stay
+        # exact) in canvas coordinates before moving to the mask origin, so every
+        # tile rounds alike
+        return round(x * steps) / steps - origin_x, round(y * steps) / steps - origin_y
+
+    if shape == 'line':
+        # ImageDraw puts line endpoints on pixel centres; the ends reach half a pixel
+        # past them, which the strokes on the finer grid have to be extended by
+        points = [((x + 0.5) * scale - 0.5, (y + 0.5) * scale - 0.5) for x, y in zip(xy[0::2], xy[1::2])]
+        points[0] = _extended(points[1], points[0], scale / 2)
+        points[-1] = _extended(points[-2], points[-1], scale / 2)
+        points = [grid(x, y, steps=2) for x, y in points]
+        strokes = [(fill, lambda draw: draw.line(points, fill=255, width=max(width, 1) * scale))]
+    else:
+        # An inclusive box [x0, x1] covers the continuous edges x0..x1 + 1
+        box = grid(min(xy[0::2]) * scale, min(xy[1::2]) * scale) + tuple(
+            value - 1 for value in grid((max(xy[0::2]) + 1) * scale, (max(xy[1::2]) + 1) * scale)
+        )
+        stroke_width = max(width, 1) * scale
+        if shape == 'arc':
+            strokes = [(fill, lambda draw: draw.arc(box, start, end, fill=255, width=stroke_width))]
+        else:
+            # rectangle, rounded_rectangle and ellipse are ImageDraw methods of the same name
+            options = {'radius': radius * scale} if shape == 'rounded_rectangle' else {}
+            strokes = [
+                (fill, lambda draw: getattr(draw, shape)(box, fill=255, **options)),
+                (outline, lambda draw: getattr(draw, shape)(box, outline=255, width=stroke_width, **options)),
+            ]
+
+    touched = None
+    for color, stroke in strokes:
+        if color is None:
+            continue
+        mask = Image.new('L', ((mask_box[2] - mask_box[0]) * scale, (mask_box[3] - mask_box[1]) * scale), 0)
+        stroke(ImageDraw.Draw(mask))
+        mask = mask.reduce(scale).crop(
+            (left - mask_box[0], top - mask_box[1], right - mask_box[0], bottom - mask_box[1])
+        )
+        _paint(image, mask, left, top, color)
+        touched = (left, top, right, bottom)
+    return touched
+
+
+@lru_cache(maxsize=256)
+def disc_sprite(radius, phase_x=0, phase_y=0):
+    """Return an anti-aliased disc coverage sprite as an L-mode image (see sprites.disc_coverage)
+
+    Cached images are shared; do not modify them.
+    """
+    extent = math.ceil(radius) + 1
+    side = (2 * extent + 1) * SUPERSAMPLE
+    cx = (extent + phase_x / SUPERSAMPLE) * SUPERSAMPLE
+    cy = (extent + phase_y / SUPERSAMPLE) * SUPERSAMPLE
+    reach = radius * SUPERSAMPLE
+    sprite = Image.new('L', (side, side), 0)
+    ImageDraw.Draw(sprite).ellipse([cx - reach, cy - reach, cx + reach - 1, cy + reach - 1], fill=255)
+    return sprite.reduce(SUPERSAMPLE)
+
+
+def _placed(center, radius):
+    """Return (sprite, left, top) for a disc centred at a continuous position"""
+    x, y = center
+    cell_x, cell_y = math.floor(x), math.floor(y)
+    phase_x = round((x - cell_x) * SUPERSAMPLE)
+    phase_y = round((y - cell_y) * SUPERSAMPLE)
+    cell_x, phase_x = cell_x + phase_x // SUPERSAMPLE, phase_x % SUPERSAMPLE
+    cell_y, phase_y = cell_y + phase_y // SUPERSAMPLE, phase_y % SUPERSAMPLE
+    extent = math.ceil(radius) + 1
+    return disc_sprite(radius, phase_x, phase_y), cell_x - extent, cell_y - extent
+
+
+def stamp_discs(image, centers, radius, fill, offset=(0, 0)):
+    """Composite filled anti-aliased discs of one radius and colour onto an image (see sprites.stamp_discs)"""
+    stamps = [_placed((x - offset[0] + 0.5, y - offset[1] + 0.5), radius + 0.5) for x, y in centers]
+    stamps = [
+        (sprite, left, top) for sprite, left, top in stamps
+        if left < image.width and top < image.height and left + sprite.width > 0 and top + sprite.height > 0
+    ]
+    if not stamps:
+        return None
+
+    box_left = max(0, min(left for _, left, _ in stamps))
+    box_top = max(0, min(top for _, _, top in stamps))
+    box_right = min(image.width, max(left + sprite.width for sprite, left, _ in stamps))
+    box_bottom = min(image.height, max(top + sprite.height for sprite, _, top in stamps))
+
+    mask = Image.new('L', (box_right - box_left, box_bottom - box_top), 0)
+    for sprite, left, top in stamps:
+        # Clip each sprite to the mask and merge it with the discs already there
+        x0, y0 = max(left, box_left), max(top, box_top)
+        x1, y1 = min(left + sprite.width, box_right), min(top + sprite.height, box_bottom)
+        target = (x0 - box_left, y0 - box_top, x1 - box_left, y1 - box_top)
+        merged = ImageChops.lighter(mask.crop(target), sprite.crop((x0 - left, y0 - top, x1 - left, y1 - top)))
+        mask.paste(merged, target)
+
+    _paint(image, mask, box_left, box_top, fill)
+    return (box_left, box_top, box_right, box_bottom)
+
+
+def composite_boxes(base, layers):
+    """Composite (image, box[, color]) layers onto an RGBA base in order (see compositing.composite_boxes)
+
+    Layers are blended by Image.alpha_composite in sRGB, limited to each box.
+    """
+    for layer in layers:
+        image, box = layer[:2]
+        if box[0] >= box[2] or box[1] >= box[3]:
+            continue
+        if len(layer) > 2:
+            color = layer[2]
+            coverage = image.crop(box)
+            alpha = color[3] if len(color) > 3 else 255
+            if alpha < 255:
+                coverage = coverage.point(lambda value: value * alpha // 255)
+            source = Image.new('RGBA', coverage.size, tuple(color[:3]) + (0,))
+            source.putalpha(coverage)
+            base.alpha_composite(source, dest=box[:2])
+        else:
+            base.alpha_composite(image, dest=box[:2], source=box)
+    return base
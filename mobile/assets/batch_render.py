@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Render many (generator, size, output path) jobs in parallel
+Jobs run on a process pool sized to the machine's cores and every generator
+writes under its own directory, so design variants no longer overwrite each
+other's icon.png and favicon.png.
+Usage: python batch_render.py [--output DIR] [--sizes 1024 512 64] [--generators NAME ...]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from generators import GENERATORS, generator_name, load_generator
+from memory_usage import track_memory
+
+
+def _run_job(job):
+    """Render and save one job inside a worker process"""
+    name, size, output_path, params, memory_budget_mb = job
+    generator = load_generator(name)
+
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    label = f'{name} {size}px'
+    with track_memory(label) if memory_budget_mb else nullcontext() as memory:
+        image = generator(size, **params)
+        render_seconds = time.perf_counter() - start_wall
+        image.save(output_path, 'PNG')
+        del image
+
+    return {
+        'generator': name,
+        'size': size,
+        'path': output_path,
+        'render_seconds': render_seconds,
+        'seconds': time.perf_counter() - start_wall,
+        'cpu_seconds': time.process_time() - start_cpu,
+        'bytes': os.path.getsize(output_path),
+        'peak_mb': memory.accounted_peak_mb if memory else None,
+        'over_memory_budget': bool(memory) and memory.over_budget(memory_budget_mb),
+        'memory_report': memory.format_report() if memory else None,
+    }
+
+
+def render_batch(jobs, output_dir, workers=None, memory_budget_mb=None):
+    """Render (generator, size, output path[, params]) jobs on a process pool
+
+    generator is a registry name or a registered function. Each output path is
+    written below output_dir/<generator name>/. Returns a summary with the
+    per-job results in input order and the total wall time. With
+    memory_budget_mb every job's peak memory is tracked and checked against it.
+    """
+    prepared = []
+    for job in jobs:
+        generator, size, output_path = job[:3]
+        params = job[3] if len(job) > 3 else {}
+        name = generator_name(generator)
+        path = os.path.join(output_dir, name, output_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        prepared.append((name, size, path, params, memory_budget_mb))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(prepared)))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_run_job, prepared))
+
+    return {
+        'workers': workers,
+        'wall_seconds': time.perf_counter() - start,
+        'cpu_seconds': sum(result['cpu_seconds'] for result in results),
+        'results': results,
+    }
+
+
+def print_summary(summary):
+    """Print a per-job timing and size table; return False if any job went over its memory budget"""
+    print(f"{'generator':<18} {'size':>6} {'render s':>9} {'total s':>8} {'bytes':>9} {'peak MB':>8}  path")
+    for result in summary['results']:
+        peak = f"{result['peak_mb']:.1f}" if result['peak_mb'] is not None else '-'
+        print(f"{result['generator']:<18} {result['size']:>6} {result['render_seconds']:>9.3f} "
+              f"{result['seconds']:>8.3f} {result['bytes']:>9} {peak:>8}  {result['path']}")
+    print()
+    print(f"✓ {len(summary['results'])} outputs in {summary['wall_seconds']:.2f}s wall "
+          f"({summary['cpu_seconds']:.2f}s CPU) on {summary['workers']} workers")
+
+    over = [result for result in summary['results'] if result['over_memory_budget']]
+    for result in over:
+        print(f"✗ {result['memory_report']}")
+    if over:
+        print(f"✗ {len(over)} outputs over the memory budget")
+    return not over
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render every generator variant in parallel')
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'build', 'variants'),
+                        help='Directory that receives one sub-directory per generator')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1024, 512, 64],
+                        help='Square sizes to render for every generator')
+    parser.add_argument('--generators', nargs='+', choices=list(GENERATORS), default=list(GENERATORS),
+                        help='Generators to render (default: all)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: one per core)')
+    parser.add_argument('--memory-budget', type=float, metavar='MB',
+                        help='Fail if any single render holds more than MB at once')
+    args = parser.parse_args()
+
+    jobs = [(name, size, f'icon-{size}.png') for name in args.generators for size in args.sizes]
+    print(f"Rendering {len(jobs)} variants into {args.output}...")
+    print()
+    summary = render_batch(jobs, args.output, workers=args.workers, memory_budget_mb=args.memory_budget)
+    if not print_summary(summary):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the icon generators
+Every entry point is run at several sizes with warmup and repeats. Each
+(entry point, size) case runs in its own process so peak memory is measured in
+isolation. Results are written to JSON and compared against a stored baseline.
+With --backends numpy pillow every case is run once per rendering backend and
+the backends are compared side by side.
+Usage: python benchmark.py [--entries ...] [--sizes 48 64 512 1024 4096]
+                           [--backends numpy pillow]
+                           [--baseline FILE] [--threshold 0.2] [--save-baseline]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import backend
+from generators import load_generator
+from memory_usage import peak_rss_mb
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCHMARK_DIR = os.path.join(SCRIPT_DIR, 'build', 'benchmarks')
+
+# Benchmark name -> generator registry name, or None for update_icon.resize_image
+ENTRY_POINTS = {
+    'generate_app_icon': 'app-icon',
+    'create_microphone_logo': 'microphone',
+    'create_ai_microphone_logo': 'ai-microphone',
+    'create_blue_microphone_logo': 'blue-microphone',
+    'resize_image': None,
+}
+
+DEFAULT_SIZES = [48, 64, 512, 1024, 4096]
+
+# Side of the synthetic source image resize_image is benchmarked with
+RESIZE_SOURCE_SIZE = 4096
+
+
+def _entry_callable(entry, size, workdir):
+    """Return a zero-argument callable that runs one entry point at size"""
+    if ENTRY_POINTS[entry] is not None:
+        generator = load_generator(ENTRY_POINTS[entry])
+        return lambda: generator(size)
+
+    import update_icon
+    source_path = os.path.join(workdir, 'source.png')
+    output_path = os.path.join(workdir, f'resized-{size}.png')
+    return lambda: update_icon.resize_image(source_path, output_path, (size, size))
+
+
+def run_case(entry, size, warmup, repeats, workdir, backend_name=None):
+    """Time one case in this process with a rendering backend and return its measurements"""
+    backend_name = backend.use_backend(backend_name).NAME
+    run = _entry_callable(entry, size, workdir)
+    baseline_rss = peak_rss_mb()
+    for _ in range(warmup):
+        run()
+
+    wall = []
+    cpu = []
+    for _ in range(repeats):
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        run()
+        wall.append(time.perf_counter() - start_wall)
+        cpu.append(time.process_time() - start_cpu)
+
+    return {
+        'entry': entry,
+        'size': size,
+        'backend': backend_name,
+        'repeats': repeats,
+        'wall_median': statistics.median(wall),
+        'wall_min': min(wall),
+        'cpu_median': statistics.median(cpu),
+        'peak_rss_mb': peak_rss_mb(),
+        'baseline_rss_mb': baseline_rss,
+    }
+
+
+def run_suite(entries, sizes, warmup=1, repeats=5, backends=None):
+    """Run every (entry, size, backend) case in a fresh interpreter and collect the results
+
+    backends defaults to the one selected automatically.
+    """
+    backends = backends or [backend.current_backend().NAME]
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        if 'resize_image' in entries:
+            # Render the resize source up front so it does not count towards any case
+            source = load_generator('app-icon')(RESIZE_SOURCE_SIZE)
+            source.save(os.path.join(workdir, 'source.png'), 'PNG', compress_level=1)
+            del source
+        for entry in entries:
+            for size in sizes:
+                # Single renders at large sizes are slow enough to measure without many repeats
+                case_repeats = repeats if size <= 1024 else max(1, repeats // 3)
+                for backend_name in backends:
+                    output = subprocess.run(
+                        [sys.executable, os.path.abspath(__file__), '--case', entry, str(size),
+                         '--backend', backend_name, '--warmup', str(warmup), '--repeats', str(case_repeats),
+                         '--workdir', workdir],
+                        check=True, capture_output=True, text=True, cwd=SCRIPT_DIR,
+                    ).stdout
+                    result = json.loads(output.splitlines()[-1])
+                    peak = f"{result['peak_rss_mb']:>7.0f}MB peak" if result['peak_rss_mb'] is not None else ''
+                    print(f"  {entry:<28} {size:>5}px  {backend_name:<6}  {result['wall_median'] * 1000:>9.1f}ms wall  "
+                          f"{result['cpu_median'] * 1000:>9.1f}ms cpu  {peak}")
+                    results.append(result)
+    return results
+
+
+def print_backend_comparison(results):
+    """Print each case's median wall time per backend, relative to the first backend"""
+    backends = list(dict.fromkeys(result['backend'] for result in results))
+    cases = {}
+    for result in results:
+        cases.setdefault((result['entry'], result['size']), {})[result['backend']] = result['wall_median']
+    print(f"\nBackend comparison (median wall time, relative to {backends[0]}):")
+    for (entry, size), times in cases.items():
+        reference = times.get(backends[0])
+        columns = []
+        for name in backends:
+            if name not in times:
+                continue
+            ratio = f" ({times[name] / reference:.2f}x)" if reference and name != backends[0] else ''
+            columns.append(f"{name} {times[name] * 1000:.1f}ms{ratio}")
+        print(f"  {entry:<28} {size:>5}px  {'  '.join(columns)}")
+
+
+def compare(results, baseline, threshold):
+    """Return the cases whose median wall time regressed by more than threshold"""
+    # Baselines from before backends were selectable all ran on NumPy
+    previous = {
+        (result['entry'], result['size'], result.get('backend', 'numpy')): result
+        for result in baseline['results']
+    }
+    regressions = []
+    for result in results:
+        before = previous.get((result['entry'], result['size'], result['backend']))
+        if before is None or before['wall_median'] <= 0:
+            continue
+        change = result['wall_median'] / before['wall_median'] - 1
+        if change > threshold:
+            regressions.append((result, before, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the icon generators')
+    parser.add_argument('--entries', nargs='+', choices=list(ENTRY_POINTS), default=list(ENTRY_POINTS))
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--backends', nargs='+', choices=list(backend.BACKENDS),
+                        help='Rendering backends to run every case with (default: the one selected automatically)')
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--output', default=os.path.join(BENCHMARK_DIR, 'latest.json'),
+                        help='Where to write the results JSON')
+    parser.add_argument('--baseline', default=os.path.join(BENCHMARK_DIR, 'baseline.json'),
+                        help='Baseline results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed median wall-time slowdown before failing (default: 0.2 = 20%%)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store these results as the new baseline')
+    parser.add_argument('--case', nargs=2, metavar=('ENTRY', 'SIZE'), help=argparse.SUPPRESS)
+    parser.add_argument('--backend', help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        entry, size = args.case
+        print(json.dumps(run_case(entry, int(size), args.warmup, args.repeats, args.workdir, args.backend)))
+        return
+
+    print(f"Benchmarking {len(args.entries)} entry points at {', '.join(map(str, args.sizes))}px...")
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'results': run_suite(args.entries, args.sizes, args.warmup, args.repeats, args.backends),
+    }
+    if len(args.backends or []) > 1:
+        print_backend_comparison(report['results'])
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    print(f"\n✓ Results written to {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"✓ Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+
+    with open(args.baseline) as f:
+        regressions = compare(report['results'], json.load(f), args.threshold)
+    if regressions:
+        print(f"\n✗ {len(regressions)} regressions over {args.threshold:.0%}:")
+        for result, before, change in regressions:
+            print(f"  {result['entry']} {result['size']}px {result['backend']}: {before['wall_median'] * 1000:.1f}ms -> "
+                  f"{result['wall_median'] * 1000:.1f}ms (+{change:.0%})")
+        sys.exit(1)
+    print(f"✓ No regressions over {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+"""
+Region-aware drawing for the logo generators
+Generators always describe shapes in full-canvas coordinates. When only a
+region (left, top, right, bottom) of the canvas is being rendered, RegionDraw
+shifts every shape into the region image and skips shapes that miss it.
+RegionDraw also tracks the bounding box it has drawn on, so LayerStack can
+composite transparent layers over a base image only where they were touched.
+Flat-colour layers are kept as one-byte coverage masks (MaskLayer) and only
+expanded during the composite. With antialias=True shapes are rasterized with
+smooth edges and composited over what is already there instead of replacing
+it. Rasterizing and compositing go through the active backend (backend.py).
+While a vector.record() block is active, layers also log what is drawn on
+them as resolution-independent primitives.
+"""
+import math
+
+from PIL import Image, ImageDraw, ImageFont
+
+import backend
+import vector
+
+
+def full_region(size):
+    """Return the region covering a whole square canvas"""
+    return (0, 0, size, size)
+
+
+def new_layer(size, color, region=None):
+    """Create an RGBA image for the given region of a square canvas
+
+    Unless color is transparent, it is recorded as a canvas fill while a vector
+    drawing is active.
+    """
+    if len(color) < 4 or color[3]:
+        vector.add_fill(paint=color)
+    left, top, right, bottom = region or full_region(size)
+    return Image.new('RGBA', (right - left, bottom - top), color)
+
+
+def gradient_layer(size, gradient, start_color, end_color, region=None, linear=False):
+    """Render a vector gradient (e.g. vector.LinearGradient) as an RGBA layer of a square canvas"""
+    vector.add_fill(gradient=gradient, paint=[(0, start_color), (1, end_color)], linear=linear)
+    return gradient.render(size, start_color, end_color, region, linear)
+
+
+def _flatten(xy):
+    """Return coordinates as a flat [x0, y0, x1, y1, ...] list"""
+    flat = []
+    for item in xy:
+        if isinstance(item, (tuple, list)):
+            flat.extend(item)
+        else:
+            flat.append(item)
+    return flat
+
+
+class RegionDraw:
+    """ImageDraw wrapper that draws full-canvas coordinates onto a region image"""
+
+    def __init__(self, image, region=None, antialias=False):
+        self.image = image
+        self.draw = ImageDraw.Draw(image)
+        self.region = region or (0, 0) + image.size
+        self.antialias = antialias
+        self.bbox = None
+        # vector.Shapes layer the shapes are logged to while recording
+        self.recording = None
+
+    def _touch(self, xs, ys, margin):
+        """Grow the drawn bounding box (in image coordinates) to cover a shape"""
+        width, height = self.image.size
+        box = (
+            max(0, math.floor(min(xs) - margin)),
+            max(0, math.floor(min(ys) - margin)),
+            min(width, math.ceil(max(xs) + margin) + 1),
+            min(height, math.ceil(max(ys) + margin) + 1),
+        )
+        if self.bbox is not None:
+            box = (min(box[0], self.bbox[0]), min(box[1], self.bbox[1]),
+                   max(box[2], self.bbox[2]), max(box[3], self.bbox[3]))
+        self.bbox = box
+
+    def _ink(self, color):
+        """Return a colour in the form the target image takes"""
+        return color
+
+    def _inks(self, kwargs):
+        return {
+            key: self._ink(value) if key in ('fill', 'outline') and value is not None else value
+            for key, value in kwargs.items()
+        }
+
+    def _place(self, xy, width=0):
+        """Shift coordinates into the region, or return None if the shape misses it"""
+        left, top, right, bottom = self.region
+        flat = _flatten(xy)
+        xs = flat[0::2]
+        ys = flat[1::2]
+        margin = width + 1
+        if (max(xs) + margin < left or min(xs) - margin > right or
+                max(ys) + margin < top or min(ys) - margin > bottom):
+            return None
+        self._touch([x - left for x in xs], [y - top for y in ys], margin)
+        if left == 0 and top == 0:
+            return xy
+        return [value - (top if index % 2 else left) for index, value in enumerate(flat)]
+
+    def _record(self, shape, xy, **params):
+        if self.recording is not None:
+            self.recording.add(shape, _flatten(xy), **params)
+
+    def _smooth(self, shape, xy, fill=None, outline=None, width=1, **options):
+        """Fill and/or outline a shape with anti-aliased edges through the backend"""
+        box = backend.draw_shape(
+            self.image, shape, _flatten(xy),
+            fill=self._ink(fill) if fill is not None else None,
+            outline=self._ink(outline) if outline is not None else None,
+            width=width, offset=self.region[:2], **options,
+        )
+        if box is not None:
+            left, top, right, bottom = box
+            self._touch([left, right - 1], [top, bottom - 1], 0)
+
+    def rectangle(self, xy, **kwargs):
+        self._record('rectangle', xy, **kwargs)
+        if self.antialias:
+            self._smooth('rectangle', xy, **kwargs)
+            return
+        placed = self._place(xy, kwargs.get('width', 0))
+        if placed is not None:
+            self.draw.rectangle(placed, **self._inks(kwargs))
+
+    def rounded_rectangle(self, xy, radius=0, **kwargs):
+        self._record('rounded_rectangle', xy, radius=radius, **kwargs)
+        if self.antialias:
+            self._smooth('rounded_rectangle', xy, radius=radius, **kwargs)
+            return
+        kwargs['radius'] = radius
+        placed = self._place(xy, kwargs.get('width', 0))
+        if placed is not None:
+            self.draw.rounded_rectangle(placed, **self._inks(kwargs))
+
+    def ellipse(self, xy, **kwargs):
+        self._record('ellipse', xy, **kwargs)
+        if self.antialias:
+            self._smooth('ellipse', xy, **kwargs)
+            return
+        placed = self._place(xy, kwargs.get('width', 0))
+        if placed is not None:
+            self.draw.ellipse(placed, **self._inks(kwargs))
+
+    def arc(self, xy, start, end, fill=None, width=1):
+        self._record('arc', xy, start=start, end=end, fill=fill, width=width)
+        if self.antialias:
+            self._smooth('arc', xy, fill=fill, width=width, start=start, end=end)
+            return
+        kwargs = {'fill': fill, 'width': width}
+        placed = self._place(xy, kwargs.get('width', 0))
+        if placed is not None:
+            self.draw.arc(placed, start, end, **self._inks(kwargs))
+
+    def line(self, xy, fill=None, width=0):
+        self._record('line', xy, fill=fill, width=width)
+        if self.antialias:
+            self._smooth('line', xy, fill=fill, width=width)
+            return
+        kwargs = {'fill': fill, 'width': width}
+        placed = self._place(xy, kwargs.get('width', 0))
+        if placed is not None:
+            self.draw.line(placed, **self._inks(kwargs))
+
+    def text(self, xy, text, fill=None, font=None):
+        """Draw text with its top-left anchor at full-canvas xy"""
+        if self.recording is not None:
+            face = font or ImageFont.load_default()
+            self.recording.add('text', tuple(xy), text=text, fill=fill, font_size=getattr(face, 'size', 10),
+                               ascent=face.getmetrics()[0] if hasattr(face, 'getmetrics') else 0)
+        x, y = xy[0] - self.region[0], xy[1] - self.region[1]
+        left, top, right, bottom = self.draw.textbbox((x, y), text, font=font)
+        self._touch([left, right], [top, bottom], 1)
+        self.draw.text((x, y), text, fill=self._ink(fill), font=font)
+
+    def stamp(self, centers, radius, fill):
+        """Draw anti-aliased discs of one radius and colour at many centres in one composite"""
+        if self.recording is not None:
+            self.recording.add('stamp', list(centers), radius=radius, fill=fill)
+        box = backend.stamp_discs(self.image, centers, radius, self._ink(fill), offset=self.region[:2])
+        if box is not None:
+            left, top, right, bottom = box
+            self._touch([left, right - 1], [top, bottom - 1], 0)
+
+
+class MaskLayer(RegionDraw):
+    """RegionDraw onto a one-byte coverage mask for a layer of one flat colour
+
+    Only the alpha of the fill and outline colours passed to the drawing
+    methods is kept, as coverage; the layer's own color is applied when the
+    mask is composited.
+    """
+
+    def __init__(self, size, color, region=None, antialias=False):
+        super().__init__(Image.new('L', size, 0), region, antialias)
+        self.color = color
+
+    def _ink(self, color):
+        return color[3] if len(color) > 3 else 255
+
+
+class LayerStack:
+    """Transparent layers over a base image, composited in order where they were drawn on"""
+
+    def __init__(self, base, region=None, antialias=False):
+        self.base = base
+        self.region = region
+        self.antialias = antialias
+        self.layers = []
+
+    def add_layer(self):
+        """Add a transparent layer above the existing ones and return a RegionDraw for it"""
+        layer = RegionDraw(Image.new('RGBA', self.base.size, (0, 0, 0, 0)), self.region, self.antialias)
+        layer.recording = vector.add_shapes()
+        self.layers.append(layer)
+        return layer
+
+    def add_mask_layer(self, color):
+        """Add a flat-colour layer stored as an L-mode coverage mask and return its MaskLayer"""
+        layer = MaskLayer(self.base.size, color, self.region, self.antialias)
+        layer.recording = vector.add_shapes(color)
+        self.layers.append(layer)
+        return layer
+
+    def composite(self):
+        """Composite every layer onto the base in order, limited to each layer's drawn box"""
+        backend.composite_boxes(self.base, [
+            (layer.image, layer.bbox) + ((layer.color,) if isinstance(layer, MaskLayer) else ())
+            for layer in self.layers if layer.bbox is not None
+        ])
+        self.layers = []
+        return self.base
@@ -0,0 +1,211 @@
+"""
+One command line for the asset scripts
+`build` writes the shipped assets in this directory from the explicit
+file -> generator mapping in generators.TARGETS. A subcommand per generator
+renders that design's targets under build/variants/<generator>/ instead, and
+the other scripts (update_icon, sweep, ...) are subcommands that forward their
+arguments. Every run produces all its targets in one process, rendering each
+distinct size once through render_cache. Modules are only imported by the subcommand that
+needs them, so --help and up-to-date --incremental builds skip Pillow and NumPy.
+Usage: python -m assets build [FILE ...] [--incremental] [--list]    (from mobile/)
+       python -m assets blue-microphone [--param NAME VALUE] [--output-dir DIR]
+       python -m assets update-icon SOURCE [--platform-set]
+       python . build                                                 (from mobile/assets)
+"""
+import argparse
+import importlib
+import os
+import sys
+from contextlib import nullcontext
+
+from generators import GENERATORS, TARGETS
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+VARIANTS_DIR = os.path.join(SCRIPT_DIR, 'build', 'variants')
+
+# Scripts run as subcommands: name -> (module with a main(), help)
+TOOLS = {
+    'update-icon': ('update_icon', 'Update the app icons from a source image'),
+    'splash': ('generate_splash', 'Generate portrait splash screens'),
+    'batch': ('batch_render', 'Render many generator and size jobs in parallel'),
+    'tiled': ('tiled_render', 'Render a very large image in tiles'),
+    'recolor': ('recolor', 'Write the colourways of a recolourable logo'),
+    'sweep': ('sweep', 'Render a contact sheet of design variants'),
+    'vector': ('vector', 'Export the logos as SVG'),
+    'animate': ('animate', 'Render a looping sound-wave animation'),
+    'watch': ('watch', 'Re-render a generator whenever the scripts change'),
+    'serve': ('icon_server', 'Serve rendered icons over HTTP'),
+    'load-test': ('icon_load', 'Measure the icon server under load'),
+    'optimize': ('png_optimize', 'Optimize existing PNGs'),
+    'benchmark': ('benchmark', 'Time every generator against a baseline'),
+}
+
+
+def build_assets(outputs, incremental=False, profile=False, trace=None, memory_budget=None, budgets=None):
+    """Render and write {path: (generator, size, params)} outputs in this process
+
+    Every target is rendered directly at its own size; resampling a larger
+    render adds colours that make the PNGs much bigger. With incremental, outputs whose code,
+    size, parameters and file are unchanged since the last build are skipped
+    without importing any generator. Returns False if a PNG is over its byte
+    budget (png_optimize.DEFAULT_BUDGETS unless budgets is given) or a block
+    over memory_budget MB.
+    """
+    from asset_manifest import AssetManifest, build_inputs
+
+    manifest = AssetManifest() if incremental else None
+    inputs = {
+        path: build_inputs(GENERATORS[name][0], size, dict(params, generator=name))
+        for path, (name, size, params) in outputs.items()
+    }
+    stale = {
+        path: output for path, output in outputs.items()
+        if manifest is None or not manifest.is_fresh(path, inputs[path])
+    }
+    for path in outputs:
+        if path not in stale:
+            print(f"✓ {os.path.relpath(path)} is up to date")
+    if not stale:
+        return True
+
+    from generators import load_generator
+    from memory_usage import print_memory_report, track_memory
+    from png_optimize import optimize_images, print_report
+    import profiling
+    from render_cache import render_targets
+
+    groups = {}
+    for path, (name, size, params) in stale.items():
+        groups.setdefault((name, repr(sorted(params.items()))), (name, params, {}))[2][path] = size
+
+    # Memory is accounted per generator call and per output
+    usages = []
+    with profiling.profile() if profile or trace else nullcontext() as profiler:
+        images = {}
+        for name, params, sizes in groups.values():
+            for path, size in sizes.items():
+                print(f"Creating {os.path.relpath(path)} ({size}x{size}px) from {name}...")
+            label = f"render {name} ({', '.join(os.path.relpath(path) for path in sizes)})"
+            with track_memory(label) if memory_budget else nullcontext() as usage:
+                images.update(render_targets(load_generator(name), sizes, **params))
+            if usage is not None:
+                usages.append(usage)
+
+        # Encode on a thread pool, keeping the smallest PNG for each output. Under a memory
+        # budget the outputs are encoded one at a time, since tracemalloc cannot tell them apart.
+        for path in images:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        targets = list(images.items())
+        results = []
+        with profiling.stage('encode'):
+            for batch in ([target] for target in targets) if memory_budget else [targets]:
+                with track_memory(f'encode {os.path.relpath(batch[0][0])}') if memory_budget else nullcontext() as usage:
+                    results.extend(optimize_images(batch, budgets, quantize_max_size=64))
+                if usage is not None:
+                    usages.append(usage)
+    within_budget = print_report(results)
+    if memory_budget:
+        within_budget = print_memory_report(usages, memory_budget) and within_budget
+
+    if profiler is not None:
+        print()
+        print(profiler.format_table())
+        if trace:
+            profiler.write_chrome_trace(trace)
+            print(f"✓ Trace written to {trace}")
+
+    if manifest is not None:
+        for path in images:
+            manifest.record(path, inputs[path])
+        manifest.save()
+    return within_budget
+
+
+def _program():
+    """Return how this command was started, for usage messages"""
+    name = os.path.basename(sys.argv[0])
+    return 'python -m assets' if name == '__main__.py' else name
+
+
+def run_tool(command, argv):
+    """Run a script's main() as if it had been started with argv"""
+    module_name = TOOLS[command][0]
+    sys.argv = [f'{_program()} {command}'] + list(argv)
+    return importlib.import_module(module_name).main()
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        prog=_program(),
+        description='Build the VoiceCompanion app assets',
+    )
+    options = argparse.ArgumentParser(add_help=False)
+    options.add_argument('--incremental', action='store_true',
+                         help='Skip outputs whose inputs and file are unchanged since the last build')
+    options.add_argument('--profile', action='store_true',
+                         help='Print a per-stage timing breakdown of the render and encode')
+    options.add_argument('--trace', metavar='FILE',
+                         help='Write per-stage timings as a Chrome trace (implies --profile)')
+    options.add_argument('--memory-budget', type=float, metavar='MB',
+                         help='Fail if rendering or encoding holds more than MB at once')
+
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    build = commands.add_parser('build', parents=[options], help='Write the shipped assets from generators.TARGETS')
+    build.add_argument('files', nargs='*', metavar='FILE', help=f"Targets to write (default: all of {', '.join(TARGETS)})")
+    build.add_argument('--list', action='store_true', help='Print the file -> generator mapping and exit')
+    for name in GENERATORS:
+        variant = commands.add_parser(name, parents=[options],
+                                      help=f'Render the {name} design to build/variants/{name}/')
+        variant.add_argument('--param', nargs=2, action='append', default=[], metavar=('NAME', 'VALUE'),
+                             help='Design knob for the generator (see sweep.py --list)')
+        variant.add_argument('--output-dir', default=None,
+                             help=f'Directory for the PNGs (default: build/variants/{name})')
+    for command, (_, description) in TOOLS.items():
+        # Listed for --help only: main() forwards these before parsing
+        commands.add_parser(command, help=description, add_help=False)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in TOOLS:
+        return run_tool(argv[0], argv[1:])
+
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return
+
+    if args.command == 'build':
+        if args.list:
+            for filename, (name, size) in TARGETS.items():
+                print(f"  {filename:<20} {name:<16} {size}px")
+            return
+        unknown = [filename for filename in args.files if filename not in TARGETS]
+        if unknown:
+            parser.error(f"Unknown target {', '.join(unknown)}, expected one of: {', '.join(TARGETS)}")
+        outputs = {
+            os.path.join(SCRIPT_DIR, filename): (name, size, {})
+            for filename, (name, size) in TARGETS.items() if not args.files or filename in args.files
+        }
+        budgets = None
+    else:
+        from sweep import design_parameters, parse_values
+
+        defaults = design_parameters(args.command)
+        params = {}
+        for knob, value in args.param:
+            if knob not in defaults:
+                parser.error(f"Unknown knob '{knob}' for {args.command}, expected one of: {', '.join(defaults)}")
+            params[knob] = parse_values([value])[0]
+        output_dir = args.output_dir or os.path.join(VARIANTS_DIR, args.command)
+        outputs = {
+            os.path.join(output_dir, filename): (args.command, size, params)
+            for filename, (_, size) in TARGETS.items()
+        }
+        # The byte budgets are for the shipped files only
+        budgets = {}
+
+    if not build_assets(outputs, args.incremental, args.profile, args.trace, args.memory_budget, budgets):
+        sys.exit(1)
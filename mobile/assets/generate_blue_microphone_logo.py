@@ -3,59 +3,142 @@
 Generate blue gradient circle logo with white microphone and sound waves
 Blue gradient: sky blue (top-left) to royal blue (bottom-right)
 White background with sound waves emanating from circle
+The geometry is drawn once as recolourable roles (background, circle,
+highlight, mic, waves), so the colourways in PALETTES come from recolor.py.
 """
-from PIL import Image, ImageDraw
-import os
+import sys
 import math
 
-def create_blue_microphone_logo(size=512):
-    """Create a blue gradient circle logo with white microphone and sound waves"""
-    # Create image with white background
-    img = Image.new('RGBA', (size, size), (255, 255, 255, 255))
-    draw = ImageDraw.Draw(img)
+from profiling import laps
+from recolor import RoleMaps, recolor
+from vector import AngularGradient, Circle, RadialGradient
+
+# Colourways by name: role -> colour, or (position, colour) stops for gradient roles
+PALETTES = {
+    'default': {
+        'background': (255, 255, 255),
+        # Sky blue (top-left) to royal blue (bottom-right)
+        'circle': [(0, (135, 206, 250)), (1, (65, 105, 225))],
+        # Subtle highlight on the top-left edge of the circle
+        'highlight': [(0, (0, 0, 0, 0)), (1, (30, 30, 30, 0))],
+        'mic': (255, 255, 255),
+        'waves': (65, 105, 225),
+    },
+    'dark': {
+        'background': (18, 20, 31),
+        'circle': [(0, (100, 149, 237)), (1, (39, 64, 139))],
+        'highlight': [(0, (0, 0, 0, 0)), (1, (40, 40, 40, 0))],
+        'mic': (255, 255, 255),
+        'waves': (100, 149, 237),
+    },
+    # Android 13 themed icon layer: the system tints the glyph and supplies the background
+    'monochrome': {
+        'mic': (255, 255, 255),
+        'waves': (255, 255, 255),
+    },
+    'winter': {
+        'background': (244, 248, 252),
+        'circle': [(0, (224, 242, 255)), (1, (70, 130, 180))],
+        'highlight': [(0, (0, 0, 0, 0)), (1, (40, 40, 40, 0))],
+        'mic': (255, 255, 255),
+        'waves': (176, 196, 222),
+    },
+}
+
+
+def blue_microphone_waves(size=512, circle_scale=0.2, num_waves=8, wave_spacing=0.4, wave_taper=0.12):
+    """Return the sound-wave arcs as (wave number, shape, xy, params) draw calls in drawing order
+
+    Wave 0 is the innermost; the left arcs come first, then their mirror images.
+    """
+    center_x = size // 2
+    center_y = size // 2
+    radius = int(size * circle_scale)
+    line_width = max(4, size // 80)
+    
+    # Draw sound waves (concentric curved lines) on left side
+    wave_color = (65, 105, 225, 255)  # Vibrant blue for sound waves
+    wave_spacing = int(radius * wave_spacing)  # Tighter spacing to fit more waves
+    calls = []
+    
+    for i in range(num_waves):
+        wave_radius = radius + (i + 1) * wave_spacing
+        wave_center_x = center_x
+        wave_center_y = center_y
+        
+        # Draw arc (semicircle on left side)
+        # Left side: from 90 degrees (top) to 270 degrees (bottom)
+        start_angle = 90
+        end_angle = 270
+        
+        # Calculate arc bounding box - extend further to show more waves
+        arc_x1 = max(0, wave_center_x - wave_radius)
+        arc_y1 = wave_center_y - wave_radius
+        arc_x2 = wave_center_x
+        arc_y2 = wave_center_y + wave_radius
+        
+        # Line width decreases as waves extend outward, but keep minimum visible
+        wave_line_width = max(2, int(line_width * (1 - i * wave_taper)))
+        
+        calls.append((i, 'arc', [arc_x1, arc_y1, arc_x2, arc_y2],
+                      {'start': start_angle, 'end': end_angle, 'fill': wave_color, 'width': wave_line_width}))
+    
+    # Draw sound waves on right side (mirror)
+    for i in range(num_waves):
+        wave_radius = radius + (i + 1) * wave_spacing
+        wave_center_x = center_x
+        wave_center_y = center_y
+        
+        # Right side: from 270 degrees (bottom) to 90 degrees (top)
+        start_angle = 270
+        end_angle = 90
+        
+        # Calculate arc bounding box - extend further to show more waves
+        arc_x1 = wave_center_x
+        arc_y1 = wave_center_y - wave_radius
+        arc_x2 = min(size, wave_center_x + wave_radius)
+        arc_y2 = wave_center_y + wave_radius
+        
+        # Line width decreases as waves extend outward, but keep minimum visible
+        wave_line_width = max(2, int(line_width * (1 - i * wave_taper)))
+        
+        calls.append((i, 'arc', [arc_x1, arc_y1, arc_x2, arc_y2],
+                      {'start': start_angle, 'end': end_angle, 'fill': wave_color, 'width': wave_line_width}))
+    return calls
+
+
+def draw_blue_microphone_roles(size=512, region=None, circle_scale=0.2, num_waves=8, wave_spacing=0.4,
+                               wave_taper=0.12):
+    """Draw the logo geometry once as recolourable roles
+
+    Pass region=(left, top, right, bottom) to draw only that tile of the canvas.
+    The design knobs default to the shipped logo: the circle radius as a
+    fraction of size, num_waves arcs on either side spaced wave_spacing of the
+    radius apart, each wave_taper of the line width thinner than the last.
+    """
+    timer = laps()
+    
+    roles = RoleMaps(size, region)
+    roles.add_fill('background')
     
     center_x = size // 2
     center_y = size // 2
-    radius = size // 5  # Even smaller circle radius to show more waves
-    
-    # Create blue gradient circle
-    # Sky blue (top-left) to royal blue (bottom-right)
-    sky_blue = (135, 206, 250)  # Light sky blue
-    royal_blue = (65, 105, 225)  # Royal blue
-    
-    for y in range(size):
-        for x in range(size):
-            # Calculate distance from center
-            dist_from_center = ((x - center_x) ** 2 + (y - center_y) ** 2) ** 0.5
-            
-            if dist_from_center <= radius:
-                # Calculate gradient based on position
-                # Top-left is lighter (sky blue), bottom-right is darker (royal blue)
-                # Use angle and distance to create diagonal gradient
-                angle = math.atan2(y - center_y, x - center_x)
-                # Normalize angle to 0-1 range for gradient
-                # Top-left quadrant should be lighter
-                gradient_factor = (math.cos(angle - math.pi / 4) + 1) / 2
-                
-                # Interpolate between sky blue and royal blue
-                r = int(sky_blue[0] + (royal_blue[0] - sky_blue[0]) * gradient_factor)
-                g = int(sky_blue[1] + (royal_blue[1] - sky_blue[1]) * gradient_factor)
-                b = int(sky_blue[2] + (royal_blue[2] - sky_blue[2]) * gradient_factor)
-                
-                # Add subtle highlight on top-left edge
-                if dist_from_center > radius * 0.85:
-                    # Near the edge, add highlight
-                    highlight_factor = (dist_from_center - radius * 0.85) / (radius * 0.15)
-                    if angle > -math.pi / 2 and angle < 0:  # Top-left quadrant
-                        r = min(255, int(r + 30 * highlight_factor))
-                        g = min(255, int(g + 30 * highlight_factor))
-                        b = min(255, int(b + 30 * highlight_factor))
-                
-                img.putpixel((x, y), (r, g, b, 255))
+    radius = int(size * circle_scale)  # Even smaller circle radius to show more waves
+    
+    # Gradient circle: the first stop faces away from the top-left, the last towards it
+    circle = Circle((center_x, center_y), radius)
+    roles.add_ramp('circle', AngularGradient((center_x, center_y), phase=math.pi / 4), clip=circle, linear=True)
+    
+    # Highlight ring on the top-left edge, added within the circle
+    ring = RadialGradient((center_x, center_y), radius * 0.85, radius, angle_range=(-math.pi / 2, 0))
+    roles.add_ramp('highlight', ring, clip=circle, blend='add')
+    
+    timer.lap('gradient')
     
     # Draw white microphone outline inside circle
     white = (255, 255, 255, 255)
     line_width = max(4, size // 80)
+    draw = roles.add_mask_layer('mic')
     
     # Microphone dimensions (centered in circle)
     mic_width = radius // 1.2
@@ -98,82 +181,31 @@ def create_blue_microphone_logo(size=512):
     base_x = center_x - base_width // 2
     draw.line([base_x, base_y, base_x + base_width, base_y], fill=white, width=line_width)
     
-    # Draw sound waves (concentric curved lines) on left side
-    wave_color = royal_blue  # Vibrant blue for sound waves
-    num_waves = 8  # Increased to 8 waves for more visibility
-    wave_spacing = radius // 2.5  # Tighter spacing to fit more waves
-    wave_start_x = center_x - radius
+    timer.lap('mic')
     
-    for i in range(num_waves):
-        wave_radius = radius + (i + 1) * wave_spacing
-        wave_center_x = center_x
-        wave_center_y = center_y
-        
-        # Draw arc (semicircle on left side)
-        # Left side: from 90 degrees (top) to 270 degrees (bottom)
-        start_angle = 90
-        end_angle = 270
-        
-        # Calculate arc bounding box - extend further to show more waves
-        arc_x1 = max(0, wave_center_x - wave_radius)
-        arc_y1 = wave_center_y - wave_radius
-        arc_x2 = wave_center_x
-        arc_y2 = wave_center_y + wave_radius
-        
-        # Line width decreases as waves extend outward, but keep minimum visible
-        wave_line_width = max(2, int(line_width * (1 - i * 0.12)))
-        
-        draw.arc([arc_x1, arc_y1, arc_x2, arc_y2], start_angle, end_angle,
-                 fill=wave_color, width=wave_line_width)
+    # Sound waves: concentric arcs on either side of the circle
+    draw = roles.add_mask_layer('waves')
+    for _, shape, xy, params in blue_microphone_waves(size, circle_scale, num_waves, wave_spacing, wave_taper):
+        getattr(draw, shape)(xy, **params)
+    timer.lap('waves')
     
-    # Draw sound waves on right side (mirror)
-    for i in range(num_waves):
-        wave_radius = radius + (i + 1) * wave_spacing
-        wave_center_x = center_x
-        wave_center_y = center_y
-        
-        # Right side: from 270 degrees (bottom) to 90 degrees (top)
-        start_angle = 270
-        end_angle = 90
-        
-        # Calculate arc bounding box - extend further to show more waves
-        arc_x1 = wave_center_x
-        arc_y1 = wave_center_y - wave_radius
-        arc_x2 = min(size, wave_center_x + wave_radius)
-        arc_y2 = wave_center_y + wave_radius
-        
-        # Line width decreases as waves extend outward, but keep minimum visible
-        wave_line_width = max(2, int(line_width * (1 - i * 0.12)))
-        
-        draw.arc([arc_x1, arc_y1, arc_x2, arc_y2], start_angle, end_angle,
-                 fill=wave_color, width=wave_line_width)
+    return roles
+
+def create_blue_microphone_logo(size=512, region=None, palette='default', **params):
+    """Create a blue gradient circle logo with white microphone and sound waves
+    
+    Pass region=(left, top, right, bottom) to render only that tile of the canvas,
+    palette as a PALETTES name or a role -> colour dict for another colourway,
+    and any draw_blue_microphone_roles design knobs as keywords.
+    """
+    roles = draw_blue_microphone_roles(size, region, **params)
+    timer = laps()
+    img = recolor(roles, PALETTES[palette] if isinstance(palette, str) else palette)
+    timer.lap('composite')
     
     return img
 
 if __name__ == '__main__':
-    # Generate icon.png (512x512 for app icon)
-    icon = create_blue_microphone_logo(512)
-    icon_path = os.path.join(os.path.dirname(__file__), 'icon.png')
-    icon.save(icon_path, 'PNG')
-    print(f'✅ Created {icon_path}')
-    
-    # Generate favicon.png (64x64 for web)
-    favicon = create_blue_microphone_logo(64)
-    favicon_path = os.path.join(os.path.dirname(__file__), 'favicon.png')
-    favicon.save(favicon_path, 'PNG')
-    print(f'✅ Created {favicon_path}')
-    
-    # Generate adaptive-icon.png (1024x1024 for Android)
-    adaptive = create_blue_microphone_logo(1024)
-    adaptive_path = os.path.join(os.path.dirname(__file__), 'adaptive-icon.png')
-    adaptive.save(adaptive_path, 'PNG')
-    print(f'✅ Created {adaptive_path}')
-    
-    # Generate splash.png (1024x1024)
-    splash = create_blue_microphone_logo(1024)
-    splash_path = os.path.join(os.path.dirname(__file__), 'splash.png')
-    splash.save(splash_path, 'PNG')
-    print(f'✅ Created {splash_path}')
-    
-    print('\n🎨 Blue gradient microphone logo with sound waves generated successfully!')
-
+    # Renders this design to build/variants/blue-microphone/; `python -m assets build` writes the shipped icons
+    import cli
+    cli.main(['blue-microphone'] + sys.argv[1:])
@@ -5,41 +5,84 @@ Based on app features: Voice-to-Art, Image-to-Voice, Real-Time Guidance,
 Voice Guided Shopping, and Language Learning
 """
 
-from PIL import Image, ImageDraw, ImageFont
 import math
-import os
+import sys
 
-def generate_app_icon(size=1024):
-    """Generate a creative app icon representing VoiceCompanion's features"""
-    
-    # Create a new image with transparent background
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+from canvas import LayerStack, gradient_layer
+from profiling import laps
+from vector import LinearGradient
+
+# Paint dabs on the art palette: orange, green, blue
+PAINT_COLORS = ((255, 87, 34), (76, 175, 80), (33, 150, 243))
+
+# Background gradient (primary, secondary) per app mode; default is the brand purple/blue
+MODE_COLORS = {
+    'default': ((102, 126, 234), (118, 75, 162)),  # #667eea -> #764ba2
+    'voice-to-art': ((255, 152, 0), (233, 30, 99)),  # #ff9800 -> #e91e63
+    'image-to-voice': ((0, 188, 212), (63, 81, 181)),  # #00bcd4 -> #3f51b5
+    'guidance': ((33, 150, 243), (13, 71, 161)),  # #2196f3 -> #0d47a1
+    'shopping': ((76, 175, 80), (0, 121, 107)),  # #4caf50 -> #00796b
+    'language': ((156, 39, 176), (63, 81, 181)),  # #9c27b0 -> #3f51b5
+}
+
+def app_icon_waves(size=1024, wave_count=3):
+    """Return the dotted sound-wave rings as (wave number, shape, xy, params) draw calls
+
+    Wave 0 is the innermost ring around the microphone.
+    """
+    mic_size = size * 0.15
+    mic_x = size / 2
+    mic_y = size / 2 - size * 0.15
     
-    # Color scheme - modern gradient purple/blue (app brand colors)
-    primary_color = (102, 126, 234)  # #667eea
-    secondary_color = (118, 75, 162)  # #764ba2
+    wave_radius_start = mic_size * 0.6
+    calls = []
+    for i in range(wave_count):
+        wave_radius = wave_radius_start + i * (size * 0.08)
+        wave_alpha = max(20, 180 - i * 40)
+        
+        # Draw partial arcs around microphone
+        dots = []
+        for angle in range(-60, 240, 10):
+            rad = math.radians(angle)
+            x = mic_x + wave_radius * math.cos(rad)
+            y = mic_y + wave_radius * 0.6 * math.sin(rad)
+            if angle % 20 == 0:
+                dots.append((x, y))
+        calls.append((i, 'stamp', dots, {'radius': size * 0.01, 'fill': (255, 255, 255, wave_alpha)}))
+    return calls
+
+def generate_app_icon(size=1024, region=None, wave_count=3, corner_radius=0.18, padding=0.08,
+                      paint_colors=PAINT_COLORS, mode='default'):
+    """Generate a creative app icon representing VoiceCompanion's features
+    
+    Pass region=(left, top, right, bottom) to render only that tile of the canvas.
+    The design knobs default to the shipped icon: wave_count sound-wave rings,
+    corner_radius and padding of the overlay as fractions of size, and the
+    paint_colors dabbed on the art palette. mode picks the background
+    gradient from MODE_COLORS.
+    """
+    
+    # Color scheme - the mode's background gradient (brand purple/blue by default)
+    if mode not in MODE_COLORS:
+        raise ValueError(f"Unknown mode '{mode}', expected one of: {', '.join(MODE_COLORS)}")
+    primary_color, secondary_color = MODE_COLORS[mode]
     accent_color = (255, 255, 255)  # White
     accent_yellow = (255, 193, 7)  # For art/creativity
     accent_cyan = (0, 188, 212)  # For image/vision
     
     # Draw rounded square background with gradient
-    corner_radius = size * 0.18
-    padding = size * 0.08
+    corner_radius = size * corner_radius
+    padding = size * padding
+    
+    timer = laps()
     
     # Create gradient background (diagonal gradient)
-    for y in range(size):
-        for x in range(size):
-            # Diagonal gradient
-            ratio = (x + y) / (size * 2)
-            r = int(primary_color[0] * (1 - ratio) + secondary_color[0] * ratio)
-            g = int(primary_color[1] * (1 - ratio) + secondary_color[1] * ratio)
-            b = int(primary_color[2] * (1 - ratio) + secondary_color[2] * ratio)
-            img.putpixel((x, y), (r, g, b, 255))
+    img = gradient_layer(size, LinearGradient(), primary_color, secondary_color, region=region, linear=True)
+    layers = LayerStack(img, region, antialias=True)
+    timer.lap('gradient')
     
     # Draw rounded rectangle overlay for depth
-    overlay = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    overlay_draw = ImageDraw.Draw(overlay)
+    overlay_draw = layers.add_mask_layer(accent_color)
     
     # Main rounded rectangle with subtle inner glow
     rect_size = size - padding * 2
@@ -55,8 +98,10 @@ def generate_app_icon(size=1024):
         width=int(size * 0.01)
     )
     
-    # Composite overlay
-    img = Image.alpha_composite(img, overlay)
+    timer.lap('overlay')
+    
+    # Feature shapes go on their own layer so translucent fills blend with the background
+    draw = layers.add_layer()
     
     center_x = size / 2
     center_y = size / 2
@@ -105,27 +150,17 @@ def generate_app_icon(size=1024):
                 (mic_x - mic_body_width * 0.35, line_y),
                 (mic_x + mic_body_width * 0.35, line_y)
             ],
-            fill=(102, 126, 234, 200),
+            fill=primary_color + (200,),
             width=int(size * 0.008)
         )
     
+    timer.lap('mic')
+    
     # 2. Sound Waves (Voice Output) - Around microphone
-    wave_radius_start = mic_size * 0.6
-    wave_count = 3
-    for i in range(wave_count):
-        wave_radius = wave_radius_start + i * (size * 0.08)
-        wave_alpha = 180 - i * 40
-        
-        # Draw partial arcs around microphone
-        for angle in range(-60, 240, 10):
-            rad = math.radians(angle)
-            x = mic_x + wave_radius * math.cos(rad)
-            y = mic_y + wave_radius * 0.6 * math.sin(rad)
-            if angle % 20 == 0:
-                draw.ellipse(
-                    [(x - size * 0.01, y - size * 0.01), (x + size * 0.01, y + size * 0.01)],
-                    fill=(255, 255, 255, wave_alpha)
-                )
+    for _, shape, xy, params in app_icon_waves(size, wave_count):
+        getattr(draw, shape)(xy, **params)
+    
+    timer.lap('waves')
     
     # 3. Eye/Accessibility Symbol (Visual Assistance) - Left side
     eye_size = size * 0.2
@@ -203,15 +238,10 @@ def generate_app_icon(size=1024):
             palette_x - palette_width * 0.3 + hole_radius,
             palette_y + hole_radius
         ],
-        fill=(102, 126, 234, 255)  # Match background
+        fill=primary_color + (255,)  # Match background
     )
     
     # Paint dabs on palette
-    paint_colors = [
-        (255, 87, 34),  # Orange
-        (76, 175, 80),   # Green
-        (33, 150, 243),  # Blue
-    ]
     for i, color in enumerate(paint_colors):
         paint_x = palette_x + palette_width * 0.15 + i * (palette_width * 0.15)
         paint_y = palette_y - palette_height * 0.15
@@ -223,7 +253,7 @@ def generate_app_icon(size=1024):
                 paint_x + paint_radius,
                 paint_y + paint_radius
             ],
-            fill=color
+            fill=tuple(color)
         )
     
     # 5. Camera/Image Icon (Image to Voice) - Bottom center
@@ -297,63 +327,30 @@ def generate_app_icon(size=1024):
         width=line_width
     )
     
+    timer.lap('features')
+    
     # Add subtle glow effect around main elements
-    glow = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    glow_draw = ImageDraw.Draw(glow)
+    glow_draw = layers.add_mask_layer(accent_color)
     
     # Glow around microphone
     for i in range(2):
         glow_radius = mic_size * 0.7 + i * size * 0.02
         glow_alpha = 30 - i * 10
+        dots = []
         for angle in range(0, 360, 15):
             rad = math.radians(angle)
-            x = mic_x + glow_radius * math.cos(rad)
-            y = mic_y + glow_radius * 0.6 * math.sin(rad)
-            glow_draw.ellipse(
-                [(x - size * 0.015, y - size * 0.015), (x + size * 0.015, y + size * 0.015)],
-                fill=(255, 255, 255, glow_alpha)
-            )
+            dots.append((mic_x + glow_radius * math.cos(rad), mic_y + glow_radius * 0.6 * math.sin(rad)))
+        glow_draw.stamp(dots, size * 0.015, fill=(255, 255, 255, glow_alpha))
     
-    img = Image.alpha_composite(img, glow)
+    timer.lap('glow')
+    
+    # Composite overlay, features and glow in one ordered pass
+    img = layers.composite()
+    timer.lap('composite')
     
     return img
 
-def main():
-    """Generate icons in all required sizes"""
-    sizes = {
-        'icon.png': 1024,
-        'adaptive-icon.png': 1024,
-        'favicon.png': 48,
-    }
-    
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    print("Generating VoiceCompanion app icons based on features...")
-    print("Features represented:")
-    print("  🎤 Microphone - Voice input/output")
-    print("  👁️ Eye - Visual assistance & accessibility")
-    print("  🎨 Palette - Voice to Art generation")
-    print("  📸 Camera - Image to Voice description")
-    print("  🔊 Sound waves - Voice output & guidance")
-    print()
-    
-    for filename, size in sizes.items():
-        print(f"Creating {filename} ({size}x{size}px)...")
-        icon = generate_app_icon(size)
-        filepath = os.path.join(script_dir, filename)
-        icon.save(filepath, 'PNG', optimize=True)
-        print(f"✓ Saved {filename}")
-    
-    print()
-    print("✓ All icons generated successfully!")
-    print("\nIcons created:")
-    print("  - icon.png (1024x1024px) - Main app icon")
-    print("  - adaptive-icon.png (1024x1024px) - Android adaptive icon")
-    print("  - favicon.png (48x48px) - Web favicon")
-    print("\nNext steps:")
-    print("1. Restart your Expo development server")
-    print("2. Clear cache if needed: expo start -c")
-    print("3. For web app, copy icons to frontend/public/")
-
 if __name__ == '__main__':
-    main()
+    # Renders this design to build/variants/app-icon/; `python -m assets build` writes the shipped icons
+    import cli
+    cli.main(['app-icon'] + sys.argv[1:])
@@ -2,51 +2,79 @@
 """
 Generate circular microphone logo with gradient background
 White microphone outline on magenta-purple-blue gradient
+The geometry is drawn once as recolourable roles (background, circle, mic,
+waves), so the colourways in PALETTES come from recolor.py.
 """
-from PIL import Image, ImageDraw
-import os
+import sys
 
-def create_microphone_logo(size=512):
-    """Create a circular microphone logo with gradient background"""
-    # Create image with black background
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 255))
-    draw = ImageDraw.Draw(img)
+from profiling import laps
+from recolor import RoleMaps, recolor
+from vector import Circle, LinearGradient
+
+# Colourways by name: role -> colour, or (position, colour) stops for gradient roles
+PALETTES = {
+    'default': {
+        'background': (0, 0, 0),
+        # Magenta (top) -> Purple (middle) -> Cyan/Blue (bottom), top to bottom in thirds
+        'circle': [
+            (0, (255, 0, 255)), (1 / 3, (178.5, 0, 204)),
+            (1 / 3, (128, 0, 128)), (2 / 3, (64, 0, 255)),
+            (1, (0, 255, 255)),
+        ],
+        'mic': (255, 255, 255),
+        'waves': (255, 255, 255),
+    },
+    'light': {
+        'background': (255, 255, 255),
+        'circle': [(0, (255, 128, 255)), (0.5, (150, 110, 255)), (1, (120, 230, 255))],
+        'mic': (255, 255, 255),
+        'waves': (110, 60, 200),
+    },
+    'dark': {
+        'background': (12, 10, 20),
+        'circle': [(0, (120, 0, 130)), (0.5, (50, 0, 140)), (1, (0, 110, 140))],
+        'mic': (235, 235, 245),
+        'waves': (235, 235, 245),
+    },
+    # Android 13 themed icon layer: the system tints the glyph and supplies the background
+    'monochrome': {
+        'mic': (255, 255, 255),
+        'waves': (255, 255, 255),
+    },
+    'autumn': {
+        'background': (30, 16, 8),
+        'circle': [(0, (255, 170, 0)), (0.5, (214, 84, 20)), (1, (120, 30, 20))],
+        'mic': (255, 244, 224),
+        'waves': (255, 170, 0),
+    },
+}
+
+
+def draw_microphone_roles(size=512, grille_dots=5, wave_heights=(1 / 3, 2 / 3, 1 / 3), wave_spacing=0.04):
+    """Draw the logo geometry once as recolourable roles
+
+    The design knobs default to the shipped logo: a grille_dots x grille_dots
+    grid of perforations and, on either side, one sound-wave bar per
+    wave_heights entry (a fraction of the grille height) spaced wave_spacing
+    of size apart.
+    """
+    timer = laps()
+    
+    roles = RoleMaps(size)
+    roles.add_fill('background')
     
     center_x = size // 2
     center_y = size // 2
     radius = size // 2 - 10  # Leave some padding
     
-    # Create gradient circle background
-    # Magenta (top) -> Purple (middle) -> Cyan/Blue (bottom)
-    for y in range(size):
-        # Calculate gradient color based on y position
-        if y < size // 3:
-            # Top third: Magenta to Purple
-            ratio = y / (size // 3)
-            r = int(255 * (1 - ratio * 0.3))
-            g = int(0 * (1 - ratio * 0.5))
-            b = int(255 * (1 - ratio * 0.2))
-        elif y < 2 * size // 3:
-            # Middle third: Purple
-            ratio = (y - size // 3) / (size // 3)
-            r = int(128 + (64 - 128) * ratio)
-            g = int(0 + (0) * ratio)
-            b = int(128 + (255 - 128) * ratio)
-        else:
-            # Bottom third: Purple to Cyan
-            ratio = (y - 2 * size // 3) / (size // 3)
-            r = int(64 * (1 - ratio))
-            g = int(0 + (255) * ratio)
-            b = int(255)
-        
-        # Draw horizontal line within circle
-        for x in range(size):
-            dist_from_center = ((x - center_x) ** 2 + (y - center_y) ** 2) ** 0.5
-            if dist_from_center <= radius:
-                img.putpixel((x, y), (r, g, b, 255))
+    # Gradient circle, indexed by the distance down the canvas
+    roles.add_ramp('circle', LinearGradient(direction=(0, 1)), clip=Circle((center_x, center_y), radius))
+    
+    timer.lap('gradient')
     
     # Draw white microphone outline
     white = (255, 255, 255, 255)
+    draw = roles.add_mask_layer('mic')
     
     # Microphone dimensions
     mic_width = size // 3
@@ -70,10 +98,11 @@ def create_microphone_logo(size=512):
     
     # Draw dots inside grille (perforations)
     dot_size = max(2, size // 80)
-    dot_spacing = grille_width // 6
-    num_dots_x = 5
-    num_dots_y = 5
+    dot_spacing = grille_width // (grille_dots + 1)
+    num_dots_x = grille_dots
+    num_dots_y = grille_dots
     
+    dots = []
     for i in range(num_dots_x):
         for j in range(num_dots_y):
             dot_x = grille_x + dot_spacing + i * dot_spacing
@@ -81,10 +110,8 @@ def create_microphone_logo(size=512):
             # Only draw dots that are inside the rounded rectangle
             if (grille_x + grille_width // 8 < dot_x < grille_x + grille_width - grille_width // 8 and
                 grille_y + grille_height // 8 < dot_y < grille_y + grille_height - grille_height // 8):
-                draw.ellipse(
-                    [dot_x - dot_size, dot_y - dot_size, dot_x + dot_size, dot_y + dot_size],
-                    fill=white
-                )
+                dots.append((dot_x, dot_y))
+    draw.stamp(dots, dot_size, white)
     
     # U-shaped mount/body
     mount_width = grille_width // 1.5
@@ -117,11 +144,14 @@ def create_microphone_logo(size=512):
     draw.ellipse([base_x, base_y, base_x + base_width, base_y + base_height], 
                  outline=white, width=line_width)
     
+    timer.lap('mic')
+    
     # Sound waves on left side (3 vertical lines: short, medium, short)
+    draw = roles.add_mask_layer('waves')
     wave_x_start = grille_x - size // 8
-    wave_spacing = size // 25
+    wave_spacing = int(size * wave_spacing)
     wave_width = max(2, size // 150)
-    wave_heights = [grille_height // 3, grille_height // 1.5, grille_height // 3]
+    wave_heights = [int(grille_height * height) for height in wave_heights]
     
     for i, height in enumerate(wave_heights):
         wave_x = wave_x_start - i * (wave_spacing + wave_width)
@@ -134,33 +164,24 @@ def create_microphone_logo(size=512):
         wave_x = wave_x_start_right + i * (wave_spacing + wave_width)
         wave_y = center_y - height // 2
         draw.rectangle([wave_x, wave_y, wave_x + wave_width, wave_y + height], fill=white)
+    timer.lap('waves')
+    
+    return roles
+
+def create_microphone_logo(size=512, palette='default', **params):
+    """Create a circular microphone logo with gradient background
+    
+    Pass palette as a PALETTES name or a role -> colour dict for another colourway,
+    and any draw_microphone_roles design knobs as keywords.
+    """
+    roles = draw_microphone_roles(size, **params)
+    timer = laps()
+    img = recolor(roles, PALETTES[palette] if isinstance(palette, str) else palette)
+    timer.lap('composite')
     
     return img
 
 if __name__ == '__main__':
-    # Generate icon.png (512x512 for app icon)
-    icon = create_microphone_logo(512)
-    icon_path = os.path.join(os.path.dirname(__file__), 'icon.png')
-    icon.save(icon_path, 'PNG')
-    print(f'✅ Created {icon_path}')
-    
-    # Generate favicon.png (64x64 for web)
-    favicon = create_microphone_logo(64)
-    favicon_path = os.path.join(os.path.dirname(__file__), 'favicon.png')
-    favicon.save(favicon_path, 'PNG')
-    print(f'✅ Created {favicon_path}')
-    
-    # Generate adaptive-icon.png (1024x1024 for Android)
-    adaptive = create_microphone_logo(1024)
-    adaptive_path = os.path.join(os.path.dirname(__file__), 'adaptive-icon.png')
-    adaptive.save(adaptive_path, 'PNG')
-    print(f'✅ Created {adaptive_path}')
-    
-    # Generate splash.png (1024x1024)
-    splash = create_microphone_logo(1024)
-    splash_path = os.path.join(os.path.dirname(__file__), 'splash.png')
-    splash.save(splash_path, 'PNG')
-    print(f'✅ Created {splash_path}')
-    
-    print('\n🎨 Microphone logo with gradient background generated successfully!')
-
+    # Renders this design to build/variants/microphone/; `python -m assets build` writes the shipped icons
+    import cli
+    cli.main(['microphone'] + sys.argv[1:])
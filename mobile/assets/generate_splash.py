@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Generate portrait splash screens for phones and tablets
+The logo is rendered once and centered on a full-bleed vertical background
+gradient. Logos whose waves reach past their square are rendered in splash
+coordinates, so the waves continue onto the splash instead of stopping at it. Each splash is produced and PNG-encoded one band of rows at a time,
+so even iPad Pro sizes are written with low, predictable memory.
+Usage: python generate_splash.py [--logo blue-microphone] [--devices iphone ipad-pro | --all]
+"""
+import argparse
+import os
+import time
+
+from generators import ROLE_GENERATORS, load_generator, load_role_generator
+from backend import linear_gradient
+from memory_usage import peak_rss_mb
+from png_stream import PngStreamWriter
+from recolor import recolor
+from render_cache import render
+
+# Portrait device resolutions (width, height); 'default' is the splash.png Expo uses
+DEVICE_SIZES = {
+    'default': (1242, 2436),
+    'iphone-se': (750, 1334),
+    'iphone': (1170, 2532),
+    'iphone-max': (1290, 2796),
+    'android': (1080, 1920),
+    'android-xxxhdpi': (1440, 2560),
+    'ipad': (1536, 2048),
+    'ipad-air': (1640, 2360),
+    'ipad-pro': (2048, 2732),
+}
+
+# Background gradient (top, bottom) per logo, and the generator parameters that
+# leave out the logo's own background (the role-map logos drop their palette's
+# background role instead). bleed is how far, as a fraction of the logo size,
+# the drawing reaches past the logo square on every side; only generators that
+# take a region can render past it.
+SPLASH_STYLES = {
+    'app-icon': {'background': ((255, 255, 255), (236, 239, 252)), 'params': {}},
+    'microphone': {'background': ((40, 0, 64), (0, 0, 0)), 'params': {}},
+    'blue-microphone': {'background': ((255, 255, 255), (225, 238, 255)), 'params': {}, 'bleed': 0.5},
+    'ai-microphone': {'background': ((24, 24, 24), (0, 0, 0)), 'params': {'background': None}},
+}
+
+BAND_HEIGHT = 128
+
+
+def _parse_color(value):
+    """Parse a #rrggbb colour"""
+    value = value.lstrip('#')
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def prepare_logo(logo, logo_size, params=None, region=None):
+    """Render the logo once on transparency, so it sits on the splash gradient
+
+    region=(left, top, right, bottom) in logo coordinates may reach past the
+    logo square to keep what the logo draws outside it.
+    """
+    params = dict(params or {})
+    if region is not None:
+        params['region'] = region
+    if logo in ROLE_GENERATORS:
+        draw_roles, palettes = load_role_generator(logo)
+        palette = {role: paint for role, paint in palettes['default'].items() if role != 'background'}
+        return recolor(draw_roles(logo_size, **params), palette)
+    return render(load_generator(logo), logo_size, **params).convert('RGBA')
+
+
+def logo_region(size, logo_size, bleed):
+    """Return the region to render the logo in: its square grown by bleed, within the splash"""
+    width, height = size
+    margin = int(logo_size * bleed)
+    margin_x = min(margin, (width - logo_size) // 2)
+    margin_y = min(margin, (height - logo_size) // 2)
+    return (-margin_x, -margin_y, logo_size + margin_x, logo_size + margin_y)
+
+
+def write_splash(path, size, logo_image, background, position=None):
+    """Stream one splash screen to path, compositing the logo into each band
+
+    position is the logo image's top-left corner on the splash (default: centered).
+    """
+    width, height = size
+    logo_left, logo_top = position or ((width - logo_image.width) // 2, (height - logo_image.height) // 2)
+
+    with PngStreamWriter(path, size, mode='RGB') as png:
+        for top in range(0, height, BAND_HEIGHT):
+            bottom = min(top + BAND_HEIGHT, height)
+            band = linear_gradient(size, background[0], background[1], direction=(0, 1),
+                                   region=(0, top, width, bottom))
+            overlap_top = max(top, logo_top)
+            overlap_bottom = min(bottom, logo_top + logo_image.height)
+            if overlap_top < overlap_bottom:
+                piece = logo_image.crop((0, overlap_top - logo_top, logo_image.width, overlap_bottom - logo_top))
+                band.alpha_composite(piece, (logo_left, overlap_top - top))
+            png.write_rows(band)
+
+
+def generate_splashes(devices, output_dir, logo='blue-microphone', logo_scale=0.5, background=None):
+    """Write a splash for every device name into output_dir and return the paths"""
+    style = SPLASH_STYLES[logo]
+    background = background or style['background']
+    logos = {}
+    paths = []
+    for device in devices:
+        width, height = DEVICE_SIZES[device]
+        logo_size = int(min(width, height) * logo_scale)
+        region = logo_region((width, height), logo_size, style.get('bleed', 0))
+        if (logo_size, region) not in logos:
+            logos[logo_size, region] = prepare_logo(logo, logo_size, style['params'],
+                                                    region if region != (0, 0, logo_size, logo_size) else None)
+        position = ((width - logo_size) // 2 + region[0], (height - logo_size) // 2 + region[1])
+        filename = 'splash.png' if device == 'default' else f'splash-{device}.png'
+        path = os.path.join(output_dir, filename)
+        write_splash(path, (width, height), logos[logo_size, region], background, position)
+        paths.append(path)
+    return paths
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='Generate portrait splash screens')
+    parser.add_argument('--logo', choices=list(SPLASH_STYLES), default='blue-microphone',
+                        help='Logo generator to center on the splash')
+    parser.add_argument('--devices', nargs='+', choices=list(DEVICE_SIZES), default=['default'],
+                        help='Device sizes to generate (default: the 1242x2436 splash.png)')
+    parser.add_argument('--all', action='store_true', help='Generate every device size')
+    parser.add_argument('--output-dir', default=script_dir, help='Directory for the splash PNGs')
+    parser.add_argument('--logo-scale', type=float, default=0.5,
+                        help='Logo size as a fraction of the screen width (default: 0.5)')
+    parser.add_argument('--background', nargs=2, metavar=('TOP', 'BOTTOM'),
+                        help='Background gradient colours as #rrggbb')
+    args = parser.parse_args()
+
+    devices = list(DEVICE_SIZES) if args.all else args.devices
+    background = tuple(_parse_color(color) for color in args.background) if args.background else None
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    paths = generate_splashes(devices, args.output_dir, logo=args.logo,
+                              logo_scale=args.logo_scale, background=background)
+    for device, path in zip(devices, paths):
+        width, height = DEVICE_SIZES[device]
+        print(f"✓ Created {path} ({width}x{height}px)")
+
+    peak = peak_rss_mb()
+    memory = f" (peak RSS {peak:.0f}MB)" if peak is not None else ''
+    print(f"\n🎨 {len(paths)} splash screens in {time.perf_counter() - start:.2f}s{memory}")
+
+
+if __name__ == '__main__':
+    main()
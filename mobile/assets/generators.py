@@ -0,0 +1,79 @@
+"""
+Registry of the logo generator entry points
+Generators are referenced by (module, function) name so they can be sent to
+worker processes and are only imported when first used
+"""
+import importlib
+import os
+import sys
+
+GENERATORS = {
+    'app-icon': ('generate_icon', 'generate_app_icon'),
+    'microphone': ('generate_microphone_logo', 'create_microphone_logo'),
+    'blue-microphone': ('generate_blue_microphone_logo', 'create_blue_microphone_logo'),
+    'ai-microphone': ('generate_ai_logo', 'create_ai_microphone_logo'),
+}
+
+# The shipped icons in this directory: file -> (generator, size). Builds write every file from the
+# generator named here, so which design ships no longer depends on which script ran last.
+# splash.png is portrait and comes from generate_splash.py.
+TARGETS = {
+    'icon.png': ('blue-microphone', 512),
+    'adaptive-icon.png': ('blue-microphone', 1024),
+    'favicon.png': ('blue-microphone', 64),
+}
+
+# Generators that can draw their geometry as recolourable roles: (module, roles function, palettes)
+ROLE_GENERATORS = {
+    'microphone': ('generate_microphone_logo', 'draw_microphone_roles', 'PALETTES'),
+    'blue-microphone': ('generate_blue_microphone_logo', 'draw_blue_microphone_roles', 'PALETTES'),
+}
+
+# Generators whose sound waves can be animated: (module, waves function, wave count knob, waves role)
+# The waves function returns the draw calls of every wave; role names the palette entry that colours
+# them, or None when each call's fill colour is used.
+WAVE_GENERATORS = {
+    'app-icon': ('generate_icon', 'app_icon_waves', 'wave_count', None),
+    'blue-microphone': ('generate_blue_microphone_logo', 'blue_microphone_waves', 'num_waves', 'waves'),
+}
+
+
+def load_generator(name):
+    """Import and return the generator function registered under name"""
+    if name not in GENERATORS:
+        raise KeyError(f"Unknown generator '{name}', expected one of: {', '.join(GENERATORS)}")
+    module_name, function_name = GENERATORS[name]
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def load_role_generator(name):
+    """Import and return the (roles function, palettes) registered under name"""
+    if name not in ROLE_GENERATORS:
+        raise KeyError(f"Generator '{name}' has no recolourable roles, expected one of: {', '.join(ROLE_GENERATORS)}")
+    module_name, function_name, palettes_name = ROLE_GENERATORS[name]
+    module = importlib.import_module(module_name)
+    return getattr(module, function_name), getattr(module, palettes_name)
+
+
+def load_wave_generator(name):
+    """Import and return the (waves function, wave count knob, waves role) registered under name"""
+    if name not in WAVE_GENERATORS:
+        raise KeyError(f"Generator '{name}' has no animated waves, expected one of: {', '.join(WAVE_GENERATORS)}")
+    module_name, function_name, count_knob, role = WAVE_GENERATORS[name]
+    return getattr(importlib.import_module(module_name), function_name), count_knob, role
+
+
+def generator_name(generator):
+    """Return the registry name for a generator given as a name or a function"""
+    if isinstance(generator, str):
+        if generator not in GENERATORS:
+            raise KeyError(f"Unknown generator '{generator}', expected one of: {', '.join(GENERATORS)}")
+        return generator
+    module_name = generator.__module__
+    if module_name == '__main__':
+        # A script passing its own function: use the module name it is importable as
+        module_name = os.path.splitext(os.path.basename(sys.modules['__main__'].__file__))[0]
+    for name, entry in GENERATORS.items():
+        if entry == (module_name, generator.__name__):
+            return name
+    raise KeyError(f'{module_name}.{generator.__name__} is not a registered generator')
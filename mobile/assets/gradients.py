@@ -0,0 +1,139 @@
+"""
+Vectorized gradient and mask helpers shared by the logo generators
+Every helper works on whole arrays at once instead of per-pixel putpixel loops
+and returns a Pillow image the generators can paste or composite directly.
+Passing region=(left, top, right, bottom) renders only that part of the
+size canvas, which is how tiled renders avoid full-size buffers. With
+linear=True colours are interpolated in linear light instead of sRGB.
+"""
+import numpy as np
+from PIL import Image
+
+from compositing import encode_linear, srgb_to_linear
+
+
+def _region(size, region):
+    """Return the (left, top, right, bottom) box to render, defaulting to the whole canvas"""
+    return region if region is not None else (0, 0, size[0], size[1])
+
+
+def _grid(size, region=None):
+    """Return broadcastable x and y canvas coordinate arrays for the rendered region"""
+    left, top, right, bottom = _region(size, region)
+    ys, xs = np.ogrid[top:bottom, left:right]
+    return xs.astype(np.float64), ys.astype(np.float64)
+
+
+def _color(color):
+    """Return a colour as a float RGBA vector, defaulting alpha to opaque"""
+    if len(color) == 3:
+        color = tuple(color) + (255,)
+    return np.asarray(color, dtype=np.float64)
+
+
+def _mix(start_color, end_color, factor, linear=False):
+    """Interpolate two colours by a factor array, truncating like int()
+
+    With linear the colour channels are mixed in linear light and encoded back
+    to sRGB through the compositing tables; alpha is always mixed as is.
+    """
+    start = _color(start_color)
+    end = _color(end_color)
+    if not linear:
+        pixels = start + (end - start) * factor[..., np.newaxis]
+        return np.clip(pixels, 0, 255).astype(np.uint8)
+
+    start[:3] = srgb_to_linear(start[:3] / 255)
+    end[:3] = srgb_to_linear(end[:3] / 255)
+    mixed = start + (end - start) * factor[..., np.newaxis]
+    pixels = np.empty(mixed.shape, dtype=np.uint8)
+    pixels[..., :3] = encode_linear(mixed[..., :3])
+    pixels[..., 3] = np.clip(mixed[..., 3], 0, 255)
+    return pixels
+
+
+def _to_image(pixels):
+    """Wrap an HxWx4 uint8 array as an RGBA image"""
+    return Image.fromarray(np.ascontiguousarray(pixels), 'RGBA')
+
+
+def linear_gradient(size, start_color, end_color, direction=(1, 1), region=None, linear=False):
+    """Create a linear gradient running along direction (dx, dy)
+
+    The default (1, 1) direction reproduces the top-left to bottom-right
+    diagonal ramp used by the app icon background.
+    """
+    width, height = size
+    dx, dy = direction
+    xs, ys = _grid(size, region)
+    span = width * abs(dx) + height * abs(dy)
+    offset = (width * max(0, -dx) + height * max(0, -dy)) / span
+    if float(dx).is_integer() and float(dy).is_integer():
+        # The colour only depends on the integer xs * dx + ys * dy, so mix each value once
+        positions = (xs * dx + ys * dy).astype(np.int64)
+        lowest = positions.min()
+        steps = np.arange(lowest, positions.max() + 1, dtype=np.float64)
+        table = _mix(start_color, end_color, steps / span + offset, linear)
+        return _to_image(table.take(positions - lowest, axis=0))
+    factor = (xs * dx + ys * dy) / span + offset
+    return _to_image(_mix(start_color, end_color, np.broadcast_to(factor, (ys.shape[0], xs.shape[1])), linear))
+
+
+def multi_stop_gradient(size, bands, region=None, linear=False):
+    """Create a vertical gradient from a list of colour bands
+
+    Each band is (start, end, start_color, end_color): rows from start until the
+    next band's start are interpolated with ratio (y - start) / (end - start),
+    so bands may be discontinuous or overshoot like the hand-tuned ramps.
+    """
+    left, top, right, bottom = _region(size, region)
+    rows = np.zeros((bottom - top, 4), dtype=np.uint8)
+    for index, (start, end, start_color, end_color) in enumerate(bands):
+        stop = bands[index + 1][0] if index + 1 < len(bands) else size[1]
+        first, last = max(int(start), top), min(int(stop), bottom)
+        if first >= last:
+            continue
+        ys = np.arange(first, last, dtype=np.float64)
+        rows[first - top:last - top] = _mix(start_color, end_color, (ys - start) / (end - start), linear)
+    return _to_image(np.broadcast_to(rows[:, np.newaxis, :], (bottom - top, right - left, 4)))
+
+
+def angular_gradient(size, center, start_color, end_color, phase=0.0, region=None, linear=False):
+    """Create a gradient that follows the angle around center
+
+    The factor is (cos(angle - phase) + 1) / 2, so start_color faces away from
+    phase and end_color faces towards it.
+    """
+    xs, ys = _grid(size, region)
+    angle = np.arctan2(ys - center[1], xs - center[0])
+    factor = (np.cos(angle - phase) + 1) / 2
+    return _to_image(_mix(start_color, end_color, factor, linear))
+
+
+def radial_gradient(size, center, inner_radius, outer_radius, start_color, end_color,
+                    angle_range=None, background=(0, 0, 0, 0), region=None, linear=False):
+    """Create a ring gradient from inner_radius (exclusive) to outer_radius
+
+    Pixels outside the ring, or outside the optional (start, end) angle range
+    in radians (both exclusive), are filled with background.
+    """
+    xs, ys = _grid(size, region)
+    dx = xs - center[0]
+    dy = ys - center[1]
+    dist = np.sqrt(dx ** 2 + dy ** 2)
+    factor = (dist - inner_radius) / (outer_radius - inner_radius)
+    inside = (dist > inner_radius) & (dist <= outer_radius)
+    if angle_range is not None:
+        angle = np.arctan2(dy, dx)
+        inside &= (angle > angle_range[0]) & (angle < angle_range[1])
+    pixels = _mix(start_color, end_color, np.clip(factor, 0, 1), linear)
+    pixels[~inside] = _color(background).astype(np.uint8)
+    return _to_image(pixels)
+
+
+def circle_mask(size, center, radius, region=None):
+    """Create an L-mode mask that is 255 within radius of center, with an anti-aliased edge"""
+    xs, ys = _grid(size, region)
+    coverage = np.clip(radius + 0.5 - np.sqrt((xs - center[0]) ** 2 + (ys - center[1]) ** 2), 0, 1)
+    return Image.fromarray(np.round(coverage * 255).astype(np.uint8), 'L')
+
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Load client for icon_server.py
+Keeps one HTTP/1.1 connection per client thread and requests icons from a mix
+of generators, sizes, modes and badge counts, then reports throughput and
+latency percentiles split by the server's X-Cache status.
+Usage: python icon_load.py [--url http://127.0.0.1:8765] [--requests 2000] [--concurrency 8]
+                           [--distinct 24] [--seed 0]
+"""
+import argparse
+import http.client
+import random
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+from generate_icon import MODE_COLORS
+from icon_server import DEFAULT_PORT
+
+SIZES = (48, 64, 96, 128, 192)
+BADGES = (0, 0, 1, 3, 12, 120)
+BLUE_PALETTES = ('default', 'dark', 'monochrome')
+
+
+def request_mix(distinct, seed=0):
+    """Return distinct icon paths: app icons per mode and badge, and blue logos per palette"""
+    available = len(SIZES) * (len(MODE_COLORS) * len(set(BADGES)) + len(BLUE_PALETTES))
+    if distinct > available:
+        raise ValueError(f'The request mix has at most {available} distinct icons')
+    rng = random.Random(seed)
+    paths = set()
+    while len(paths) < distinct:
+        size = rng.choice(SIZES)
+        if rng.random() < 0.75:
+            query = {'size': size, 'mode': rng.choice(list(MODE_COLORS)), 'badge': rng.choice(BADGES)}
+            paths.add(f'/icon/app-icon.png?{urlencode(query)}')
+        else:
+            query = {'size': size, 'palette': rng.choice(BLUE_PALETTES)}
+            paths.add(f'/icon/blue-microphone.png?{urlencode(query)}')
+    return sorted(paths)
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_load(url, paths, requests, concurrency, seed=0):
+    """Send requests spread over paths from concurrency threads
+
+    Returns (wall seconds, {X-Cache status: [latency seconds]}, error count).
+    """
+    location = urlsplit(url)
+    latencies = {}
+    errors = [0]
+    lock = threading.Lock()
+    counts = [requests // concurrency + (index < requests % concurrency) for index in range(concurrency)]
+
+    def client(index, count):
+        rng = random.Random(seed + index)
+        connection = http.client.HTTPConnection(location.hostname, location.port or 80)
+        local, failed = {}, 0
+        for _ in range(count):
+            path = rng.choice(paths)
+            start = time.perf_counter()
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+            elapsed = time.perf_counter() - start
+            if response.status != 200:
+                failed += 1
+                continue
+            local.setdefault(response.getheader('X-Cache', 'unknown'), []).append(elapsed)
+        connection.close()
+        with lock:
+            for status, values in local.items():
+                latencies.setdefault(status, []).extend(values)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(index, count)) for index, count in enumerate(counts)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies, errors[0]
+
+
+def print_report(seconds, latencies, errors):
+    total = sum(len(values) for values in latencies.values())
+    print(f"\n{'status':<10} {'requests':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    print('-' * 56)
+    for status, values in sorted(latencies.items()) + [('all', [v for vs in latencies.values() for v in vs])]:
+        if not values:
+            continue
+        row = [_percentile(values, fraction) * 1000 for fraction in (0.5, 0.9, 0.99)] + [max(values) * 1000]
+        print(f"{status:<10} {len(values):>8} " + ' '.join(f'{value:>8.2f}' for value in row))
+    print(f"\n✓ {total} requests in {seconds:.2f}s: {total / seconds:.0f} requests/s")
+    if errors:
+        print(f"✗ {errors} requests failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure icon_server.py throughput and latency under load')
+    parser.add_argument('--url', default=f'http://127.0.0.1:{DEFAULT_PORT}', help='Server address')
+    parser.add_argument('--requests', type=int, default=2000, help='Total requests (default: 2000)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Client threads (default: 8)')
+    parser.add_argument('--distinct', type=int, default=24, help='Distinct icons in the request mix (default: 24)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the request mix')
+    args = parser.parse_args()
+
+    paths = request_mix(args.distinct, args.seed)
+    print(f"Sending {args.requests} requests for {len(paths)} icons from {args.concurrency} clients to {args.url}...")
+    seconds, latencies, errors = run_load(args.url, paths, args.requests, args.concurrency, args.seed)
+    print_report(seconds, latencies, errors)
+    if errors:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
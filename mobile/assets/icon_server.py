@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Warm local HTTP service that renders icons on demand
+The generators stay imported in a pool of worker processes, and rendered PNG
+bytes are kept in a memory-capped LRU keyed by (generator, size, params), so
+repeated requests for per-mode and per-user icons skip interpreter startup and
+the render. Concurrent requests for the same icon wait on one render.
+Usage: python icon_server.py [--port 8765] [--cache-mb 64] [--workers N]
+       GET /icon/app-icon.png?size=192&mode=shopping&badge=3
+       GET /stats
+"""
+import argparse
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import get_context
+from urllib.parse import parse_qsl, urlsplit
+
+from PIL import ImageFont
+
+from canvas import RegionDraw
+from generate_icon import MODE_COLORS
+from generators import GENERATORS, ROLE_GENERATORS, load_generator, load_role_generator
+from sweep import design_parameters
+
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_MB = 64
+MAX_SIZE = 2048
+MIN_SIZE = 16
+
+# Accepted range of every numeric design knob (and of each entry of list knobs), so one
+# request cannot tie up a worker with an arbitrarily large render
+KNOB_LIMITS = {
+    'wave_count': (0, 12),
+    'num_waves': (0, 24),
+    'grille_dots': (0, 12),
+    'corner_radius': (0, 0.5),
+    'padding': (0, 0.4),
+    'circle_scale': (0.05, 0.45),
+    'wave_spacing': (0, 1),
+    'wave_taper': (0, 1),
+    'wave_heights': (0, 1),
+    'bar_heights': (0, 1),
+    'bar_width': (0.01, 0.2),
+}
+# Most entries a list knob may have, e.g. bars per side
+MAX_KNOB_ITEMS = 8
+# Knobs that also accept null, e.g. ai-microphone's background for transparency
+NULLABLE_KNOBS = {'background'}
+
+BADGE_COLOR = (229, 57, 53, 255)  # #e53935
+BADGE_TEXT_COLOR = (255, 255, 255, 255)
+
+
+class LRUCache:
+    """Thread-safe LRU of bytes values capped by their total size"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Return the value stored under key and mark it recently used, or None"""
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used entries to stay under max_bytes"""
+        if len(value) > self.max_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old)
+            self.entries[key] = value
+            self.bytes += len(value)
+            while self.bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.evictions += 1
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def add_badge(image, count):
+    """Draw a notification badge with count (99+ above 99) in the top-right corner"""
+    size = image.width
+    radius = size * 0.16
+    margin = size * 0.02
+    center_x, center_y = size - margin - radius, margin + radius
+    draw = RegionDraw(image, antialias=True)
+    draw.ellipse([center_x - radius, center_y - radius, center_x + radius, center_y + radius], fill=BADGE_COLOR)
+
+    text = str(count) if count <= 99 else '99+'
+    font_size = max(int(radius * (1.1 if len(text) == 1 else 0.8)), 8)
+    try:
+        font = ImageFont.load_default(size=font_size)
+    except TypeError:
+        # Pillow < 10.1 has only the fixed-size bitmap font
+        font = ImageFont.load_default()
+    left, top, right, bottom = draw.draw.textbbox((0, 0), text, font=font)
+    draw.text((center_x - (left + right) / 2, center_y - (top + bottom) / 2), text, fill=BADGE_TEXT_COLOR, font=font)
+    return image
+
+
+def _warm_worker():
+    """Import every generator once when a worker starts, so the first request renders warm"""
+    for name in GENERATORS:
+        load_generator(name)
+
+
+def _render_png(name, size, params):
+    """Render one icon inside a worker process and return (PNG bytes, render seconds)"""
+    start = time.perf_counter()
+    params = dict(params)
+    badge = params.pop('badge', 0)
+    image = load_generator(name)(size, **params)
+    if badge:
+        add_badge(image, badge)
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue(), time.perf_counter() - start
+
+
+def _normalize(value):
+    """Return value as it round-trips through JSON, so tuples compare equal to lists"""
+    return json.loads(json.dumps(value))
+
+
+def check_knob(knob, value, default, choices=None, limits=None):
+    """Raise ValueError unless value has the type and shape of the knob's default and is in range
+
+    Defaults are compared after _normalize, so lists stand for tuples. A list
+    of integers is a colour: it keeps its length and each channel is 0-255.
+    """
+    if value is None and knob in NULLABLE_KNOBS:
+        return
+    if choices is not None:
+        if value not in choices:
+            raise ValueError(f"Unknown {knob} {value!r}, expected one of: {', '.join(choices)}")
+        return
+    limits = KNOB_LIMITS.get(knob) if limits is None else limits
+    if isinstance(default, list):
+        colour = all(isinstance(item, int) for item in default)
+        if not isinstance(value, list) or not value or len(value) > MAX_KNOB_ITEMS:
+            raise ValueError(f'{knob} must be a list of 1 to {MAX_KNOB_ITEMS} values')
+        if colour and len(value) != len(default):
+            raise ValueError(f'{knob} must be a colour of {len(default)} values')
+        for item in value:
+            check_knob(knob, item, default[0], limits=(0, 255) if colour else limits)
+        return
+    if isinstance(default, str):
+        if not isinstance(value, str):
+            raise ValueError(f'{knob} must be a string')
+        return
+    if isinstance(default, int):
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValueError(f'{knob} must be an integer')
+    elif not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise ValueError(f'{knob} must be a number')
+    if limits is not None and not limits[0] <= value <= limits[1]:
+        raise ValueError(f'{knob} must be between {limits[0]:g} and {limits[1]:g}')
+
+
+class IconService:
+    """Render icons on a warm process pool behind an LRU of PNG bytes"""
+
+    def __init__(self, cache_bytes=DEFAULT_CACHE_MB * 1024 * 1024, workers=None):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.workers = workers
+        self.cache = LRUCache(cache_bytes)
+        # Spawned workers, because forking a process that is already serving threads can copy held locks
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'),
+                                        initializer=_warm_worker)
+        self.defaults = {name: _normalize(design_parameters(name)) for name in GENERATORS}
+        # Knobs that name an entry of a table rather than taking a value
+        self.choices = {name: {'palette': list(load_role_generator(name)[1])} for name in ROLE_GENERATORS}
+        self.choices.setdefault('app-icon', {})['mode'] = list(MODE_COLORS)
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.counts = {'hit': 0, 'miss': 0, 'coalesced': 0, 'error': 0}
+        self.render_seconds = 0.0
+
+    def warm(self):
+        """Start every worker process now instead of on the first cache misses"""
+        futures = [self.pool.submit(time.sleep, 0.1) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def cache_key(self, name, size, params):
+        """Validate a request and return its cache key (generator, size, params JSON)
+
+        Parameters equal to the generator's defaults are dropped, so every
+        spelling of the shipped icon shares one entry. Raises ValueError for
+        an unknown generator, size, parameter or palette, and for knob values
+        of the wrong type or out of range.
+        """
+        if name not in GENERATORS:
+            raise ValueError(f"Unknown generator '{name}', expected one of: {', '.join(GENERATORS)}")
+        if not MIN_SIZE <= size <= MAX_SIZE:
+            raise ValueError(f'size must be between {MIN_SIZE} and {MAX_SIZE}')
+        defaults = self.defaults[name]
+        knobs = {}
+        for knob, value in params.items():
+            if knob == 'badge':
+                if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                    raise ValueError('badge must be a non-negative integer')
+                if value:
+                    knobs[knob] = value
+                continue
+            if knob not in defaults:
+                raise ValueError(f"Unknown parameter '{knob}' for {name}, expected one of: "
+                                 f"{', '.join(list(defaults) + ['badge'])}")
+            value = _normalize(value)
+            check_knob(knob, value, defaults[knob], self.choices.get(name, {}).get(knob))
+            if value != defaults[knob]:
+                knobs[knob] = value
+        return name, size, json.dumps(knobs, sort_keys=True)
+
+    def render(self, name, size, params):
+        """Return (PNG bytes, 'hit' | 'miss' | 'coalesced') for an icon
+
+        A miss renders on the pool; requests for the same key that arrive
+        while it renders wait on the same future instead of rendering again.
+        """
+        key = self.cache_key(name, size, params)
+        data = self.cache.get(key)
+        if data is not None:
+            with self.lock:
+                self.counts['hit'] += 1
+            return data, 'hit'
+
+        with self.lock:
+            future = self.inflight.get(key)
+            if future is None:
+                # The render may have finished between the cache lookup and taking the lock
+                data = self.cache.get(key)
+                if data is not None:
+                    self.counts['hit'] += 1
+                    return data, 'hit'
+                future = self.pool.submit(_render_png, name, size, json.loads(key[2]))
+                self.inflight[key] = future
+                status = 'miss'
+            else:
+                status = 'coalesced'
+            self.counts[status] += 1
+        if status == 'miss':
+            # Outside the lock: a future that is already done runs the callback right here
+            future.add_done_callback(lambda done: self._finished(key, done))
+        return future.result()[0], status
+
+    def _finished(self, key, future):
+        with self.lock:
+            if future.exception() is None:
+                data, seconds = future.result()
+                self.cache.put(key, data)
+                self.render_seconds += seconds
+            else:
+                self.counts['error'] += 1
+            del self.inflight[key]
+
+    def stats(self):
+        """Return the request counts, render time and cache occupancy"""
+        with self.lock:
+            counts = dict(self.counts)
+            render_seconds = self.render_seconds
+        return {
+            **counts,
+            'render_seconds': round(render_seconds, 3),
+            'entries': len(self.cache),
+            'cache_bytes': self.cache.bytes,
+            'cache_max_bytes': self.cache.max_bytes,
+            'evictions': self.cache.evictions,
+            'workers': self.workers,
+        }
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+def parse_params(query):
+    """Parse query string knobs as JSON literals, or plain strings when they are not JSON"""
+    params = {}
+    for knob, text in parse_qsl(query, keep_blank_values=True):
+        try:
+            params[knob] = json.loads(text)
+        except ValueError:
+            params[knob] = text
+    return params
+
+
+class IconRequestHandler(BaseHTTPRequestHandler):
+    """GET /icon/<generator>.png?size=N&<knob>=<value>..., GET /stats"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; with Nagle's algorithm on, a keep-alive
+    # client's delayed ACK holds the body back ~40ms
+    disable_nagle_algorithm = True
+    service = None
+    verbose = False
+
+    def do_GET(self):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        if url.path == '/stats':
+            self._send(200, 'application/json', json.dumps(self.service.stats()).encode())
+            return
+        if not (url.path.startswith('/icon/') and url.path.endswith('.png')):
+            self._send_error(404, f'No such resource {url.path}, expected /icon/<generator>.png or /stats')
+            return
+
+        name = url.path[len('/icon/'):-len('.png')]
+        params = parse_params(url.query)
+        size = params.pop('size', 512)
+        if not isinstance(size, int):
+            self._send_error(400, 'size must be an integer')
+            return
+        try:
+            data, status = self.service.render(name, size, params)
+        except (ValueError, TypeError) as e:
+            # TypeError: a knob value of the wrong type for the generator
+            self._send_error(400, str(e))
+            return
+        except Exception as e:
+            self._send_error(500, f'{type(e).__name__}: {e}')
+            return
+        self._send(200, 'image/png', data, {
+            'Cache-Control': 'public, max-age=86400',
+            'X-Cache': status,
+            'Server-Timing': f'render;dur={(time.perf_counter() - start) * 1000:.3f}',
+        })
+
+    def _send(self, code, content_type, body, headers=None):
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for header, value in (headers or {}).items():
+            self.send_header(header, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, code, message):
+        self._send(code, 'application/json', json.dumps({'error': message}).encode())
+
+    def log_message(self, format, *args):
+        # Per-request logging dominates the time of a cached hit, so it is opt-in
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def serve(host, port, service, verbose=False):
+    """Serve icons from service until interrupted"""
+    handler = type('Handler', (IconRequestHandler,), {'service': service, 'verbose': verbose})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    print(f"✓ Serving icons on http://{host}:{port}/icon/<generator>.png "
+          f"({service.workers} workers, {service.cache.max_bytes / 1024 / 1024:.0f} MB cache)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve rendered icons from a warm worker pool and LRU cache')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('--cache-mb', type=float, default=DEFAULT_CACHE_MB,
+                        help=f'Memory cap of the PNG cache in MB (default: {DEFAULT_CACHE_MB})')
+    parser.add_argument('--workers', type=int, default=None, help='Render processes (default: one per core)')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    service = IconService(int(args.cache_mb * 1024 * 1024), workers=args.workers)
+    start = time.perf_counter()
+    service.warm()
+    print(f"✓ Started {service.workers} warm render workers in {time.perf_counter() - start:.2f}s")
+    serve(args.host, args.port, service, verbose=args.verbose)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,316 @@
+"""
+Process memory helpers for the asset scripts
+track_memory() accounts for the memory of one generator call or output:
+tracemalloc sees Python and NumPy allocations, Pillow image buffers (which
+tracemalloc cannot see) created on the tracking thread are attributed to the
+line that created the image, and a background thread samples the resident set
+size.
+
+Usage:
+    with track_memory('app-icon 1024') as usage:
+        generate_app_icon(1024)
+    if usage.over_budget(256):
+        print(usage.format_report())
+"""
+import os
+import sys
+import threading
+import tracemalloc
+import weakref
+from contextlib import contextmanager
+from functools import lru_cache
+
+from PIL import Image
+
+try:
+    import resource
+except ImportError:
+    # Windows has no resource module
+    resource = None
+
+ASSETS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Seconds between resident set size samples; image and traced peaks are caught
+# as images are created and by tracemalloc itself, so RSS only needs a coarse view
+SAMPLE_INTERVAL = 0.05
+
+# Allocation sites listed in a report
+REPORT_SITES = 8
+
+# Frames tracemalloc keeps per allocation: enough for two asset-script sites,
+# since every extra frame slows down each traced allocation
+TRACE_FRAMES = 4
+
+_trackers = []
+_original_image_init = Image.Image.__init__
+
+
+def peak_rss_mb():
+    """Return the peak resident set size of this process in MB, or None if unknown"""
+    # VmHWM tracks the current address space only; ru_maxrss on Linux also
+    # carries over the high-water mark of the process that forked us
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def current_rss_mb():
+    """Return the current resident set size of this process in MB, or None if unknown"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=None)
+def _is_asset_script(filename):
+    # Skip frozen modules ('<frozen ...>') and this module's own bookkeeping
+    return (not filename.startswith('<') and filename != __file__
+            and os.path.dirname(os.path.abspath(filename)) == ASSETS_DIR)
+
+
+def _allocation_site(frame):
+    """Describe the innermost asset-script frames above frame as 'file:line <- file:line'"""
+    sites = []
+    while frame is not None and len(sites) < 2:
+        filename = frame.f_code.co_filename
+        if _is_asset_script(filename):
+            sites.append(f'{os.path.basename(filename)}:{frame.f_lineno}')
+        frame = frame.f_back
+    return ' <- '.join(sites) or '<outside assets>'
+
+
+def _traceback_site(traceback):
+    """Describe a tracemalloc traceback the same way as _allocation_site"""
+    sites = []
+    # Traceback iterates from the oldest frame to the most recent one
+    for frame in reversed(traceback):
+        if _is_asset_script(frame.filename):
+            sites.append(f'{os.path.basename(frame.filename)}:{frame.lineno}')
+            if len(sites) == 2:
+                break
+    return ' <- '.join(sites) or '<outside assets>'
+
+
+def _image_bytes(image):
+    """Return the pixel buffer size of an image, or 0 until its mode and size are set"""
+    if not image.mode:
+        return 0
+    return image.width * image.height * len(image.getbands())
+
+
+def _tracked_image_init(image, *args, **kwargs):
+    _original_image_init(image, *args, **kwargs)
+    thread = threading.get_ident()
+    trackers = [tracker for tracker in _trackers if tracker.thread == thread]
+    if trackers:
+        site = _allocation_site(sys._getframe(1))
+        for tracker in trackers:
+            tracker.add_image(image, site)
+
+
+class MemoryUsage:
+    """Memory accounting for one tracked block
+
+    accounted_peak_mb is the largest sum of live Pillow image buffers and
+    tracemalloc-traced memory seen at once; it is what budgets are checked
+    against, since it does not depend on what the allocator keeps cached.
+    Image bytes are kept as running totals: an image is counted once its size
+    is set and subtracted when it is garbage collected. Only images created on
+    the thread that started tracking are counted; those made by other threads,
+    such as an encoder pool, show up in the RSS figures only.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.thread = threading.get_ident()
+        self.accounted_peak_mb = 0.0
+        self.images_peak_mb = 0.0
+        self.traced_peak_mb = 0.0
+        self.rss_peak_mb = 0.0
+        self.image_sites = []
+        self.traced_sites = []
+        # Weak references by id: images whose size is not set yet, and counted ones with their bytes
+        self._pending = {}
+        self._counted = {}
+        self._image_bytes = 0
+        self._site_totals = {}
+        # Reentrant: a collection inside a locked section can run _release on the same thread
+        self._lock = threading.RLock()
+        self._traced_snapshot_mb = 0.0
+        self._rss_start = current_rss_mb()
+
+    def add_image(self, image, site):
+        with self._lock:
+            ref = weakref.ref(image, self._release)
+            self._pending[id(ref)] = (ref, site)
+        # Pillow sets the new image's size after __init__; this counts the images before it.
+        # The sampler thread reads the resident set size, which is too slow to do per image.
+        self.sample(rss=False)
+
+    def _release(self, ref):
+        with self._lock:
+            self._pending.pop(id(ref), None)
+            counted = self._counted.pop(id(ref), None)
+            if counted is not None:
+                _, site, size = counted
+                self._image_bytes -= size
+                totals = self._site_totals[site]
+                totals[0] -= 1
+                totals[1] -= size
+
+    def _count_pending(self):
+        for key, (ref, site) in list(self._pending.items()):
+            image = ref()
+            size = _image_bytes(image) if image is not None else 0
+            if size:
+                del self._pending[key]
+                self._counted[key] = (ref, site, size)
+                self._image_bytes += size
+                totals = self._site_totals.setdefault(site, [0, 0])
+                totals[0] += 1
+                totals[1] += size
+
+    def stop(self):
+        """Stop counting images; their references are dropped, so no release callbacks run later"""
+        with self._lock:
+            self._pending.clear()
+            self._counted.clear()
+
+    def sample(self, rss=True):
+        """Record the current image, traced and (with rss) resident memory"""
+        with self._lock:
+            self._count_pending()
+            images_mb = self._image_bytes / (1024 * 1024)
+            traced, traced_peak = tracemalloc.get_traced_memory()
+            traced_mb = traced / (1024 * 1024)
+            self.images_peak_mb = max(self.images_peak_mb, images_mb)
+            self.traced_peak_mb = max(self.traced_peak_mb, traced_peak / (1024 * 1024))
+
+            rss = current_rss_mb() if rss else None
+            if rss is not None and self._rss_start is not None:
+                self.rss_peak_mb = max(self.rss_peak_mb, rss - self._rss_start)
+
+            if images_mb + traced_mb > self.accounted_peak_mb:
+                self.accounted_peak_mb = images_mb + traced_mb
+                self.image_sites = sorted(
+                    ((site, count, total) for site, (count, total) in self._site_totals.items() if count),
+                    key=lambda entry: entry[2], reverse=True,
+                )
+                # Snapshots are slow, so only take one when traced memory grew noticeably
+                if traced_mb > self._traced_snapshot_mb + 1:
+                    self._traced_snapshot_mb = traced_mb
+                    self.traced_sites = self._traced_sites()
+            # Short-lived NumPy temporaries can fall between samples; tracemalloc's own peak cannot
+            self.accounted_peak_mb = max(self.accounted_peak_mb, self.traced_peak_mb)
+
+    def _traced_sites(self):
+        totals = {}
+        for stat in tracemalloc.take_snapshot().statistics('traceback'):
+            site = _traceback_site(stat.traceback)
+            count, total = totals.get(site, (0, 0))
+            totals[site] = (count + stat.count, total + stat.size)
+        return sorted(
+            ((site, count, total) for site, (count, total) in totals.items()),
+            key=lambda entry: entry[2], reverse=True,
+        )
+
+    def over_budget(self, budget_mb):
+        return budget_mb is not None and self.accounted_peak_mb > budget_mb
+
+    def as_dict(self):
+        return {
+            'label': self.label,
+            'accounted_peak_mb': self.accounted_peak_mb,
+            'images_peak_mb': self.images_peak_mb,
+            'traced_peak_mb': self.traced_peak_mb,
+            'rss_peak_mb': self.rss_peak_mb,
+        }
+
+    def format_report(self, limit=REPORT_SITES):
+        """Return the peaks and the largest allocation sites live at the peak"""
+        lines = [
+            f"{self.label}: {self.accounted_peak_mb:.1f}MB accounted peak "
+            f"({self.images_peak_mb:.1f}MB images, {self.traced_peak_mb:.1f}MB traced, "
+            f"+{self.rss_peak_mb:.1f}MB RSS)"
+        ]
+        if self.image_sites:
+            lines.append('  Pillow images live at peak:')
+            for site, count, total in self.image_sites[:limit]:
+                lines.append(f"    {total / (1024 * 1024):>8.1f}MB {count:>4}x  {site}")
+        if self.traced_sites:
+            lines.append('  Python/NumPy allocations at peak:')
+            for site, count, total in self.traced_sites[:limit]:
+                lines.append(f"    {total / (1024 * 1024):>8.1f}MB {count:>4}x  {site}")
+        return '\n'.join(lines)
+
+
+@contextmanager
+def track_memory(label):
+    """Account for the memory allocated inside the block
+
+    Yields a MemoryUsage that is complete once the block exits. Blocks may be
+    nested; tracemalloc is started and stopped by the outermost one. Image
+    creation is hooked only while a block is open, and the hook is removed
+    when the last one exits, even if the block raised.
+    """
+    usage = MemoryUsage(label)
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(TRACE_FRAMES)
+    else:
+        tracemalloc.reset_peak()
+    if not _trackers:
+        Image.Image.__init__ = _tracked_image_init
+    _trackers.append(usage)
+
+    stop = threading.Event()
+
+    def sampler():
+        while not stop.wait(SAMPLE_INTERVAL):
+            usage.sample()
+
+    thread = threading.Thread(target=sampler, daemon=True)
+    thread.start()
+    try:
+        yield usage
+    finally:
+        usage.sample()
+        stop.set()
+        thread.join()
+        usage.stop()
+        _trackers.remove(usage)
+        if not _trackers:
+            Image.Image.__init__ = _original_image_init
+        if started:
+            tracemalloc.stop()
+
+
+def print_memory_report(usages, budget_mb=None):
+    """Print one line per tracked block, with site reports for those over budget
+
+    Returns False if any block exceeded budget_mb.
+    """
+    ok = True
+    for usage in usages:
+        if usage.over_budget(budget_mb):
+            ok = False
+            print(f"✗ {usage.format_report()}")
+            print(f"  over the {budget_mb:g}MB memory budget")
+        else:
+            print(f"✓ {usage.label}: {usage.accounted_peak_mb:.1f}MB accounted peak "
+                  f"(+{usage.rss_peak_mb:.1f}MB RSS)")
+    return ok
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+PNG size-optimization stage for generated assets
+Each image is reduced to the smallest lossless representation (RGB when fully
+opaque, an exact palette when it has 256 colours or fewer), small sizes can
+optionally be quantized, metadata is dropped, and several zlib strategies are
+tried on a thread pool with the smallest result kept. Images with more colours
+also get near-lossless palette candidates: quantizations that move no channel
+of any pixel by more than PALETTE_MAX_ERROR, which is below what anti-aliased
+edges and gradients visibly need. Byte budgets per target
+catch assets that grow past what we want to ship in every bundle, and every
+written file is compared with the size of the same file in the last commit.
+Usage: python png_optimize.py [files ...] [--budget favicon.png=4096] [--quantize-max 64]
+"""
+import argparse
+import io
+import os
+import subprocess
+import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageChops
+
+# NumPy only speeds up building exact palettes; Pillow-only builds fall back to quantize()
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Maximum shipped size in bytes for the default Expo assets
+DEFAULT_BUDGETS = {
+    'icon.png': 96 * 1024,
+    'adaptive-icon.png': 96 * 1024,
+    'splash.png': 128 * 1024,
+    'favicon.png': 4 * 1024,
+}
+
+# A rewritten asset may grow this much over its committed size before the report fails
+MAX_GROWTH = 1.10
+
+# Palette sizes tried for the near-lossless candidates, and the largest channel
+# error (out of 255) a candidate may add to any pixel
+PALETTE_COLORS = (256, 128, 64)
+PALETTE_MAX_ERROR = 8
+
+# (compress_level, zlib strategy) candidates tried for every image
+ENCODINGS = [
+    (9, zlib.Z_DEFAULT_STRATEGY),
+    (9, zlib.Z_FILTERED),
+    (9, zlib.Z_RLE),
+]
+
+
+def reduce_mode(image, quantize=False):
+    """Return the smallest lossless (or, with quantize, palette) form of an image"""
+    image = image.convert('RGBA') if image.mode not in ('RGB', 'RGBA') else image
+    if image.mode == 'RGBA' and image.getchannel('A').getextrema() == (255, 255):
+        image = image.convert('RGB')
+
+    # getcolors() gives up early once there are more than 256 colours
+    colors = image.getcolors(256)
+    if colors is not None and np is None:
+        palette_image = image.quantize(colors=len(colors), method=Image.Quantize.FASTOCTREE)
+        # Only keep the palette if it reproduces every colour exactly
+        if ImageChops.difference(palette_image.convert(image.mode), image).getbbox() is None:
+            return palette_image
+    elif colors is not None:
+        pixels = np.asarray(image.convert('RGBA')).view('<u4')[..., 0]
+        colors, indices = np.unique(pixels, return_inverse=True)
+        rgba = colors.view(np.uint8).reshape(-1, 4)
+        palette_image = Image.fromarray(indices.reshape(pixels.shape).astype(np.uint8), 'P')
+        palette_image.putpalette(rgba[:, :3].tobytes())
+        if image.mode == 'RGBA':
+            palette_image.info['transparency'] = rgba[:, 3].tobytes()
+        return palette_image
+    if quantize:
+        method = Image.Quantize.FASTOCTREE if image.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+        return image.quantize(colors=256, method=method)
+
+    # Drop any metadata (ICC profiles, text chunks) carried over from the source
+    image = image.copy()
+    image.info = {}
+    return image
+
+
+def palette_candidates(image):
+    """Return palette quantizations of an RGB or RGBA image within PALETTE_MAX_ERROR of it, most colours first"""
+    # MAXCOVERAGE keeps gradients closest, but Pillow only supports it for RGB
+    method = Image.Quantize.FASTOCTREE if image.mode == 'RGBA' else Image.Quantize.MAXCOVERAGE
+    candidates = []
+    for colors in PALETTE_COLORS:
+        palette_image = image.quantize(colors=colors, method=method)
+        extrema = ImageChops.difference(palette_image.convert(image.mode), image).getextrema()
+        if max(high for _, high in extrema) > PALETTE_MAX_ERROR:
+            break
+        candidates.append(palette_image)
+    return candidates
+
+
+def _encode(image, level, strategy):
+    """Encode an image as PNG with one zlib setting"""
+    buffer = io.BytesIO()
+    params = {'compress_level': level, 'compress_type': strategy}
+    if 'transparency' in image.info:
+        params['transparency'] = image.info['transparency']
+    # save() stores its options on the image, so concurrent encodes each need their own
+    image.copy().save(buffer, 'PNG', **params)
+    return buffer.getvalue()
+
+
+def committed_size(path):
+    """Return the size in bytes of path in the last git commit, or None if it is not committed"""
+    directory, name = os.path.split(os.path.abspath(path))
+    try:
+        output = subprocess.run(['git', 'cat-file', '-s', f'HEAD:./{name}'], cwd=directory,
+                                capture_output=True, text=True)
+    except OSError:
+        return None
+    return int(output.stdout) if output.returncode == 0 else None
+
+
+def optimize_images(targets, budgets=None, quantize_max_size=0, workers=None):
+    """Encode and write (path, image) targets, keeping the smallest encoding of each
+
+    Images without an exact palette also try palette_candidates(), and those
+    no larger than quantize_max_size on their longest side a plain 256-colour
+    quantization. Returns one result per target with the default encoding
+    size, the written size, bytes saved, any budget overrun and the size of
+    the file in the last commit (None if it is not committed).
+    """
+    budgets = DEFAULT_BUDGETS if budgets is None else budgets
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for path, image in targets:
+            reduced = reduce_mode(image)
+            forms = [reduced]
+            if reduced.mode != 'P':
+                if max(image.size) <= quantize_max_size:
+                    forms.append(reduce_mode(image, quantize=True))
+                forms.extend(palette_candidates(reduced))
+            baseline = pool.submit(_encode, image, 6, zlib.Z_DEFAULT_STRATEGY)
+            candidates = [
+                pool.submit(_encode, form, level, strategy) for form in forms for level, strategy in ENCODINGS
+            ]
+            pending.append((path, baseline, candidates))
+
+        results = []
+        for path, baseline, candidates in pending:
+            committed = committed_size(path)
+            # Never ship anything larger than the plain default encoding
+            data = min([baseline.result()] + [candidate.result() for candidate in candidates], key=len)
+            with open(path, 'wb') as f:
+                f.write(data)
+            budget = budgets.get(os.path.basename(path))
+            before = len(baseline.result())
+            results.append({
+                'path': path,
+                'before': before,
+                'after': len(data),
+                'saved': before - len(data),
+                'budget': budget,
+                'over_budget': budget is not None and len(data) > budget,
+                'committed': committed,
+            })
+    return results
+
+
+def optimize_files(paths, budgets=None, quantize_max_size=0, workers=None):
+    """Re-encode existing PNG files in place with optimize_images"""
+    targets = []
+    for path in paths:
+        with Image.open(path) as image:
+            image.load()
+            targets.append((path, image))
+    return optimize_images(targets, budgets, quantize_max_size, workers)
+
+
+def print_report(results):
+    """Print bytes saved per file next to its committed size and flag budget overruns and growth
+
+    Returns False if any target is over budget or grew by more than MAX_GROWTH
+    over its committed size; smaller growth is only warned about.
+    """
+    ok = True
+    for result in results:
+        name = os.path.basename(result['path'])
+        line = f"{name}: {result['before']:,} -> {result['after']:,} bytes (saved {result['saved']:,})"
+        committed = result.get('committed')
+        if committed is not None:
+            line += f", committed {committed:,}"
+        if result['over_budget']:
+            ok = False
+            print(f"✗ {line}, over the {result['budget']:,} byte budget")
+        elif committed is not None and result['after'] > committed * MAX_GROWTH:
+            ok = False
+            print(f"✗ {line}, {result['after'] / committed - 1:.0%} larger than committed")
+        elif committed is not None and result['after'] > committed:
+            print(f"⚠ {line}, larger than committed")
+        else:
+            print(f"✓ {line}")
+    return ok
+
+
+def _parse_budget(value):
+    name, _, size = value.partition('=')
+    return name, int(size)
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='Shrink generated PNG assets in place')
+    parser.add_argument('files', nargs='*', help='PNG files (default: the Expo assets in this directory)')
+    parser.add_argument('--budget', type=_parse_budget, action='append', default=[],
+                        metavar='NAME=BYTES', help='Byte budget for a target file name (repeatable)')
+    parser.add_argument('--quantize-max', type=int, default=64,
+                        help='Quantize images up to this many pixels on a side (0 disables)')
+    args = parser.parse_args()
+
+    files = args.files or [
+        os.path.join(script_dir, name) for name in DEFAULT_BUDGETS
+        if os.path.exists(os.path.join(script_dir, name))
+    ]
+    budgets = dict(DEFAULT_BUDGETS, **dict(args.budget))
+    results = optimize_files(files, budgets, quantize_max_size=args.quantize_max)
+    if not print_report(results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
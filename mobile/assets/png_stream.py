@@ -0,0 +1,91 @@
+"""
+Streaming PNG encoder with bounded memory
+Rows are filtered and deflated band by band as they are produced, so an image
+never has to exist in memory as a whole frame. Only the previous row is kept
+for the PNG "Up" filter, which is a byte-wise subtraction modulo 256 that
+Pillow computes, so no NumPy is needed.
+"""
+import struct
+import zlib
+
+from PIL import Image, ImageChops
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+COLOR_TYPES = {'RGB': 2, 'RGBA': 6}
+FILTER_UP = 2
+
+
+class PngStreamWriter:
+    """Write a PNG file one band of rows at a time
+
+    Usage:
+        with PngStreamWriter(path, (width, height)) as png:
+            for band in bands:
+                png.write_rows(band)
+    """
+
+    def __init__(self, path, size, mode='RGBA', compress_level=6):
+        if mode not in COLOR_TYPES:
+            raise ValueError(f"Unsupported PNG mode '{mode}', expected one of: {', '.join(COLOR_TYPES)}")
+        self.path = path
+        self.width, self.height = size
+        self.mode = mode
+        self.rows_written = 0
+        self._stride = self.width * len(mode)
+        self._previous = Image.new(mode, (self.width, 1))
+        self._compressor = zlib.compressobj(compress_level)
+        self._file = open(path, 'wb')
+        self._file.write(PNG_SIGNATURE)
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', self.width, self.height, 8,
+                                         COLOR_TYPES[mode], 0, 0, 0))
+
+    def _chunk(self, kind, data):
+        self._file.write(struct.pack('>I', len(data)))
+        self._file.write(kind)
+        self._file.write(data)
+        self._file.write(struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    def write_rows(self, band):
+        """Filter, compress and write the rows of a band image"""
+        if band.width != self.width:
+            raise ValueError(f'Band is {band.width}px wide, expected {self.width}px')
+        if self.rows_written + band.height > self.height:
+            raise ValueError('More rows written than the PNG height')
+        if band.mode != self.mode:
+            band = band.convert(self.mode)
+
+        # The rows above each row: the previous band's last row, then this band shifted down
+        above = Image.new(self.mode, band.size)
+        above.paste(self._previous, (0, 0))
+        above.paste(band.crop((0, 0, self.width, band.height - 1)), (0, 1))
+        rows = ImageChops.subtract_modulo(band, above).tobytes()
+        filtered = b''.join(
+            bytes((FILTER_UP,)) + rows[start:start + self._stride] for start in range(0, len(rows), self._stride)
+        )
+        self._previous = band.crop((0, band.height - 1, self.width, band.height))
+        self.rows_written += band.height
+
+        data = self._compressor.compress(filtered)
+        if data:
+            self._chunk(b'IDAT', data)
+
+    def close(self):
+        """Flush the compressor and finish the file"""
+        if self._file.closed:
+            return
+        try:
+            if self.rows_written != self.height:
+                raise ValueError(f'Wrote {self.rows_written} of {self.height} rows')
+            self._chunk(b'IDAT', self._compressor.flush())
+            self._chunk(b'IEND', b'')
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
@@ -0,0 +1,145 @@
+"""
+Opt-in per-stage timing for the logo generators
+Generators report named stages (gradient, overlay, mic, waves, glow,
+composite, encode, ...) through laps() or stage(). Nothing is recorded unless
+a profile() block is active; otherwise both return shared no-op objects, so the
+instrumentation can stay in place for every build.
+
+Usage:
+    with profile() as profiler:
+        generate_app_icon(1024)
+    print(profiler.format_table())
+    profiler.write_chrome_trace('trace.json')
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_profiler = None
+
+
+class Profiler:
+    """Collects (stage, start, end) events and summarizes them"""
+
+    def __init__(self):
+        self.events = []
+        self.origin = time.perf_counter()
+
+    def record(self, name, start, end):
+        self.events.append((name, start, end, os.getpid(), threading.get_ident()))
+
+    def summary(self):
+        """Return {stage: {count, total_ms, mean_ms, share}} in first-seen order"""
+        totals = {}
+        for name, start, end, _, _ in self.events:
+            count, total = totals.get(name, (0, 0.0))
+            totals[name] = (count + 1, total + end - start)
+        overall = sum(total for _, total in totals.values()) or 1.0
+        return {
+            name: {
+                'count': count,
+                'total_ms': total * 1000,
+                'mean_ms': total * 1000 / count,
+                'share': total / overall,
+            }
+            for name, (count, total) in totals.items()
+        }
+
+    def format_table(self):
+        """Return the per-stage breakdown as a text table"""
+        lines = [f"{'stage':<14} {'calls':>6} {'total ms':>10} {'mean ms':>9} {'share':>7}"]
+        for name, row in self.summary().items():
+            lines.append(f"{name:<14} {row['count']:>6} {row['total_ms']:>10.2f} "
+                         f"{row['mean_ms']:>9.3f} {row['share']:>7.1%}")
+        return '\n'.join(lines)
+
+    def write_json(self, path):
+        """Write the per-stage summary as JSON"""
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+            f.write('\n')
+
+    def write_chrome_trace(self, path):
+        """Write the events in Chrome trace format (chrome://tracing, Perfetto)"""
+        events = [
+            {
+                'name': name,
+                'ph': 'X',
+                'ts': (start - self.origin) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': pid,
+                'tid': tid,
+            }
+            for name, start, end, pid, tid in self.events
+        ]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+class _Stage:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class _Laps:
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.last = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self.profiler.record(name, self.last, now)
+        self.last = now
+
+
+class _Disabled:
+    """Shared stand-in for stages and laps while profiling is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+    def lap(self, name):
+        pass
+
+
+_DISABLED = _Disabled()
+
+
+def stage(name):
+    """Time a with-block as the named stage"""
+    if _profiler is None:
+        return _DISABLED
+    return _Stage(_profiler, name)
+
+
+def laps():
+    """Start a lap timer; each lap(name) records the time since the previous lap"""
+    if _profiler is None:
+        return _DISABLED
+    return _Laps(_profiler)
+
+
+@contextmanager
+def profile(profiler=None):
+    """Enable stage recording for the duration of the block, into profiler if one is given"""
+    global _profiler
+    previous = _profiler
+    _profiler = Profiler() if profiler is None else profiler
+    try:
+        yield _profiler
+    finally:
+        _profiler = previous
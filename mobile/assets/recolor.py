@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Recolour engine for themed logo variants
+A generator draws its geometry once into RoleMaps: a one-byte coverage mask
+per role (background, circle, mic, waves, ...) and, for gradient roles, a
+one-byte index map of the position along the gradient. A palette maps every
+role to a colour, or gradient roles to (position, colour) stops, and
+recolor() applies it through 256-entry lookup tables and composites the roles
+in order. Every further colourway costs a table lookup per role instead of a
+render. Lookups use Image.point, which is the fast path with either backend.
+Usage: python recolor.py blue-microphone [--palettes default dark ...] [--size 1024]
+                         [--palette-file partners.json] [--output-dir build/colourways]
+"""
+import argparse
+import json
+import os
+import time
+
+from PIL import Image, ImageChops
+
+import backend
+import vector
+from canvas import MaskLayer, full_region, new_layer
+from generators import ROLE_GENERATORS, load_role_generator
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT_DIR = os.path.join(SCRIPT_DIR, 'build', 'colourways')
+
+# Start and end colours of a gradient whose red channel is its 8-bit position, for index maps
+INDEX_RAMP = ((0, 0, 0), (255, 255, 255))
+
+
+class Role:
+    """One named layer of a RoleMaps
+
+    mask is an L-mode coverage image (None covers the whole canvas) and index
+    an L-mode gradient position map for gradient roles. blend is 'over' or
+    'add'; gradient roles blended 'add' are added onto what is already there.
+    """
+
+    def __init__(self, name, mask=None, index=None, linear=False, blend='over', layer=None):
+        self.name = name
+        self.mask = mask
+        self.index = index
+        self.linear = linear
+        self.blend = blend
+        self.layer = layer
+
+    @property
+    def box(self):
+        """Return the (left, top, right, bottom) box a masked role covers, or None if it is empty"""
+        if self.layer is not None:
+            return self.layer.bbox
+        return self.mask.getbbox()
+
+
+class RoleMaps:
+    """Geometry of one render as named roles in paint order"""
+
+    def __init__(self, size, region=None, antialias=True):
+        self.size = size
+        self.region = region or full_region(size)
+        self.antialias = antialias
+        self.roles = []
+
+    def add_fill(self, name, clip=None):
+        """Add a flat-colour role covering a vector.Circle clip, or the whole canvas for None"""
+        vector.add_fill(role=name, clip=clip)
+        mask = clip.mask(self.size, self.region) if clip is not None else None
+        self.roles.append(Role(name, mask=mask))
+
+    def add_ramp(self, name, gradient, clip=None, linear=False, blend='over'):
+        """Add a gradient role: a vector gradient rendered as an index map, within an optional clip
+
+        Where the gradient itself is transparent (outside a RadialGradient's
+        ring) the role is not painted either.
+        """
+        vector.add_fill(gradient=gradient, clip=clip, role=name, linear=linear, blend=blend)
+        positions = gradient.render(self.size, *INDEX_RAMP, region=self.region)
+        mask = clip.mask(self.size, self.region) if clip is not None else None
+        coverage = positions.getchannel('A')
+        if coverage.getextrema()[0] < 255:
+            mask = coverage if mask is None else ImageChops.multiply(coverage, mask)
+        self.roles.append(Role(name, mask=mask, index=positions.getchannel('R'), linear=linear, blend=blend))
+
+    def add_mask_layer(self, name):
+        """Add a flat-colour role to draw on and return its MaskLayer"""
+        left, top, right, bottom = self.region
+        layer = MaskLayer((right - left, bottom - top), None, self.region, self.antialias)
+        layer.recording = vector.add_shapes(role=name)
+        self.roles.append(Role(name, mask=layer.image, layer=layer))
+        return layer
+
+
+def ramp_tables(paint, linear=False):
+    """Return per-channel 256-entry lookup tables for a colour or (position, colour) stops
+
+    Stops may share a position to make a hard edge (see vector.gradient_segments).
+    With linear, colours mix in linear light.
+    """
+    colors = vector.ramp_colors(paint, [step / 255 for step in range(256)], linear)
+    return [[color[channel] for color in colors] for channel in range(4)]
+
+
+def apply_ramp(index, paint, linear=False):
+    """Map an L-mode index map to RGBA through a palette entry's lookup tables"""
+    return Image.merge('RGBA', [index.point(table) for table in ramp_tables(paint, linear)])
+
+
+def _color(paint):
+    return tuple(paint) if len(paint) > 3 else tuple(paint) + (255,)
+
+
+def recolor(maps, palette):
+    """Render RoleMaps in a palette of role name -> colour or (position, colour) stops
+
+    Roles the palette leaves out are not painted, so a palette without a
+    background renders on transparency. Consecutive flat-colour roles are
+    composited together through the active backend, like LayerStack layers.
+    """
+    image = new_layer(maps.size, (0, 0, 0, 0), maps.region)
+    pending = []
+    for role in maps.roles:
+        paint = palette.get(role.name)
+        box = role.box if role.mask is not None else (0, 0) + image.size
+        if paint is None or box is None:
+            continue
+        if role.index is None and role.mask is not None:
+            pending.append((role.mask, box, _color(paint)))
+            continue
+        if pending:
+            backend.composite_boxes(image, pending)
+            pending = []
+        if role.index is None:
+            image.paste(_color(paint), box)
+            continue
+
+        colors = apply_ramp(role.index.crop(box), paint, role.linear)
+        mask = role.mask.crop(box) if role.mask is not None else None
+        if role.blend == 'add':
+            if mask is not None:
+                colors = ImageChops.multiply(colors, Image.merge('RGBA', [mask] * 4))
+            image.paste(ImageChops.add(image.crop(box), colors), box)
+        else:
+            image.paste(colors, box, mask=mask)
+    if pending:
+        backend.composite_boxes(image, pending)
+    return image
+
+
+def load_palettes(path):
+    """Load {palette name: {role: colour or [[position, colour], ...]}} from a JSON file"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render colourways of a logo from one geometry render')
+    parser.add_argument('generator', choices=list(ROLE_GENERATORS))
+    parser.add_argument('--size', type=int, default=1024)
+    parser.add_argument('--palettes', nargs='+', help='Palettes to render (default: all of them)')
+    parser.add_argument('--palette-file', help='JSON file of extra palettes, e.g. partner colourways')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    args = parser.parse_args()
+
+    draw_roles, palettes = load_role_generator(args.generator)
+    palettes = dict(palettes)
+    if args.palette_file:
+        palettes.update(load_palettes(args.palette_file))
+    names = args.palettes or list(palettes)
+    unknown = [name for name in names if name not in palettes]
+    if unknown:
+        parser.error(f"Unknown palettes: {', '.join(unknown)}; expected one of: {', '.join(palettes)}")
+
+    start = time.perf_counter()
+    maps = draw_roles(args.size)
+    print(f"Rendered {args.generator} geometry at {args.size}px in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    output_dir = os.path.join(args.output_dir, args.generator)
+    os.makedirs(output_dir, exist_ok=True)
+    for name in names:
+        start = time.perf_counter()
+        image = recolor(maps, palettes[name])
+        elapsed = time.perf_counter() - start
+        path = os.path.join(output_dir, f'{name}.png')
+        image.save(path, 'PNG')
+        print(f"✓ {name:<16} {elapsed * 1000:>7.1f}ms  {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Render cache for the logo generators
+Renders are keyed by (generator, size, parameters) so identical targets are
+drawn once, and smaller targets can be derived from a single master render by
+downsampling instead of running the drawing code again
+"""
+from PIL import Image
+
+from profiling import stage
+
+_renders = {}
+
+
+def cache_key(generator, size, params=None):
+    """Build the cache key for a generator render"""
+    name = f'{generator.__module__}.{generator.__qualname__}'
+    return (name, size, tuple(sorted((params or {}).items())))
+
+
+def render(generator, size, **params):
+    """Render generator at size, reusing an earlier identical render
+
+    The returned image is shared with the cache, so copy it before drawing on it.
+    """
+    key = cache_key(generator, size, params)
+    if key not in _renders:
+        _renders[key] = generator(size, **params)
+    return _renders[key]
+
+
+def derive(master, size):
+    """Downsample a master render to size
+
+    Sizes that divide the master are box-reduced with Image.reduce, which
+    averages whole pixel blocks and never overshoots. Other sizes are resized
+    with LANCZOS, whose ringing adds halo colours along sharp edges.
+    """
+    if master.size == (size, size):
+        return master
+    with stage('resample'):
+        if master.width % size == 0 and master.height % size == 0:
+            return master.reduce(master.width // size)
+        return master.resize((size, size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+
+def render_targets(generator, targets, master_size=None, **params):
+    """Render every filename -> size target of one generator
+
+    Without master_size each distinct size is rendered once. With master_size a
+    single master is rendered and every smaller target is derived from it;
+    targets larger than the master are still rendered directly.
+    """
+    images = {}
+    for filename, size in targets.items():
+        if master_size is None or size > master_size:
+            images[filename] = render(generator, size, **params)
+            continue
+        key = cache_key(generator, size, dict(params, master_size=master_size))
+        if key not in _renders:
+            _renders[key] = derive(render(generator, master_size, **params), size)
+        images[filename] = _renders[key]
+    return images
+
+
+def clear_cache():
+    """Drop every cached render"""
+    _renders.clear()
@@ -0,0 +1,83 @@
+"""
+Sprite stamping for repeated primitives
+Dots, grille perforations and glow rings are many copies of one small shape.
+Each disc is rasterized once per (radius, sub-pixel phase) as an anti-aliased
+coverage sprite, and every copy of it is merged into a single mask that is
+composited onto the image in one operation.
+"""
+import math
+from functools import lru_cache
+
+import numpy as np
+
+from sdf import paint
+
+# Sub-pixel positions per axis a sprite is rasterized at
+SUBPIXEL_STEPS = 4
+
+
+@lru_cache(maxsize=256)
+def disc_coverage(radius, phase_x=0, phase_y=0):
+    """Return an anti-aliased disc coverage sprite as a uint8 array
+
+    The disc centre sits at (phase_x, phase_y) / SUBPIXEL_STEPS past the
+    sprite's own centre pixel origin. Cached arrays are shared; do not modify them.
+    """
+    extent = math.ceil(radius) + 1
+    offsets = np.arange(-extent, extent + 1, dtype=np.float64) + 0.5
+    xs = offsets[np.newaxis, :] - phase_x / SUBPIXEL_STEPS
+    ys = offsets[:, np.newaxis] - phase_y / SUBPIXEL_STEPS
+    coverage = np.clip(radius + 0.5 - np.sqrt(xs * xs + ys * ys), 0, 1)
+    sprite = np.round(coverage * 255).astype(np.uint8)
+    sprite.flags.writeable = False
+    return sprite
+
+
+def _placed(center, radius):
+    """Return (sprite, left, top) for a disc centred at a continuous position"""
+    x, y = center
+    cell_x = math.floor(x)
+    cell_y = math.floor(y)
+    phase_x = round((x - cell_x) * SUBPIXEL_STEPS)
+    phase_y = round((y - cell_y) * SUBPIXEL_STEPS)
+    cell_x, phase_x = cell_x + phase_x // SUBPIXEL_STEPS, phase_x % SUBPIXEL_STEPS
+    cell_y, phase_y = cell_y + phase_y // SUBPIXEL_STEPS, phase_y % SUBPIXEL_STEPS
+    sprite = disc_coverage(radius, phase_x, phase_y)
+    extent = math.ceil(radius) + 1
+    return sprite, cell_x - extent, cell_y - extent
+
+
+def stamp_discs(image, centers, radius, fill, offset=(0, 0)):
+    """Composite filled anti-aliased discs of one radius and colour onto an RGBA image
+
+    centers and radius use the same pixel grid as ImageDraw.ellipse([x - r,
+    y - r, x + r, y + r]); offset is subtracted from every centre, so region
+    renders can pass full-canvas positions. Overlapping discs merge instead of
+    stacking their alpha. Returns the touched (left, top, right, bottom) box,
+    or None if no disc lands on the image.
+    """
+    width, height = image.size
+    stamps = [_placed((x - offset[0] + 0.5, y - offset[1] + 0.5), radius + 0.5) for x, y in centers]
+    stamps = [
+        (sprite, left, top) for sprite, left, top in stamps
+        if left < width and top < height and left + sprite.shape[1] > 0 and top + sprite.shape[0] > 0
+    ]
+    if not stamps:
+        return None
+
+    box_left = max(0, min(left for _, left, _ in stamps))
+    box_top = max(0, min(top for _, _, top in stamps))
+    box_right = min(width, max(left + sprite.shape[1] for sprite, left, _ in stamps))
+    box_bottom = min(height, max(top + sprite.shape[0] for sprite, _, top in stamps))
+
+    mask = np.zeros((box_bottom - box_top, box_right - box_left), dtype=np.uint8)
+    for sprite, left, top in stamps:
+        # Clip each sprite to the mask and merge it with the discs already there
+        x0, y0 = max(left, box_left), max(top, box_top)
+        x1 = min(left + sprite.shape[1], box_right)
+        y1 = min(top + sprite.shape[0], box_bottom)
+        target = mask[y0 - box_top:y1 - box_top, x0 - box_left:x1 - box_left]
+        np.maximum(target, sprite[y0 - top:y1 - top, x0 - left:x1 - left], out=target)
+
+    paint(image, mask, box_left, box_top, fill)
+    return (box_left, box_top, box_right, box_bottom)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Variant explorer: render parameter sweeps of a generator into a contact sheet
+Every combination of the swept design knobs is rendered as a thumbnail on a
+process pool sized to the machine's cores, and the thumbnails are laid out in
+a labelled grid. A JSON sidecar next to the sheet records every cell's box and
+parameters, so a favourite can be rendered again at full size.
+Usage: python sweep.py app-icon --param wave_count 1 2 3 4 --param corner_radius 0.1:0.3:5
+                       [--size 128] [--columns 10] [--output build/sweeps/app-icon.png]
+       python sweep.py blue-microphone --list
+"""
+import argparse
+import inspect
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageDraw, ImageFont
+
+from generators import GENERATORS, ROLE_GENERATORS, load_generator, load_role_generator
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT_DIR = os.path.join(SCRIPT_DIR, 'build', 'sweeps')
+
+SHEET_BACKGROUND = (48, 48, 48, 255)
+LABEL_COLOR = (235, 235, 235, 255)
+CELL_PADDING = 6
+
+
+def design_parameters(name):
+    """Return the {knob: default} design parameters a generator accepts
+
+    The recolourable generators take their geometry knobs through **params,
+    so the parameters of their roles function are included.
+    """
+    functions = [load_generator(name)]
+    if name in ROLE_GENERATORS:
+        functions.append(load_role_generator(name)[0])
+    params = {}
+    for function in functions:
+        for parameter in inspect.signature(function).parameters.values():
+            if parameter.name not in ('size', 'region') and parameter.default is not parameter.empty:
+                params[parameter.name] = parameter.default
+    return params
+
+
+def parse_values(texts):
+    """Parse sweep values: start:stop:count ranges, JSON literals, or plain strings"""
+    values = []
+    for text in texts:
+        parts = text.split(':')
+        if len(parts) == 3 and not text.startswith(('[', '{', '"')):
+            start, stop, count = float(parts[0]), float(parts[1]), int(parts[2])
+            steps = [round(start + (stop - start) * i / max(count - 1, 1), 10) for i in range(count)]
+            if all(part.lstrip('-').isdigit() for part in parts[:2]) and all(step.is_integer() for step in steps):
+                steps = [int(step) for step in steps]
+            values.extend(steps)
+            continue
+        try:
+            values.append(json.loads(text))
+        except ValueError:
+            values.append(text)
+    return values
+
+
+def sweep_grid(swept):
+    """Return a params dict for every combination of {knob: [values]} in row-major order"""
+    names = list(swept)
+    return [dict(zip(names, combination)) for combination in itertools.product(*swept.values())]
+
+
+def _render_cell(job):
+    """Render one thumbnail inside a worker process"""
+    name, size, params = job
+    image = load_generator(name)(size, **params)
+    return image.mode, image.tobytes()
+
+
+def render_sweep(name, size, grid, workers=None):
+    """Render a thumbnail for every params dict in grid on a process pool
+
+    Returns (thumbnails in grid order, worker count).
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(grid)))
+    jobs = [(name, size, params) for params in grid]
+    # Hand out cells in chunks so hundreds of small renders are not dominated by pickling round trips
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        thumbnails = [
+            Image.frombytes(mode, (size, size), data)
+            for mode, data in pool.map(_render_cell, jobs, chunksize=chunksize)
+        ]
+    return thumbnails, workers
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return f'{value:.3g}'
+    if isinstance(value, (list, tuple)):
+        return '[' + ','.join(_format_value(item) for item in value) + ']'
+    return json.dumps(value) if isinstance(value, dict) else str(value)
+
+
+def cell_labels(grid):
+    """Return the label lines of every cell: its number and the swept knobs"""
+    return [
+        [f'#{index}'] + [f'{knob}={_format_value(value)}' for knob, value in params.items()]
+        for index, params in enumerate(grid)
+    ]
+
+
+def contact_sheet(thumbnails, labels, columns):
+    """Lay thumbnails out in a grid with their label lines below each one
+
+    Returns (sheet, [(left, top, right, bottom) box of every thumbnail]).
+    """
+    font = ImageFont.load_default()
+    measure = ImageDraw.Draw(Image.new('L', (1, 1)))
+    line_height = measure.textbbox((0, 0), 'Ag', font=font)[3] + 2
+    size = thumbnails[0].width
+    label_width = max(measure.textlength(line, font=font) for lines in labels for line in lines)
+    cell_width = max(size, int(label_width) + 1) + CELL_PADDING
+    cell_height = size + line_height * max(len(lines) for lines in labels) + CELL_PADDING * 2
+    rows = -(-len(thumbnails) // columns)
+
+    sheet = Image.new('RGBA', (columns * cell_width + CELL_PADDING, rows * cell_height + CELL_PADDING),
+                      SHEET_BACKGROUND)
+    draw = ImageDraw.Draw(sheet)
+    boxes = []
+    for index, (thumbnail, lines) in enumerate(zip(thumbnails, labels)):
+        row, column = divmod(index, columns)
+        left = CELL_PADDING + column * cell_width
+        top = CELL_PADDING + row * cell_height
+        sheet.alpha_composite(thumbnail.convert('RGBA'), (left, top))
+        boxes.append((left, top, left + size, top + size))
+        for number, line in enumerate(lines):
+            draw.text((left, top + size + CELL_PADDING // 2 + number * line_height), line, fill=LABEL_COLOR, font=font)
+    return sheet, boxes
+
+
+def write_sidecar(path, name, size, swept, defaults, grid, boxes, columns):
+    """Write the sheet's JSON sidecar: the sweep and every cell's box and parameters"""
+    cells = [
+        {
+            'index': index,
+            'row': index // columns,
+            'column': index % columns,
+            'box': list(box),
+            'params': params,
+        }
+        for index, (params, box) in enumerate(zip(grid, boxes))
+    ]
+    sidecar = {
+        'generator': name,
+        'size': size,
+        'columns': columns,
+        'swept': swept,
+        'defaults': {knob: value for knob, value in defaults.items() if knob not in swept},
+        'cells': cells,
+    }
+    with open(path, 'w') as f:
+        json.dump(sidecar, f, indent=2)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render a grid of design variants into a labelled contact sheet')
+    parser.add_argument('generator', choices=list(GENERATORS))
+    parser.add_argument('--param', nargs='+', action='append', default=[], metavar='NAME VALUE',
+                        help='Knob to sweep and its values: numbers, JSON, palette names or start:stop:count')
+    parser.add_argument('--size', type=int, default=128, help='Thumbnail size in pixels (default: 128)')
+    parser.add_argument('--columns', type=int, default=None, help='Cells per row (default: the last knob\'s value count)')
+    parser.add_argument('--output', default=None, help='Contact sheet path (default: build/sweeps/<generator>.png)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per core)')
+    parser.add_argument('--list', action='store_true', help='List the generator\'s knobs and defaults')
+    args = parser.parse_args()
+
+    defaults = design_parameters(args.generator)
+    if args.list:
+        for knob, value in defaults.items():
+            print(f"  {knob:<16} {_format_value(value)}")
+        return
+
+    swept = {}
+    for entry in args.param:
+        if len(entry) < 2:
+            parser.error(f"--param {entry[0]} needs at least one value")
+        knob, values = entry[0], parse_values(entry[1:])
+        if knob not in defaults:
+            parser.error(f"Unknown knob '{knob}' for {args.generator}, expected one of: {', '.join(defaults)}")
+        swept[knob] = values
+    if not swept:
+        parser.error('Pass at least one --param NAME VALUE ... to sweep (see --list)')
+
+    grid = sweep_grid(swept)
+    columns = args.columns or len(list(swept.values())[-1])
+    output = args.output or os.path.join(DEFAULT_OUTPUT_DIR, f'{args.generator}.png')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    print(f"Rendering {len(grid)} {args.generator} variants at {args.size}px...")
+    start = time.perf_counter()
+    thumbnails, workers = render_sweep(args.generator, args.size, grid, workers=args.workers)
+    render_seconds = time.perf_counter() - start
+    sheet, boxes = contact_sheet(thumbnails, cell_labels(grid), columns)
+    sheet.save(output, 'PNG')
+    sidecar = os.path.splitext(output)[0] + '.json'
+    write_sidecar(sidecar, args.generator, args.size, swept, defaults, grid, boxes, columns)
+    print(f"✓ Rendered {len(grid)} variants in {render_seconds:.2f}s on {workers} workers")
+    print(f"✓ Saved {output} and {sidecar} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
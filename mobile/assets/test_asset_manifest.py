@@ -0,0 +1,58 @@
+"""
+Freshness and invalidation of the incremental build manifest
+"""
+import pytest
+
+from asset_manifest import AssetManifest, build_inputs
+
+MODULE = 'generate_blue_microphone_logo'
+
+
+@pytest.fixture
+def built(tmp_path):
+    """A manifest with one recorded output, saved and loaded back"""
+    output = tmp_path / 'icon.png'
+    output.write_bytes(b'png')
+    inputs = build_inputs(MODULE, 512, {'palette': 'default'})
+    manifest = AssetManifest(str(tmp_path / 'manifest.json'))
+    manifest.record(str(output), inputs)
+    manifest.save()
+    return AssetManifest(str(tmp_path / 'manifest.json')), output, inputs
+
+
+def test_recorded_output_is_fresh(built):
+    manifest, output, inputs = built
+    assert manifest.is_fresh(str(output), inputs)
+
+
+def test_unrecorded_output_is_stale(built, tmp_path):
+    manifest, _, inputs = built
+    other = tmp_path / 'favicon.png'
+    other.write_bytes(b'png')
+    assert not manifest.is_fresh(str(other), inputs)
+
+
+@pytest.mark.parametrize('change', [
+    {'size': 1024},
+    {'params': {'palette': 'dark'}},
+    {'source': 'edited'},
+    {'input': 'new source image'},
+])
+def test_changed_inputs_are_stale(built, change):
+    manifest, output, inputs = built
+    assert not manifest.is_fresh(str(output), dict(inputs, **change))
+
+
+def test_modified_or_deleted_output_is_stale(built):
+    manifest, output, inputs = built
+    output.write_bytes(b'edited by hand')
+    assert not manifest.is_fresh(str(output), inputs)
+    output.unlink()
+    assert not manifest.is_fresh(str(output), inputs)
+
+
+def test_inputs_hash_the_generator_and_its_local_imports():
+    inputs = build_inputs(MODULE, (64, 32), input_path=None)
+    assert inputs['size'] == [64, 32]
+    assert inputs['source'] == build_inputs(MODULE, 1)['source']
+    assert inputs['source'] != build_inputs('generate_icon', 1)['source']
@@ -0,0 +1,113 @@
+"""
+The vectorized gradients against the per-pixel putpixel loops they replaced
+Each reference below is the loop the generators used before gradients.py, run
+at a small size. Both backends must match it within one level per channel.
+"""
+import math
+
+import pytest
+from PIL import Image, ImageChops
+
+import backend
+
+SIZE = 96
+
+
+@pytest.fixture(params=backend.available_backends())
+def engine(request):
+    yield backend.use_backend(request.param)
+    backend.use_backend()
+
+
+def reference(pixel):
+    """Render pixel(x, y) -> RGBA or None with putpixel, like the original generators"""
+    img = Image.new('RGBA', (SIZE, SIZE), (0, 0, 0, 0))
+    for y in range(SIZE):
+        for x in range(SIZE):
+            color = pixel(x, y)
+            if color is not None:
+                img.putpixel((x, y), color)
+    return img
+
+
+def max_difference(a, b):
+    return max(high for _, high in ImageChops.difference(a, b).getextrema())
+
+
+def test_diagonal_gradient_matches_app_icon_loop(engine):
+    primary, secondary = (99, 102, 241), (168, 85, 247)
+
+    def pixel(x, y):
+        ratio = (x + y) / (SIZE * 2)
+        return tuple(int(primary[c] * (1 - ratio) + secondary[c] * ratio) for c in range(3)) + (255,)
+
+    result = engine.linear_gradient((SIZE, SIZE), primary, secondary, (1, 1), None, False)
+    assert max_difference(result, reference(pixel)) <= 1
+
+
+def test_multi_stop_gradient_matches_microphone_loop(engine):
+    third = SIZE // 3
+
+    def pixel(x, y):
+        if y < third:
+            ratio = y / third
+            return int(255 * (1 - ratio * 0.3)), 0, int(255 * (1 - ratio * 0.2)), 255
+        if y < 2 * SIZE // 3:
+            ratio = (y - third) / third
+            return int(128 + (64 - 128) * ratio), 0, int(128 + (255 - 128) * ratio), 255
+        ratio = (y - 2 * SIZE // 3) / third
+        return int(64 * (1 - ratio)), int(255 * ratio), 255, 255
+
+    bands = [
+        (0, third, (255, 0, 255), (255 * 0.7, 0, 255 * 0.8)),
+        (third, 2 * third, (128, 0, 128), (64, 0, 255)),
+        (2 * SIZE // 3, 2 * SIZE // 3 + third, (64, 0, 255), (0, 255, 255)),
+    ]
+    result = engine.multi_stop_gradient((SIZE, SIZE), bands, None, False)
+    assert max_difference(result, reference(pixel)) <= 1
+
+
+def test_angular_gradient_and_highlight_match_blue_microphone_loop(engine):
+    center = SIZE // 2
+    radius = SIZE // 5
+    sky_blue, royal_blue = (135, 206, 250), (65, 105, 225)
+
+    def base(x, y):
+        angle = math.atan2(y - center, x - center)
+        factor = (math.cos(angle - math.pi / 4) + 1) / 2
+        return tuple(int(sky_blue[c] + (royal_blue[c] - sky_blue[c]) * factor) for c in range(3)) + (255,)
+
+    def highlight(x, y):
+        dist = ((x - center) ** 2 + (y - center) ** 2) ** 0.5
+        angle = math.atan2(y - center, x - center)
+        if radius * 0.85 < dist <= radius and -math.pi / 2 < angle < 0:
+            level = int(30 * (dist - radius * 0.85) / (radius * 0.15))
+            return level, level, level, 0
+        return 0, 0, 0, 0
+
+    angular = engine.angular_gradient((SIZE, SIZE), (center, center), sky_blue, royal_blue, math.pi / 4, None, False)
+    assert max_difference(angular, reference(base)) <= 1
+
+    ring = engine.radial_gradient((SIZE, SIZE), (center, center), radius * 0.85, radius,
+                                  (0, 0, 0, 0), (30, 30, 30, 0), (-math.pi / 2, 0), (0, 0, 0, 0), None, False)
+    assert max_difference(ring, reference(highlight)) <= 1
+
+
+def test_circle_mask_covers_the_putpixel_disc(engine):
+    center = SIZE // 2
+    radius = SIZE // 2 - 10
+    mask = engine.circle_mask((SIZE, SIZE), (center, center), radius, None)
+    for y in range(SIZE):
+        for x in range(SIZE):
+            dist = ((x - center) ** 2 + (y - center) ** 2) ** 0.5
+            # Only the one-pixel anti-aliased rim may differ from the hard-edged disc
+            if dist <= radius - 0.5:
+                assert mask.getpixel((x, y)) == 255
+            elif dist >= radius + 0.5:
+                assert mask.getpixel((x, y)) == 0
+
+
+def test_regions_tile_the_full_gradient(engine):
+    full = engine.angular_gradient((SIZE, SIZE), (40, 50), (0, 0, 0), (255, 255, 255), 1.0, None, False)
+    tile = engine.angular_gradient((SIZE, SIZE), (40, 50), (0, 0, 0), (255, 255, 255), 1.0, (32, 16, 80, 64), False)
+    assert ImageChops.difference(tile, full.crop((32, 16, 80, 64))).getbbox() is None
@@ -0,0 +1,77 @@
+"""
+Request validation of the icon service: cache keys and knob checks
+"""
+import json
+
+import pytest
+
+from icon_server import MAX_KNOB_ITEMS, MAX_SIZE, MIN_SIZE, IconService, check_knob
+
+
+@pytest.fixture(scope='module')
+def service():
+    # The worker pool only starts processes on the first render, which these tests never request
+    service = IconService(workers=1)
+    yield service
+    service.close()
+
+
+def test_defaults_share_the_shipped_icon_key(service):
+    name, size, knobs = service.cache_key('app-icon', 192, {})
+    assert (name, size, json.loads(knobs)) == ('app-icon', 192, {})
+    defaults = service.defaults['app-icon']
+    assert service.cache_key('app-icon', 192, {'wave_count': defaults['wave_count']}) == (name, size, knobs)
+    assert service.cache_key('app-icon', 192, {'badge': 0}) == (name, size, knobs)
+
+
+def test_changed_knobs_are_part_of_the_key(service):
+    _, _, knobs = service.cache_key('app-icon', 192, {'mode': 'shopping', 'badge': 3})
+    assert json.loads(knobs) == {'badge': 3, 'mode': 'shopping'}
+    assert service.cache_key('blue-microphone', 64, {'palette': 'dark'}) != service.cache_key('blue-microphone', 64, {})
+
+
+def test_null_background_is_accepted(service):
+    _, _, knobs = service.cache_key('ai-microphone', 128, {'background': None})
+    assert json.loads(knobs) == {'background': None}
+
+
+@pytest.mark.parametrize('name, size, params', [
+    ('no-such-logo', 64, {}),
+    ('app-icon', MIN_SIZE - 1, {}),
+    ('app-icon', MAX_SIZE + 1, {}),
+    ('app-icon', 64, {'no_such_knob': 1}),
+    ('app-icon', 64, {'mode': 'no-such-mode'}),
+    ('app-icon', 64, {'badge': -1}),
+    ('app-icon', 64, {'badge': True}),
+    ('app-icon', 64, {'wave_count': 1000}),
+    ('app-icon', 64, {'wave_count': 2.5}),
+    ('blue-microphone', 64, {'palette': 'no-such-palette'}),
+    ('blue-microphone', 64, {'circle_scale': 'large'}),
+    ('microphone', 64, {'wave_heights': [0.5] * (MAX_KNOB_ITEMS + 1)}),
+    ('ai-microphone', 64, {'background': [0, 0]}),
+    ('ai-microphone', 64, {'background': [0, 0, 256]}),
+])
+def test_invalid_requests_are_rejected(service, name, size, params):
+    with pytest.raises(ValueError):
+        service.cache_key(name, size, params)
+
+
+def test_check_knob():
+    check_knob('wave_count', 3, 3)
+    check_knob('circle_scale', 0.3, 0.2)
+    check_knob('wave_spacing', 1, 0.4)
+    check_knob('wave_heights', [0.2, 0.4], [1 / 3, 2 / 3, 1 / 3])
+    check_knob('background', [255, 255, 255], [0, 0, 0])
+    check_knob('background', None, [0, 0, 0])
+    check_knob('palette', 'dark', 'default', choices=['default', 'dark'])
+    for knob, value, default in [
+        ('wave_count', True, 3),
+        ('wave_count', 13, 3),
+        ('circle_scale', 0.9, 0.2),
+        ('wave_heights', [], [1 / 3]),
+        ('wave_heights', [2], [1 / 3]),
+        ('background', [0, 0, 0, 0], [0, 0, 0]),
+        ('mode', 7, 'default'),
+    ]:
+        with pytest.raises(ValueError):
+            check_knob(knob, value, default)
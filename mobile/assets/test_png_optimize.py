@@ -0,0 +1,57 @@
+"""
+Shipped asset sizes and the PNG optimization stage
+"""
+import os
+
+import pytest
+from PIL import Image, ImageChops
+
+from generators import TARGETS, load_generator
+from png_optimize import (DEFAULT_BUDGETS, PALETTE_MAX_ERROR, optimize_images, palette_candidates, print_report,
+                          reduce_mode)
+
+ASSETS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.mark.parametrize('name', sorted(DEFAULT_BUDGETS))
+def test_committed_asset_is_within_budget(name):
+    assert os.path.getsize(os.path.join(ASSETS_DIR, name)) <= DEFAULT_BUDGETS[name]
+
+
+def test_built_targets_are_within_budget(tmp_path):
+    targets = [
+        (str(tmp_path / name), load_generator(generator)(size)) for name, (generator, size) in TARGETS.items()
+    ]
+    results = optimize_images(targets, quantize_max_size=64)
+    for result in results:
+        assert not result['over_budget'], f"{result['path']} is {result['after']:,} bytes"
+        assert result['after'] == os.path.getsize(result['path'])
+
+
+def test_exact_palette_is_lossless():
+    image = Image.new('RGBA', (32, 32), (10, 20, 30, 255))
+    image.paste((200, 100, 50, 128), (8, 8, 24, 24))
+    reduced = reduce_mode(image)
+    assert reduced.mode == 'P'
+    assert ImageChops.difference(reduced.convert('RGBA'), image).getbbox() is None
+
+
+def test_palette_candidates_stay_within_the_error_bound():
+    image = load_generator('blue-microphone')(128).convert('RGB')
+    candidates = palette_candidates(image)
+    assert candidates
+    for candidate in candidates:
+        extrema = ImageChops.difference(candidate.convert('RGB'), image).getextrema()
+        assert max(high for _, high in extrema) <= PALETTE_MAX_ERROR
+
+
+def _result(after, committed, budget=None):
+    return {'path': 'icon.png', 'before': after, 'after': after, 'saved': 0, 'budget': budget,
+            'over_budget': budget is not None and after > budget, 'committed': committed}
+
+
+def test_report_fails_on_budget_overrun_and_growth(capsys):
+    assert print_report([_result(1000, 1000), _result(1050, 1000), _result(1000, None)])
+    assert not print_report([_result(2000, None, budget=1024)])
+    assert not print_report([_result(1200, 1000)])
+    assert '⚠' in capsys.readouterr().out
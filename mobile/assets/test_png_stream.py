@@ -0,0 +1,55 @@
+"""
+PngStreamWriter round trips
+"""
+import pytest
+from PIL import Image, ImageChops
+
+from png_stream import PngStreamWriter
+
+
+def _noise(mode, size):
+    image = Image.effect_noise(size, 64).convert('L')
+    return Image.merge(mode, [image.rotate(90 * band) for band in range(len(mode))])
+
+
+@pytest.mark.parametrize('mode', ['RGB', 'RGBA'])
+@pytest.mark.parametrize('band_height', [1, 7, 64])
+def test_round_trip(tmp_path, mode, band_height):
+    image = _noise(mode, (64, 64))
+    path = tmp_path / 'stream.png'
+    with PngStreamWriter(str(path), image.size, mode=mode) as png:
+        for top in range(0, image.height, band_height):
+            png.write_rows(image.crop((0, top, image.width, min(top + band_height, image.height))))
+    with Image.open(path) as decoded:
+        assert decoded.mode == mode
+        assert ImageChops.difference(decoded, image).getbbox() is None
+
+
+def test_bands_are_converted_to_the_writer_mode(tmp_path):
+    image = _noise('RGB', (32, 16))
+    path = tmp_path / 'stream.png'
+    with PngStreamWriter(str(path), image.size, mode='RGBA') as png:
+        png.write_rows(image)
+    with Image.open(path) as decoded:
+        assert ImageChops.difference(decoded, image.convert('RGBA')).getbbox() is None
+
+
+def test_missing_rows_fail_on_close(tmp_path):
+    png = PngStreamWriter(str(tmp_path / 'short.png'), (8, 8), mode='RGB')
+    png.write_rows(Image.new('RGB', (8, 4)))
+    with pytest.raises(ValueError):
+        png.close()
+
+
+def test_wrong_width_and_extra_rows_are_rejected(tmp_path):
+    with PngStreamWriter(str(tmp_path / 'bad.png'), (8, 4), mode='RGB') as png:
+        with pytest.raises(ValueError):
+            png.write_rows(Image.new('RGB', (9, 1)))
+        with pytest.raises(ValueError):
+            png.write_rows(Image.new('RGB', (8, 5)))
+        png.write_rows(Image.new('RGB', (8, 4)))
+
+
+def test_unsupported_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        PngStreamWriter(str(tmp_path / 'bad.png'), (8, 8), mode='P')
@@ -0,0 +1,38 @@
+"""
+Tiled renders against a full render of the same canvas
+"""
+import pytest
+from PIL import Image, ImageChops
+
+from generators import load_generator
+from tiled_render import TILED_GENERATORS, render_tiled, render_tiled_image, tile_regions
+
+SIZE = 200
+
+
+def test_tile_regions_cover_the_canvas_once():
+    regions = tile_regions(SIZE, 64)
+    assert sum((right - left) * (bottom - top) for left, top, right, bottom in regions) == SIZE * SIZE
+    assert regions[-1] == (192, 192, SIZE, SIZE)
+
+
+@pytest.mark.parametrize('name', TILED_GENERATORS)
+@pytest.mark.parametrize('workers', [1, 3])
+def test_tiled_render_equals_full_render(name, workers):
+    full = load_generator(name)(SIZE)
+    tiled = render_tiled_image(name, SIZE, tile_size=64, workers=workers)
+    assert tiled.size == full.size
+    assert ImageChops.difference(tiled, full).getbbox() is None
+
+
+def test_streamed_tiled_png_equals_full_render(tmp_path):
+    path = tmp_path / 'tiled.png'
+    render_tiled('blue-microphone', SIZE, str(path), tile_size=64, workers=2)
+    full = load_generator('blue-microphone')(SIZE)
+    with Image.open(path) as png:
+        assert ImageChops.difference(png.convert(full.mode), full).getbbox() is None
+
+
+def test_untiled_generator_is_rejected():
+    with pytest.raises(ValueError):
+        render_tiled_image('microphone', SIZE)
@@ -1,40 +1,283 @@
 #!/usr/bin/env python3
 """
 Script to update app icons from a source image.
-Usage: python update_icon.py <source_image_path>
+Usage: python update_icon.py <source_image_path> [--incremental]
+       python update_icon.py <source_image_path> --platform-set [--output-dir DIR]
+Add --trim to crop transparent borders of the source first.
 """
 
+import argparse
+import json
 import sys
-from PIL import Image
+from PIL import Image, ImageChops
 import os
 
-def resize_image(input_path, output_path, size):
-    """Resize image to specified size while maintaining aspect ratio."""
+from asset_manifest import AssetManifest, build_inputs
+from memory_usage import peak_rss_mb
+from png_optimize import optimize_images
+from backend import circle_mask
+
+# Modes Image.reduce() handles directly; anything else is converted before reducing
+REDUCIBLE_MODES = ('RGB', 'RGBA', 'L', 'LA')
+
+# Designer exports reach 12k px, which trips Pillow's decompression bomb check;
+# load_source allows up to this many pixels while it opens a source
+MAX_SOURCE_PIXELS = 16384 * 16384
+
+# Rows (in output pixels) reduced per band, so reduce() never copies the whole source
+REDUCE_BAND_ROWS = 256
+
+def trim_transparent(img):
+    """Crop fully transparent borders and re-center the content on a square canvas."""
+    bbox = img.getchannel('A').getbbox()
+    if bbox is None or bbox == (0, 0) + img.size:
+        return img
+    content = img.crop(bbox)
+    side = max(content.size)
+    square = Image.new('RGBA', (side, side), (0, 0, 0, 0))
+    square.paste(content, ((side - content.width) // 2, (side - content.height) // 2))
+    return square
+
+def reducible_mode(img):
+    """Return the mode img is reduced in: its own, or RGB/RGBA for palette, CMYK and other modes."""
+    if img.mode in REDUCIBLE_MODES:
+        return img.mode
+    if 'A' in img.getbands() or 'transparency' in img.info:
+        return 'RGBA'
+    return 'RGB'
+
+def reduce_in_bands(img, factor, box=None):
+    """Box-reduce img, or the (left, top, right, bottom) box of it, by factor one horizontal band at a time.
+    
+    Bands of other modes are converted to reducible_mode() one at a time, and
+    the last row and column of boxes cover whatever pixels remain.
+    """
+    mode = reducible_mode(img)
+    left, top, right, bottom = box or (0, 0) + img.size
+    width, height = -(-(right - left) // factor), -(-(bottom - top) // factor)
+    reduced = Image.new(mode, (width, height))
+    for row in range(0, height, REDUCE_BAND_ROWS):
+        end = min(row + REDUCE_BAND_ROWS, height)
+        band = img.crop((left, top + row * factor, right, min(top + end * factor, bottom)))
+        if band.mode != mode:
+            band = band.convert(mode)
+        reduced.paste(band.reduce(factor), (0, row))
+    return reduced
+
+def alpha_bbox(img):
+    """Return the bounding box of img's non-transparent pixels, or None if it has no alpha."""
+    if 'A' in img.getbands():
+        return img.getchannel('A').getbbox()
+    if 'transparency' in img.info:
+        return img.convert('RGBA').getchannel('A').getbbox()
+    return None
+
+def open_source(input_path):
+    """Open a source image, allowing exports up to MAX_SOURCE_PIXELS for this call only."""
+    limit = Image.MAX_IMAGE_PIXELS
+    if limit is not None:
+        Image.MAX_IMAGE_PIXELS = max(limit, MAX_SOURCE_PIXELS)
+    try:
+        return Image.open(input_path)
+    finally:
+        Image.MAX_IMAGE_PIXELS = limit
+
+def load_source(input_path, max_size, trim=False):
+    """Decode a source image at the lowest resolution that still covers max_size.
+    
+    JPEGs are decoded at reduced scale (draft mode). Pillow has no reduced
+    decode for PNG and other formats, so those sources are decoded in full
+    (an 8k RGBA PNG takes 256MB) and box reduced straight away; the RGBA
+    conversion happens only once the image is small. With trim, the
+    transparent border is found on the alpha band first and only the content
+    is reduced, by a factor chosen from its own size.
+    """
+    img = open_source(input_path)
+    # Keep at least 2x the largest target so the final LANCZOS step has detail to work with
+    keep = (max_size[0] * 2, max_size[1] * 2)
+    if img.format == 'JPEG':
+        img.draft('RGB', keep)
+    box = (0, 0) + img.size
+    width, height = img.size
+    if trim:
+        box = alpha_bbox(img) or box
+        # Trimmed content is re-centered on a square canvas as wide as its longest side
+        width = height = max(box[2] - box[0], box[3] - box[1])
+    factor = min(width // keep[0], height // keep[1])
+    if factor >= 2:
+        img = reduce_in_bands(img, factor, box)
+    elif box != (0, 0) + img.size:
+        img = img.crop(box)
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+    if trim:
+        img = trim_transparent(img)
+    return img
+
+def save_icon(img, output_path, size):
+    """Resize an already decoded image to size and save it as an optimized PNG."""
     try:
-        img = Image.open(input_path)
-        # Convert to RGBA if needed
-        if img.mode != 'RGBA':
-            img = img.convert('RGBA')
-        
         # Resize with high-quality resampling
-        img_resized = img.resize(size, Image.Resampling.LANCZOS)
-        img_resized.save(output_path, 'PNG', optimize=True)
+        img_resized = img.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        optimize_images([(output_path, img_resized)], budgets={}, quantize_max_size=64)
         print(f"✓ Created {output_path} ({size[0]}x{size[1]}px)")
         return True
     except Exception as e:
         print(f"✗ Error creating {output_path}: {e}")
         return False
 
+def resize_image(input_path, output_path, size, trim=False):
+    """Resize image to specified size while maintaining aspect ratio."""
+    try:
+        img = load_source(input_path, size, trim=trim)
+    except Exception as e:
+        print(f"✗ Error creating {output_path}: {e}")
+        return False
+    return save_icon(img, output_path, size)
+
+# iOS AppIcon.appiconset entries: (idiom, size in points, scale)
+IOS_ICONS = [
+    ('iphone', 20, 2), ('iphone', 20, 3),
+    ('iphone', 29, 2), ('iphone', 29, 3),
+    ('iphone', 40, 2), ('iphone', 40, 3),
+    ('iphone', 60, 2), ('iphone', 60, 3),
+    ('ipad', 20, 1), ('ipad', 20, 2),
+    ('ipad', 29, 1), ('ipad', 29, 2),
+    ('ipad', 40, 1), ('ipad', 40, 2),
+    ('ipad', 76, 1), ('ipad', 76, 2),
+    ('ipad', 83.5, 2),
+    ('ios-marketing', 1024, 1),
+]
+
+# iOS rejects app icons with an alpha channel (App Store Connect fails the 1024px
+# marketing icon), so the iOS set is flattened onto this colour
+IOS_BACKGROUND = (255, 255, 255)
+
+# Android launcher icon size per mipmap density
+ANDROID_DENSITIES = {
+    'mdpi': 48,
+    'hdpi': 72,
+    'xhdpi': 96,
+    'xxhdpi': 144,
+    'xxxhdpi': 192,
+}
+
+WEB_ICONS = {
+    'favicon-16x16.png': 16,
+    'favicon-32x32.png': 32,
+    'favicon.png': 48,
+    'apple-touch-icon.png': 180,
+    'android-chrome-192x192.png': 192,
+    'android-chrome-512x512.png': 512,
+}
+
+def build_pyramid(img, min_size=32):
+    """Build successive 2x box reductions of an image, largest first."""
+    pyramid = [img]
+    while min(pyramid[-1].size) // 2 >= min_size:
+        pyramid.append(pyramid[-1].reduce(2))
+    return pyramid
+
+def resize_from_pyramid(pyramid, size):
+    """Resize with one LANCZOS step from the smallest level at least twice the target."""
+    base = pyramid[0]
+    for level in pyramid:
+        if level.width >= 2 * size[0] and level.height >= 2 * size[1]:
+            base = level
+    return base.resize(size, Image.Resampling.LANCZOS)
+
+def flatten(img, background):
+    """Composite an RGBA image onto an opaque background colour and return it as RGB."""
+    flat = Image.new('RGB', img.size, background)
+    flat.paste(img, mask=img.getchannel('A'))
+    return flat
+
+def write_platform_set(source_path, output_dir, trim=False, ios_background=IOS_BACKGROUND):
+    """Decode the source once and write iOS, Android and web icon sets from its pyramid.
+    
+    The iOS icons are flattened onto ios_background; the others keep their alpha.
+    """
+    pyramid = build_pyramid(load_source(source_path, (1024, 1024), trim=trim))
+    resized = {}
+    pngs = {}
+    
+    def save(size, path, round_mask=False, background=None):
+        if path in pngs:
+            return
+        if size not in resized:
+            resized[size] = resize_from_pyramid(pyramid, (size, size))
+        icon = resized[size]
+        if background is not None:
+            icon = flatten(icon, background)
+        if round_mask:
+            mask = circle_mask((size, size), ((size - 1) / 2, (size - 1) / 2), size / 2)
+            icon = icon.copy()
+            icon.putalpha(ImageChops.multiply(icon.getchannel('A'), mask))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        pngs[path] = icon
+    
+    # iOS asset catalog
+    iconset_dir = os.path.join(output_dir, 'ios', 'AppIcon.appiconset')
+    images = []
+    for idiom, points, scale in IOS_ICONS:
+        points_label = f'{points:g}x{points:g}'
+        filename = f'Icon-{points:g}@{scale}x.png'
+        if idiom == 'ios-marketing':
+            filename = 'Icon-1024.png'
+        save(round(points * scale), os.path.join(iconset_dir, filename), background=ios_background)
+        images.append({
+            'filename': filename,
+            'idiom': idiom,
+            'scale': f'{scale}x',
+            'size': points_label,
+        })
+    with open(os.path.join(iconset_dir, 'Contents.json'), 'w') as f:
+        json.dump({'images': images, 'info': {'version': 1, 'author': 'xcode'}}, f, indent=2)
+        f.write('\n')
+    
+    # Android launcher icons
+    for density, size in ANDROID_DENSITIES.items():
+        mipmap_dir = os.path.join(output_dir, 'android', f'mipmap-{density}')
+        save(size, os.path.join(mipmap_dir, 'ic_launcher.png'))
+        save(size, os.path.join(mipmap_dir, 'ic_launcher_round.png'), round_mask=True)
+    save(512, os.path.join(output_dir, 'android', 'playstore-icon.png'))
+    
+    # Web favicons
+    web_dir = os.path.join(output_dir, 'web')
+    for filename, size in WEB_ICONS.items():
+        save(size, os.path.join(web_dir, filename))
+    ico_path = os.path.join(web_dir, 'favicon.ico')
+    resized[48].save(ico_path, sizes=[(16, 16), (32, 32), (48, 48)],
+                     append_images=[resized[16], resized[32]])
+    
+    # Encode every PNG on a thread pool, keeping the smallest encoding of each
+    optimize_images(pngs.items(), budgets={}, quantize_max_size=64)
+    return list(pngs) + [os.path.join(iconset_dir, 'Contents.json'), ico_path]
+
+def print_peak_memory():
+    peak = peak_rss_mb()
+    if peak is not None:
+        print(f"Peak memory: {peak:.0f}MB")
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python update_icon.py <source_image_path>")
-        print("\nThis script will create:")
-        print("  - icon.png (1024x1024px)")
-        print("  - adaptive-icon.png (1024x1024px)")
-        print("  - favicon.png (48x48px)")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        usage='python update_icon.py <source_image_path> [--incremental | --platform-set [--output-dir DIR]]',
+        description='Update app icons from a source image.',
+        epilog='This script will create: icon.png (1024x1024px), '
+               'adaptive-icon.png (1024x1024px), favicon.png (48x48px)'
+    )
+    parser.add_argument('source_path', help='Source image to resize')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Skip icons whose source image and output are unchanged since the last build')
+    parser.add_argument('--platform-set', action='store_true',
+                        help='Write complete iOS, Android and web icon sets from one decode of the source')
+    parser.add_argument('--output-dir', default=None,
+                        help='Directory for --platform-set output (default: build/icons)')
+    parser.add_argument('--trim', action='store_true',
+                        help='Crop transparent borders of the source before resizing')
+    args = parser.parse_args()
     
-    source_path = sys.argv[1]
+    source_path = args.source_path
     
     if not os.path.exists(source_path):
         print(f"Error: Source image not found: {source_path}")
@@ -42,20 +285,47 @@ def main():
     
     script_dir = os.path.dirname(os.path.abspath(__file__))
     
+    if args.platform_set:
+        output_dir = args.output_dir or os.path.join(script_dir, 'build', 'icons')
+        print(f"Processing {source_path}...")
+        written = write_platform_set(source_path, output_dir, trim=args.trim)
+        print(f"✓ Created {len(written)} files in {output_dir}")
+        print("  - ios/AppIcon.appiconset (with Contents.json)")
+        print("  - android/mipmap-*dpi launcher icons")
+        print("  - web favicons")
+        print_peak_memory()
+        return
+    
+    manifest = AssetManifest() if args.incremental else None
+    
+    targets = [
+        ('icon.png', (1024, 1024)),           # Main icon
+        ('adaptive-icon.png', (1024, 1024)),  # Adaptive icon
+        ('favicon.png', (48, 48)),            # Favicon
+    ]
+    
     # Create icons
     print(f"Processing {source_path}...")
     print()
     
-    # Main icon (1024x1024)
-    resize_image(source_path, os.path.join(script_dir, 'icon.png'), (1024, 1024))
-    
-    # Adaptive icon (1024x1024)
-    resize_image(source_path, os.path.join(script_dir, 'adaptive-icon.png'), (1024, 1024))
+    # Decode the source once, and only if some icon actually needs rebuilding
+    img = None
+    for filename, size in targets:
+        output_path = os.path.join(script_dir, filename)
+        inputs = build_inputs('update_icon', size, {'trim': args.trim}, input_path=source_path)
+        if manifest is not None and manifest.is_fresh(output_path, inputs):
+            print(f"✓ {output_path} is up to date")
+            continue
+        if img is None:
+            img = load_source(source_path, (1024, 1024), trim=args.trim)
+        if save_icon(img, output_path, size) and manifest is not None:
+            manifest.record(output_path, inputs)
     
-    # Favicon (48x48)
-    resize_image(source_path, os.path.join(script_dir, 'favicon.png'), (48, 48))
+    if manifest is not None:
+        manifest.save()
     
     print()
+    print_peak_memory()
     print("✓ All icons created successfully!")
     print("\nNext steps:")
     print("1. Restart your Expo development server")
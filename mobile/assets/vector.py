@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+Resolution-independent capture of the logo geometry, exported as SVG
+While a record() block is active, the canvas layers and role maps the
+generators draw into also log every shape, dot stamp, text run and gradient
+fill as a primitive in full-canvas units, next to the raster work they do
+anyway. The recorded Drawing is written out as an SVG whose viewBox is the
+canvas, so one file serves every display density. Outside record() nothing
+is logged and the raster outputs are unchanged.
+SVG has no angular gradient, so those are drawn as ANGULAR_WEDGES flat
+wedges, and gradients mixed in linear light get extra stops per segment.
+Usage: python vector.py                      # frontend/public/favicon.svg
+       python vector.py app-icon microphone [--palette dark] [--output-dir build/vector]
+"""
+import argparse
+import math
+import os
+import time
+from contextlib import contextmanager
+from xml.sax.saxutils import escape
+
+import backend
+from backend_pillow import color_mixer
+from generators import GENERATORS, ROLE_GENERATORS, load_generator, load_role_generator
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT_DIR = os.path.join(SCRIPT_DIR, 'build', 'vector')
+WEB_OUTPUT_DIR = os.path.join(SCRIPT_DIR, '..', '..', 'frontend', 'public')
+
+# Web frontend files and the generator each one is exported from
+WEB_TARGETS = {
+    'favicon.svg': 'blue-microphone',
+}
+
+# Canvas size the geometry is recorded at; it only sets the viewBox units
+REFERENCE_SIZE = 1024
+
+# Flat wedges an angular gradient is approximated with
+ANGULAR_WEDGES = 90
+
+# Stops per segment for gradients mixed in linear light, since SVG mixes in sRGB
+LINEAR_STOPS = 16
+
+FONT_FAMILY = 'Helvetica, Arial, sans-serif'
+
+
+class LinearGradient:
+    """Gradient along direction (dx, dy) across the canvas; see gradients.linear_gradient"""
+
+    def __init__(self, direction=(1, 1)):
+        self.direction = direction
+
+    def render(self, size, start_color, end_color, region=None, linear=False):
+        return backend.linear_gradient((size, size), start_color, end_color, self.direction, region, linear)
+
+
+class AngularGradient:
+    """Gradient following the angle around center; see gradients.angular_gradient"""
+
+    def __init__(self, center, phase=0.0):
+        self.center = center
+        self.phase = phase
+
+    def render(self, size, start_color, end_color, region=None, linear=False):
+        return backend.angular_gradient((size, size), self.center, start_color, end_color, self.phase, region, linear)
+
+
+class RadialGradient:
+    """Ring gradient between two radii, transparent outside it; see gradients.radial_gradient"""
+
+    def __init__(self, center, inner_radius, outer_radius, angle_range=None):
+        self.center = center
+        self.inner_radius = inner_radius
+        self.outer_radius = outer_radius
+        self.angle_range = angle_range
+
+    def render(self, size, start_color, end_color, region=None, linear=False):
+        return backend.radial_gradient((size, size), self.center, self.inner_radius, self.outer_radius,
+                                       start_color, end_color, self.angle_range, region=region, linear=linear)
+
+
+class Circle:
+    """Anti-aliased circle used to clip a fill; see gradients.circle_mask"""
+
+    def __init__(self, center, radius):
+        self.center = center
+        self.radius = radius
+
+    def mask(self, size, region=None):
+        return backend.circle_mask((size, size), self.center, self.radius, region)
+
+
+class Fill:
+    """A flat colour or gradient filling the canvas, or the clip shape within it
+
+    paint is a colour or (position, colour) stops; role names the palette
+    entry that supplies it instead. blend is 'over' or 'add'.
+    """
+
+    def __init__(self, gradient=None, paint=None, clip=None, role=None, linear=False, blend='over'):
+        self.gradient = gradient
+        self.paint = paint
+        self.clip = clip
+        self.role = role
+        self.linear = linear
+        self.blend = blend
+
+
+class Shapes:
+    """A layer of shapes, all in one flat colour (mask layers) or each in its own"""
+
+    def __init__(self, color=None, role=None):
+        self.color = color
+        self.role = role
+        self.items = []
+
+    def add(self, shape, xy, **params):
+        """Log one shape with RegionDraw's arguments in full-canvas coordinates"""
+        self.items.append((shape, xy, params))
+
+
+class Drawing:
+    """Recorded layers of one render, bottom first, in size x size canvas units"""
+
+    def __init__(self, size):
+        self.size = size
+        self.layers = []
+
+
+_drawing = None
+
+
+@contextmanager
+def record(size):
+    """Log the geometry drawn in the block into a Drawing of a size x size canvas"""
+    global _drawing
+    previous, _drawing = _drawing, Drawing(size)
+    try:
+        yield _drawing
+    finally:
+        _drawing = previous
+
+
+def add_fill(**params):
+    """Log a Fill (see Fill) if a recording is active"""
+    if _drawing is not None:
+        _drawing.layers.append(Fill(**params))
+
+
+def add_shapes(color=None, role=None):
+    """Start a Shapes layer if a recording is active and return it, otherwise None"""
+    if _drawing is None:
+        return None
+    layer = Shapes(color, role)
+    _drawing.layers.append(layer)
+    return layer
+
+
+def gradient_segments(paint):
+    """Return a colour or (position, colour) stops as (start, end, first, last) segments
+
+    Stops may share a position to make a hard edge; from that position on the
+    later stop's segment applies.
+    """
+    if paint and isinstance(paint[0], (tuple, list)) and isinstance(paint[0][1], (tuple, list)):
+        stops = [(position, tuple(color)) for position, color in paint]
+    else:
+        stops = [(0, tuple(paint))]
+    segments = [(start, end, first, last) for (start, first), (end, last) in zip(stops, stops[1:]) if end > start]
+    return segments or [(0, 1, stops[-1][1], stops[-1][1])]
+
+
+def ramp_colors(paint, positions, linear=False):
+    """Return the [r, g, b, a] colour of a palette entry at every position in 0..1"""
+    segments = gradient_segments(paint)
+    mixers = [color_mixer(first, last, linear) for _, _, first, last in segments]
+    colors = []
+    for position in positions:
+        current = 0
+        for number, (start, _, _, _) in enumerate(segments):
+            if start <= position:
+                current = number
+        start, end = segments[current][:2]
+        colors.append(mixers[current](min(max((position - start) / (end - start), 0), 1)))
+    return colors
+
+
+def _number(value):
+    return f'{value:.2f}'.rstrip('0').rstrip('.')
+
+
+def _hex(color):
+    return '#' + ''.join(f'{int(channel):02x}' for channel in color[:3])
+
+
+def _alpha(color):
+    return color[3] if len(color) > 3 else 255
+
+
+def _element(tag, attributes, content=None):
+    """Return an SVG element; content is markup placed inside it"""
+    parts = ''.join(f' {key}="{_number(value) if isinstance(value, float) else value}"'
+                    for key, value in attributes.items() if value is not None)
+    if content is None:
+        return f'<{tag}{parts}/>'
+    return f'<{tag}{parts}>{content}</{tag}>'
+
+
+def _paint(kind, color, flat):
+    """Return fill or stroke attributes; in a flat layer only the alpha (coverage) is the shape's own"""
+    alpha = _alpha(color)
+    opacity = alpha / 255 if alpha < 255 else None
+    if flat:
+        return {kind: 'currentColor', f'{kind}-opacity': opacity}
+    return {kind: _hex(color), f'{kind}-opacity': opacity}
+
+
+def _edges(xy):
+    """Return an inclusive ImageDraw box as continuous edges (pixel i spans i..i+1)"""
+    x0, y0, x1, y1 = xy
+    return min(x0, x1), min(y0, y1), max(x0, x1) + 1, max(y0, y1) + 1
+
+
+def _box(shape, left, top, right, bottom, radius, attributes):
+    if shape == 'ellipse':
+        return _element('ellipse', dict(cx=(left + right) / 2, cy=(top + bottom) / 2,
+                                        rx=(right - left) / 2, ry=(bottom - top) / 2, **attributes))
+    radius = min(radius, (right - left) / 2, (bottom - top) / 2) if shape == 'rounded_rectangle' else 0
+    return _element('rect', dict(x=left, y=top, width=right - left, height=bottom - top,
+                                 rx=radius or None, **attributes))
+
+
+def _on_ellipse(cx, cy, rx, ry, degrees):
+    """Return the point of an ellipse at a polar angle (clockwise from 3 o'clock)"""
+    angle = math.radians(degrees)
+    distance = rx * ry / max(math.hypot(ry * math.cos(angle), rx * math.sin(angle)), 1e-9)
+    return cx + distance * math.cos(angle), cy + distance * math.sin(angle)
+
+
+def _shape_elements(shape, xy, params, flat):
+    """Return the SVG elements of one recorded shape, matching the sdf.py geometry"""
+    if shape == 'stamp':
+        attributes = _paint('fill', params['fill'], flat)
+        # Overlapping discs merge, so the alpha goes on the group rather than each disc
+        group = {'fill': attributes['fill'], 'opacity': attributes['fill-opacity']}
+        circles = [_element('circle', {'cx': x + 0.5, 'cy': y + 0.5, 'r': params['radius'] + 0.5}) for x, y in xy]
+        return [_element('g', group, ''.join(circles))]
+    if shape == 'text':
+        return [_element('text', dict(x=xy[0], y=xy[1] + params['ascent'], **{'font-size': params['font_size'],
+                                      'font-family': FONT_FAMILY, 'font-weight': 'bold'},
+                                      **_paint('fill', params['fill'], flat)), escape(params['text']))]
+
+    width = max(params.get('width') or 1, 1)
+    fill, outline = params.get('fill'), params.get('outline')
+    if shape == 'line':
+        points = [(x + 0.5, y + 0.5) for x, y in zip(xy[0::2], xy[1::2])]
+        elements = []
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            # ImageDraw lines reach half a pixel past their end points
+            length = math.hypot(x1 - x0, y1 - y0)
+            ux, uy = ((x1 - x0) / length, (y1 - y0) / length) if length else (1.0, 0.0)
+            elements.append(_element('line', dict(x1=x0 - ux / 2, y1=y0 - uy / 2, x2=x1 + ux / 2, y2=y1 + uy / 2,
+                                                  **{'stroke-width': width}, **_paint('stroke', fill, flat))))
+        return elements
+
+    left, top, right, bottom = _edges(xy)
+    inset = width / 2
+    if shape == 'arc':
+        cx, cy = (left + right) / 2, (top + bottom) / 2
+        rx, ry = (right - left) / 2 - inset, (bottom - top) / 2 - inset
+        stroke = dict(fill='none', **{'stroke-width': width}, **_paint('stroke', fill, flat))
+        span = (params['end'] - params['start']) % 360
+        if span == 0:
+            return [_element('ellipse', dict(cx=cx, cy=cy, rx=rx, ry=ry, **stroke))]
+        x0, y0 = _on_ellipse(cx, cy, rx, ry, params['start'])
+        x1, y1 = _on_ellipse(cx, cy, rx, ry, params['start'] + span)
+        path = (f'M{_number(x0)} {_number(y0)}A{_number(rx)} {_number(ry)} 0 {int(span > 180)} 1 '
+                f'{_number(x1)} {_number(y1)}')
+        return [_element('path', dict(d=path, **stroke))]
+
+    radius = params.get('radius', 0)
+    elements = []
+    if fill is not None:
+        elements.append(_box(shape, left, top, right, bottom, radius, _paint('fill', fill, flat)))
+    if outline is not None:
+        # Outlines are the band of width just inside the edge, so stroke the inset outline
+        stroke = dict(fill='none', **{'stroke-width': width}, **_paint('stroke', outline, flat))
+        elements.append(_box(shape, left + inset, top + inset, right - inset, bottom - inset,
+                             max(radius - inset, 0), stroke))
+    return elements
+
+
+class _Writer:
+    """Collects the defs and body of one SVG document"""
+
+    def __init__(self, size):
+        self.size = size
+        self.defs = []
+        self.body = []
+
+    def define(self, kind, markup):
+        name = f'{kind}{len(self.defs)}'
+        self.defs.append(markup.replace('{id}', name))
+        return f'url(#{name})'
+
+    def clip(self, clip):
+        if clip is None:
+            return None
+        circle = _element('circle', {'cx': clip.center[0] + 0.5, 'cy': clip.center[1] + 0.5, 'r': float(clip.radius)})
+        return self.define('clip', _element('clipPath', {'id': '{id}'}, circle))
+
+    def stops(self, paint, linear, offset=0.0, scale=1.0, opaque=False):
+        """Return <stop> markup for a palette entry, with extra stops where colours mix in linear light"""
+        markup = []
+        for start, end, _, _ in gradient_segments(paint):
+            count = LINEAR_STOPS if linear else 1
+            positions = [start + (end - start) * step / count for step in range(count + 1)]
+            for position, color in zip(positions, ramp_colors(paint, positions[:-1] + [end - 1e-9], linear)):
+                opacity = None if opaque or color[3] == 255 else color[3] / 255
+                markup.append(_element('stop', {'offset': float(offset + position * scale), 'stop-color': _hex(color),
+                                                'stop-opacity': opacity}))
+        return ''.join(markup)
+
+    def fill(self, layer, paint):
+        gradient = layer.gradient
+        clip = self.clip(layer.clip)
+        style = 'mix-blend-mode:plus-lighter' if layer.blend == 'add' else None
+        canvas = {'x': 0, 'y': 0, 'width': self.size, 'height': self.size}
+        if gradient is None:
+            attributes = _paint('fill', gradient_segments(paint)[0][2], False)
+            if layer.clip is not None:
+                center = layer.clip.center
+                self.body.append(_element('circle', dict(cx=center[0] + 0.5, cy=center[1] + 0.5,
+                                                         r=float(layer.clip.radius), **attributes)))
+            else:
+                self.body.append(_element('rect', dict(canvas, **attributes)))
+            return
+
+        if isinstance(gradient, AngularGradient):
+            self.body.append(self.wedges(gradient, paint, layer.linear, clip, style))
+            return
+
+        opaque = layer.blend == 'add'
+        if isinstance(gradient, LinearGradient):
+            dx, dy = gradient.direction
+            span = self.size * (abs(dx) + abs(dy))
+            offset = self.size * (max(0, -dx) + max(0, -dy)) / span
+            start = -offset * span / (dx * dx + dy * dy)
+            end = start + span / (dx * dx + dy * dy)
+            url = self.define('gradient', _element('linearGradient', {
+                'id': '{id}', 'gradientUnits': 'userSpaceOnUse',
+                'x1': float(start * dx + 0.5), 'y1': float(start * dy + 0.5),
+                'x2': float(end * dx + 0.5), 'y2': float(end * dy + 0.5),
+            }, self.stops(paint, layer.linear, opaque=opaque)))
+            self.body.append(_element('rect', dict(canvas, fill=url, style=style, **{'clip-path': clip})))
+            return
+
+        # Radial ring: the gradient runs from the inner to the outer radius, within the ring's sector
+        cx, cy = gradient.center[0] + 0.5, gradient.center[1] + 0.5
+        inner, outer = gradient.inner_radius, gradient.outer_radius
+        url = self.define('gradient', _element('radialGradient', {
+            'id': '{id}', 'gradientUnits': 'userSpaceOnUse', 'cx': float(cx), 'cy': float(cy), 'r': float(outer),
+        }, self.stops(paint, layer.linear, inner / outer, 1 - inner / outer, opaque)))
+        first, last = gradient.angle_range or (0, 2 * math.pi - 1e-6)
+        large = int(last - first > math.pi)
+        path = (f'M{_number(cx + outer * math.cos(first))} {_number(cy + outer * math.sin(first))}'
+                f'A{_number(outer)} {_number(outer)} 0 {large} 1 '
+                f'{_number(cx + outer * math.cos(last))} {_number(cy + outer * math.sin(last))}'
+                f'L{_number(cx + inner * math.cos(last))} {_number(cy + inner * math.sin(last))}'
+                f'A{_number(inner)} {_number(inner)} 0 {large} 0 '
+                f'{_number(cx + inner * math.cos(first))} {_number(cy + inner * math.sin(first))}Z')
+        self.body.append(_element('path', {'d': path, 'fill': url, 'style': style, 'clip-path': clip}))
+
+    def wedges(self, gradient, paint, linear, clip, style):
+        """Approximate an angular gradient with flat wedges, each overlapping the next to hide seams"""
+        cx, cy = gradient.center[0] + 0.5, gradient.center[1] + 0.5
+        reach = self.size * 2
+        step = 2 * math.pi / ANGULAR_WEDGES
+        middles = [(number + 0.5) * step for number in range(ANGULAR_WEDGES)]
+        colors = ramp_colors(paint, [(math.cos(angle - gradient.phase) + 1) / 2 for angle in middles], linear)
+        wedges = []
+        for number, color in enumerate(colors):
+            first, last = number * step, (number + 1.5) * step
+            wedges.append(_element('path', {
+                'd': (f'M{_number(cx)} {_number(cy)}'
+                      f'L{_number(cx + reach * math.cos(first))} {_number(cy + reach * math.sin(first))}'
+                      f'A{reach} {reach} 0 0 1 {_number(cx + reach * math.cos(last))} {_number(cy + reach * math.sin(last))}Z'),
+                **_paint('fill', color, False),
+            }))
+        return _element('g', {'clip-path': clip, 'style': style}, ''.join(wedges))
+
+    def shapes(self, layer, color):
+        flat = color is not None
+        elements = [element for shape, xy, params in layer.items for element in _shape_elements(shape, xy, params, flat)]
+        if not elements:
+            return
+        group = {}
+        if flat:
+            group = {'color': _hex(color), 'opacity': _alpha(color) / 255 if _alpha(color) < 255 else None}
+        self.body.append(_element('g', group, ''.join(elements)))
+
+    def markup(self):
+        size = self.size
+        defs = f"<defs>{''.join(self.defs)}</defs>" if self.defs else ''
+        return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 {size} {size}">'
+                f"{defs}{''.join(self.body)}</svg>\n")
+
+
+def to_svg(drawing, palette=None):
+    """Return a recorded Drawing as SVG markup
+
+    Role layers take their colour from palette (a role -> colour or stops
+    dict, as in recolor.py); roles the palette leaves out are not drawn.
+    """
+    writer = _Writer(drawing.size)
+    for layer in drawing.layers:
+        paint = layer.paint if isinstance(layer, Fill) else layer.color
+        if layer.role is not None:
+            paint = (palette or {}).get(layer.role)
+            if paint is not None and isinstance(layer, Shapes):
+                paint = tuple(paint) if len(paint) > 3 else tuple(paint) + (255,)
+        if isinstance(layer, Fill):
+            if paint is not None:
+                writer.fill(layer, paint)
+        elif paint is not None or layer.role is None:
+            writer.shapes(layer, paint)
+    return writer.markup()
+
+
+def capture(name, size=REFERENCE_SIZE, palette='default'):
+    """Record a generator's geometry at size and return (drawing, palette dict or None)
+
+    Generators with recolourable roles only draw their roles, in the named palette.
+    """
+    if name in ROLE_GENERATORS:
+        draw_roles, palettes = load_role_generator(name)
+        with record(size) as drawing:
+            draw_roles(size)
+        return drawing, palettes[palette]
+    with record(size) as drawing:
+        load_generator(name)(size)
+    return drawing, None
+
+
+def export_svg(name, path, size=REFERENCE_SIZE, palette='default'):
+    """Write a generator's logo to path as SVG and return its size in bytes"""
+    drawing, colors = capture(name, size, palette)
+    with open(path, 'w') as f:
+        f.write(to_svg(drawing, colors))
+    return os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the logos as resolution-independent SVG')
+    parser.add_argument('generators', nargs='*', metavar='generator',
+                        help=f"Generators to export as <name>.svg (default: the web targets {', '.join(WEB_TARGETS)})")
+    parser.add_argument('--palette', default='default', help='Palette for generators with recolourable roles')
+    parser.add_argument('--size', type=int, default=REFERENCE_SIZE, help='Canvas units of the viewBox (default: 1024)')
+    parser.add_argument('--output-dir', default=None,
+                        help='Output directory (default: frontend/public, or build/vector with generators)')
+    args = parser.parse_args()
+
+    unknown = [name for name in args.generators if name not in GENERATORS]
+    if unknown:
+        parser.error(f"Unknown generators: {', '.join(unknown)}; expected one of: {', '.join(GENERATORS)}")
+    if args.generators:
+        targets = {f'{name}.svg': name for name in args.generators}
+        output_dir = args.output_dir or DEFAULT_OUTPUT_DIR
+    else:
+        targets = WEB_TARGETS
+        output_dir = args.output_dir or WEB_OUTPUT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+
+    for filename, name in targets.items():
+        start = time.perf_counter()
+        path = os.path.normpath(os.path.join(output_dir, filename))
+        size = export_svg(name, path, args.size, args.palette)
+        print(f"✓ {name:<16} {size:>7} bytes in {(time.perf_counter() - start) * 1000:.0f}ms  {path}")
+
+
+if __name__ == '__main__':
+    # Run as the importable module, whose recording the canvas layers log to
+    import vector
+    vector.main()
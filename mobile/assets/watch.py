@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Watch mode: re-render a generator whenever the asset scripts change
+The modules in this directory are polled for changes. A changed module is
+reloaded in this warm process, together with the modules that import it, so
+no interpreter or Pillow start-up is paid per edit. Each change renders a
+low-resolution preview first, then the full size, into the same file. An edit
+that lands mid-render cancels that render at the generator's next stage.
+Usage: python watch.py app-icon [--size 1024] [--preview-size 128] [--param NAME VALUE]
+                       [--output build/watch/app-icon.png] [--interval 0.1]
+"""
+import argparse
+import ast
+import graphlib
+import importlib
+import os
+import sys
+import threading
+import time
+import traceback
+
+import generators
+import profiling
+from sweep import design_parameters, parse_values
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT_DIR = os.path.join(SCRIPT_DIR, 'build', 'watch')
+DEFAULT_INTERVAL = 0.1
+DEFAULT_PREVIEW_SIZE = 128
+
+
+class RenderCancelled(Exception):
+    """Raised inside a render when a newer change has superseded it"""
+
+
+class _CancellableProfiler(profiling.Profiler):
+    """Profiler that stops the render at its next reported stage once cancel is set"""
+
+    def __init__(self, cancel):
+        super().__init__()
+        self.cancel = cancel
+
+    def record(self, name, start, end):
+        super().record(name, start, end)
+        if self.cancel.is_set():
+            raise RenderCancelled(name)
+
+
+def module_mtimes(directory=SCRIPT_DIR):
+    """Return {module name: modification time in ns} of the .py files in directory"""
+    with os.scandir(directory) as entries:
+        return {
+            entry.name[:-3]: entry.stat().st_mtime_ns
+            for entry in entries if entry.name.endswith('.py') and entry.is_file()
+        }
+
+
+def local_imports(path, names):
+    """Return the modules among names that the file at path imports, or none if it does not parse"""
+    try:
+        with open(path) as f:
+            tree = ast.parse(f.read(), path)
+    except (OSError, SyntaxError):
+        return set()
+    found = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            found.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            found.add(node.module.split('.')[0])
+    return found & names
+
+
+def reload_order(changed, directory=SCRIPT_DIR):
+    """Return the loaded modules to reload for the changed ones, dependencies first
+
+    A module that imports names from a changed module keeps the old objects
+    until it is reloaded too, so every loaded module that imports a changed
+    one, directly or indirectly, follows it.
+    """
+    names = set(module_mtimes(directory))
+    imports = {name: local_imports(os.path.join(directory, name + '.py'), names) for name in names}
+    affected, pending = set(), list(changed)
+    while pending:
+        name = pending.pop()
+        if name in affected:
+            continue
+        affected.add(name)
+        pending.extend(importer for importer, imported in imports.items() if name in imported)
+
+    loaded = {
+        name for name in affected
+        if name in sys.modules and os.path.dirname(os.path.abspath(getattr(sys.modules[name], '__file__', '') or ''))
+        == os.path.abspath(directory)
+    }
+    sorter = graphlib.TopologicalSorter({name: imports[name] & loaded for name in loaded})
+    try:
+        return list(sorter.static_order())
+    except graphlib.CycleError:
+        return sorted(loaded)
+
+
+def save_png(image, path):
+    """Write a PNG through a temporary file, so viewers never read a partial file"""
+    temporary = path + '.tmp'
+    image.save(temporary, 'PNG')
+    os.replace(temporary, path)
+
+
+class Renderer:
+    """Renders the preview and the full size on a background thread, one job at a time"""
+
+    def __init__(self, name, size, preview_size, params, output):
+        self.name = name
+        self.size = size
+        self.preview_size = preview_size
+        self.params = params
+        self.output = output
+        self.thread = None
+        self.cancel_event = None
+
+    def start(self, changed_at=None):
+        """Cancel any render in flight and start a new one; changed_at is the time of the edit"""
+        self.cancel()
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(self.cancel_event, changed_at or time.time()),
+                                       daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        """Stop the render in flight, if any, and wait until it has unwound"""
+        if self.thread is not None and self.thread.is_alive():
+            self.cancel_event.set()
+            self.thread.join()
+
+    def _run(self, cancel, changed_at):
+        try:
+            with profiling.profile(_CancellableProfiler(cancel)):
+                generator = generators.load_generator(self.name)
+                start = time.perf_counter()
+                # Saved at its own size: encoding an upscaled copy would take longer than the render
+                save_png(generator(self.preview_size, **self.params), self.output)
+                print(f"✓ Preview {self.preview_size}px in {(time.perf_counter() - start) * 1000:.0f}ms "
+                      f"({time.time() - changed_at:.2f}s after the change)")
+                if cancel.is_set():
+                    raise RenderCancelled('preview')
+
+                start = time.perf_counter()
+                image = generator(self.size, **self.params)
+                if cancel.is_set():
+                    raise RenderCancelled('render')
+                save_png(image, self.output)
+                print(f"✓ Rendered {self.size}px in {time.perf_counter() - start:.2f}s → {self.output}")
+        except RenderCancelled as e:
+            print(f"… Cancelled the render at '{e}' for a newer change")
+        except Exception:
+            print(f"✗ Render failed:\n{traceback.format_exc()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-render a generator on every change to the asset scripts')
+    parser.add_argument('generator', choices=list(generators.GENERATORS))
+    parser.add_argument('--size', type=int, default=1024, help='Full render size in pixels (default: 1024)')
+    parser.add_argument('--preview-size', type=int, default=DEFAULT_PREVIEW_SIZE,
+                        help=f'Quick preview size in pixels (default: {DEFAULT_PREVIEW_SIZE})')
+    parser.add_argument('--param', nargs=2, action='append', default=[], metavar=('NAME', 'VALUE'),
+                        help='Design knob for the generator (see sweep.py --list)')
+    parser.add_argument('--output', default=None, help='Output path (default: build/watch/<generator>.png)')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help=f'Seconds between checks for changes (default: {DEFAULT_INTERVAL})')
+    args = parser.parse_args()
+
+    defaults = design_parameters(args.generator)
+    params = {}
+    for knob, value in args.param:
+        if knob not in defaults:
+            parser.error(f"Unknown knob '{knob}' for {args.generator}, expected one of: {', '.join(defaults)}")
+        params[knob] = parse_values([value])[0]
+    output = args.output or os.path.join(DEFAULT_OUTPUT_DIR, f'{args.generator}.png')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    generator_module = generators.GENERATORS[args.generator][0]
+    renderer = Renderer(args.generator, args.size, args.preview_size, params, output)
+    mtimes = module_mtimes()
+    print(f"Watching {len(mtimes)} modules in {SCRIPT_DIR} for {args.generator} "
+          f"({args.preview_size}px preview, {args.size}px full size). Ctrl+C to stop.")
+    renderer.start()
+
+    try:
+        while True:
+            time.sleep(args.interval)
+            current = module_mtimes()
+            changed = sorted(name for name, mtime in current.items() if mtimes.get(name) != mtime)
+            mtimes = current
+            if not changed:
+                continue
+            changed_at = max(current[name] for name in changed) / 1e9
+            if 'watch' in changed:
+                print('… watch.py changed: restart it to pick up the change')
+
+            order = reload_order(changed)
+            # Until its first import the generator module is loaded fresh by the next render anyway
+            if generator_module in sys.modules and generator_module not in order:
+                continue
+            # The render thread must not run code that is being replaced
+            renderer.cancel()
+            start = time.perf_counter()
+            try:
+                for name in order:
+                    if name in sys.modules:
+                        importlib.reload(sys.modules[name])
+            except Exception:
+                print(f"✗ Reloading {name} failed:\n{traceback.format_exc()}")
+                continue
+            print(f"↻ Reloaded {', '.join(order)} in {(time.perf_counter() - start) * 1000:.0f}ms")
+            renderer.start(changed_at)
+    except KeyboardInterrupt:
+        renderer.cancel()
+
+
+if __name__ == '__main__':
+    main()